@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Benchmark for loading documents into a tree that has a path helper.
+
+Bindings are generated for a module with a keyed list of interfaces, each
+of which holds a container of leaves. For each path helper, a document
+with the given number of interfaces is loaded from IETF JSON and from XML
+into a new tree - which registers each object that is created with the
+path helper - and an interface is then looked up by its path. The time
+per interface is reported for each format.
+
+Any additional arguments are passed to pyang.
+
+Usage: python benchmarks/bulk_load.py [interfaces] [pyang options]
+"""
+from __future__ import print_function, unicode_literals
+
+import sys
+
+from common import generate_bindings, process_time
+from lxml import objectify
+
+from pyangbind.lib.serialise import pybindIETFXMLDecoder, pybindIETFXMLEncoder, pybindJSONDecoder
+from pyangbind.lib.xpathhelper import YANGPathHelper, YANGTriePathHelper
+
+MODULE = """module bulk-load {
+    yang-version "1";
+    namespace "http://rob.sh/yang/test/bulk-load";
+    prefix "foo";
+
+    container interfaces {
+        list interface {
+            key "name";
+            leaf name { type string; }
+
+            container config {
+                leaf description { type string; }
+                leaf mtu { type uint16; }
+                leaf enabled { type boolean; }
+            }
+        }
+    }
+}
+"""
+HELPERS = [("lxml", YANGPathHelper), ("trie", YANGTriePathHelper)]
+
+
+def document(size):
+    interfaces = []
+    for index in range(size):
+        interfaces.append(
+            {"name": "eth%d" % index, "config": {"description": "interface %d" % index, "mtu": 1500, "enabled": True}}
+        )
+    return {"bulk-load:interfaces": {"interface": interfaces}}
+
+
+def load_ietf_json(doc, instance):
+    pybindJSONDecoder.load_ietf_json(doc, None, None, obj=instance)
+
+
+def load_xml(doc, instance):
+    pybindIETFXMLDecoder.load_xml(doc, None, None, obj=instance)
+
+
+def main():
+    args = sys.argv[1:]
+    size = int(args.pop(0)) if args and args[0].isdigit() else 2000
+    bindings = generate_bindings("bulk-load", MODULE, ["--use-xpathhelper"] + args)
+    ietf_json = document(size)
+    instance = bindings.bulk_load()
+    pybindJSONDecoder.load_ietf_json(ietf_json, None, None, obj=instance)
+    parser = objectify.makeparser(remove_comments=True, remove_blank_text=True)
+    xml = objectify.fromstring(pybindIETFXMLEncoder.serialise(instance), parser=parser)
+    for helper_name, helper_class in HELPERS:
+        for name, load, doc in [("ietf-json", load_ietf_json, ietf_json), ("xml", load_xml, xml)]:
+            path_helper = helper_class()
+            instance = bindings.bulk_load(path_helper=path_helper)
+            start = process_time()
+            load(doc, instance)
+            path_helper.get("/interfaces/interface[name='eth%d']" % (size - 1))
+            elapsed = process_time() - start
+            print("%-4s %-9s %8.1f us/interface" % (helper_name, name, elapsed * 1e6 / size))
+
+
+if __name__ == "__main__":
+    main()
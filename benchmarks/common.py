@@ -0,0 +1,51 @@
+"""
+Helpers shared by the benchmarks.
+"""
+from __future__ import unicode_literals
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import types
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, BASE_DIR)
+
+# the time used by this process, such that other load on the machine does
+# not affect the results. time.clock is only used where process_time is not
+# available, as it is not in Python 3.8 and later.
+process_time = getattr(time, "process_time", None) or time.clock
+
+
+def generate_code(name, module, pyang_flags=None):
+    """
+    Generate bindings for the YANG module whose text is module, returning
+    the code that pyang writes. pyang_flags are passed to pyang.
+  """
+    tmpdir = tempfile.mkdtemp()
+    try:
+        yang_file = os.path.join(tmpdir, "%s.yang" % name)
+        with open(yang_file, "w") as fhandle:
+            fhandle.write(module)
+        return subprocess.check_output(
+            ["pyang", "--plugindir", os.path.join(BASE_DIR, "pyangbind", "plugin"), "-f", "pybind"]
+            + (pyang_flags or [])
+            + [yang_file],
+            env=dict(os.environ, PYTHONPATH=BASE_DIR),
+        )
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def generate_bindings(name, module, pyang_flags=None):
+    """
+    Generate bindings for the YANG module whose text is module, returning
+    them as a Python module. pyang_flags are passed to pyang.
+  """
+    code = generate_code(name, module, pyang_flags)
+    bindings = types.ModuleType("bindings")
+    exec(code, bindings.__dict__)
+    return bindings
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Benchmark for setting leaves deep within a hierarchy of containers.
+
+Bindings are generated for a module with containers nested to a depth of
+ten, where each level holds a choice between a case containing the next
+level, and a case containing a leaf. The leaves of the deepest container
+are set repeatedly, and the number of sets per second is reported - each
+set marks every ancestor of the leaf as changed, and resolves the choice
+at each level.
+
+Usage: python benchmarks/deep_set.py [iterations] [pyang options]
+"""
+from __future__ import print_function, unicode_literals
+
+import sys
+
+from common import generate_bindings, process_time
+
+DEPTH = 10
+
+
+def build_module():
+    body = "leaf value { type uint32; }\nleaf name { type string; }"
+    for level in reversed(range(DEPTH)):
+        body = """container level-%d {
+    choice branch {
+        case deeper {
+            %s
+        }
+        case shallow {
+            leaf shallow-%d { type uint32; }
+        }
+    }
+}""" % (
+            level,
+            body.replace("\n", "\n            "),
+            level,
+        )
+    return """module deep-set {
+    yang-version "1";
+    namespace "http://rob.sh/yang/test/deep-set";
+    prefix "foo";
+
+    %s
+}
+""" % body.replace(
+        "\n", "\n    "
+    )
+
+
+def deepest(instance):
+    node = instance.level_0
+    for level in range(1, DEPTH):
+        node = getattr(node, "level_%d" % level)
+    return node
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    bindings = generate_bindings("deep-set", build_module(), sys.argv[2:])
+    best = None
+    for _ in range(5):
+        node = deepest(bindings.deep_set())
+        start = process_time()
+        for index in range(iterations):
+            node.value = index
+            node.name = "name"
+        elapsed = process_time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print("depth %d %10.0f sets/s" % (DEPTH, 2 * iterations / best))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""
+Benchmark for bindings that use identities with many derived identities.
+
+Bindings are generated for a module that defines a base identity with a
+number of derived identities, and a container of leaves that are
+identityrefs of that base. The size of the generated code, and the time
+taken to import it, are reported for each number of leaves - these should
+grow with the number of leaves, rather than with the number of leaves
+multiplied by the number of identities.
+
+Usage: python benchmarks/identity_import.py [identities] [pyang options]
+"""
+from __future__ import print_function, unicode_literals
+
+import sys
+import time
+import types
+
+from common import generate_code
+
+LEAVES = [10, 50, 100]
+
+
+def build_module(identities, leaves):
+    statements = ["identity address-family;"]
+    for index in range(identities):
+        statements.append("identity family-%d { base address-family; }" % index)
+    statements.append("container families {")
+    for index in range(leaves):
+        statements.append("    leaf family-%d { type identityref { base address-family; } }" % index)
+    statements.append("}")
+    return """module identity-import {
+    yang-version "1";
+    namespace "http://rob.sh/yang/test/identity-import";
+    prefix "foo";
+
+    %s
+}
+""" % "\n    ".join(
+        statements
+    )
+
+
+def main():
+    identities = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    for leaves in LEAVES:
+        code = generate_code("identity-import", build_module(identities, leaves), sys.argv[2:])
+        best = None
+        for _ in range(3):
+            start = time.time()
+            bindings = types.ModuleType("bindings")
+            exec(compile(code, "bindings", "exec"), bindings.__dict__)
+            bindings.identity_import()
+            elapsed = time.time() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print("%-4d leaves %8.0f kB %8.1f ms import" % (leaves, len(code) / 1024.0, best * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""
+Benchmark for looking up list entries by their keys in the path helpers.
+
+A list of interfaces, each of which has a list of subinterfaces, is
+registered with each path helper, and each subinterface is then looked up
+by the keys of its interface and itself - as the referenced paths of
+leafrefs with current() predicates are. The time per lookup is reported
+for each number of interfaces, along with that of a lookup by a predicate
+on only part of the keys of the list, which is evaluated as XPATH.
+
+Usage: python benchmarks/keyed_lookup.py [lookups]
+"""
+from __future__ import print_function, unicode_literals
+
+import sys
+
+from common import process_time
+
+from pyangbind.lib.xpathhelper import YANGPathHelper, YANGTriePathHelper
+
+SIZES = [1000, 20000]
+SUBINTERFACES = 4
+HELPERS = [("lxml", YANGPathHelper), ("trie", YANGTriePathHelper)]
+KEYED_PATH = "/interfaces/interface[name='eth%d'][type='ethernet']/subinterfaces/subinterface[index='%d']"
+
+
+def registrations(size):
+    yield (["interfaces"], "interfaces")
+    for index in range(size):
+        interface = ["interfaces", "interface[name='eth%d'][type='ethernet']" % index]
+        yield (interface, index)
+        yield (interface + ["subinterfaces"], index)
+        for subindex in range(SUBINTERFACES):
+            yield (interface + ["subinterfaces", "subinterface[index='%d']" % subindex], subindex)
+
+
+def timed(path_helper, paths):
+    start = process_time()
+    for path in paths:
+        path_helper.get(path)
+    return (process_time() - start) * 1e6 / len(paths)
+
+
+def main():
+    lookups = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    for size in SIZES:
+        step = max(size // lookups, 1)
+        keyed = [KEYED_PATH % (index, index % SUBINTERFACES) for index in range(0, size, step)]
+        partial = ["/interfaces/interface[name='eth%d']" % index for index in range(0, size, step * 10)]
+        for helper_name, helper_class in HELPERS:
+            path_helper = helper_class()
+            path_helper.register_many(registrations(size))
+            print(
+                "%-5d %-4s keyed %8.1f us  partial %8.1f us"
+                % (size, helper_name, timed(path_helper, keyed), timed(path_helper, partial))
+            )
+
+
+if __name__ == "__main__":
+    main()
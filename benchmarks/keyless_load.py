@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Benchmark for loading large keyless state lists.
+
+Bindings are generated for a module with a 'config false' list that does
+not have a key - akin to a table of counters - both with the default keys,
+which number the entries of the list, and with --uuid-list-keys. The list
+is loaded with entries using add(), add_many(), and by loading IETF JSON,
+and the time per entry is reported for each, along with the memory that is
+used per entry, and by its key. The same number of objects are registered
+with a YANGPathHelper whose identifiers are generated in the same way as
+the keys of the list - since the entries of a keyless list cannot
+themselves be registered with a path helper.
+
+Any additional arguments are passed to pyang. Requires Python 3 for
+tracemalloc.
+
+Usage: python benchmarks/keyless_load.py [entries] [pyang options]
+"""
+from __future__ import print_function, unicode_literals
+
+import sys
+import tracemalloc
+
+from common import generate_bindings, process_time
+
+from pyangbind.lib.serialise import pybindJSONDecoder
+from pyangbind.lib.xpathhelper import YANGPathHelper
+from pyangbind.lib.yangtypes import uuid_key
+
+MODULE = """module keyless-load {
+    yang-version "1";
+    namespace "http://rob.sh/yang/test/keyless-load";
+    prefix "foo";
+
+    container counters {
+        config false;
+
+        list counter {
+            leaf name { type string; }
+            leaf packets { type uint64; }
+            leaf octets { type uint64; }
+        }
+    }
+}
+"""
+
+
+def records(size):
+    return [{"name": "counter-%d" % index, "packets": index, "octets": index * 64} for index in range(size)]
+
+
+def add_entries(instance, entries):
+    for record in entries:
+        entry = instance.counters.counter[instance.counters.counter.add()]
+        entry._set_name(record["name"])
+        entry._set_packets(record["packets"])
+        entry._set_octets(record["octets"])
+
+
+def add_many_entries(instance, entries):
+    instance.counters.counter.add_many(entries)
+
+
+def load_entries(instance, entries):
+    document = {"keyless-load:counters": {"counter": entries}}
+    pybindJSONDecoder.load_ietf_json(document, None, None, obj=instance)
+
+
+CASES = [("add", add_entries), ("add_many", add_many_entries), ("ietf_json", load_entries)]
+
+
+def register_objects(size, id_generator):
+    path_helper = YANGPathHelper(id_generator=id_generator)
+    registrations = [(["counters"], None)]
+    registrations += [(["counters", "counter[index='%d']" % index], index) for index in range(size)]
+    start = process_time()
+    path_helper.register_many(registrations)
+    return process_time() - start
+
+
+def memory(bindings, entries):
+    # the memory used by the whole of each entry, and by the key that it is
+    # stored under - which is the only memory that differs between modes.
+    instance = bindings.keyless_load()
+    tracemalloc.start()
+    add_many_entries(instance, entries)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    keys = sum(sys.getsizeof(k) for k in instance.counters.counter.keys())
+    return float(used) / len(entries), float(keys) / len(entries)
+
+
+def main():
+    args = sys.argv[1:]
+    size = int(args.pop(0)) if args and args[0].isdigit() else 100000
+    modes = [
+        ("counter", generate_bindings("keyless-load", MODULE, args), None),
+        ("uuid", generate_bindings("keyless-load", MODULE, args + ["--uuid-list-keys"]), uuid_key),
+    ]
+    entries = records(size)
+    for mode, bindings, id_generator in modes:
+        for name, load in CASES:
+            instance = bindings.keyless_load()
+            start = process_time()
+            load(instance, entries)
+            elapsed = process_time() - start
+            print("%-8s %-10s %8.2f us/entry" % (mode, name, elapsed * 1e6 / size))
+        print("%-8s %-10s %8.2f us/object" % (mode, "register", register_objects(size, id_generator) * 1e6 / size))
+        used, keys = memory(bindings, entries)
+        print("%-8s %-10s %8.1f bytes/entry  key %5.1f bytes/entry" % (mode, "memory", used, keys))
+
+
+if __name__ == "__main__":
+    main()
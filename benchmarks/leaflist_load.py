@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Benchmark for loading large leaf-lists.
+
+Bindings are generated for a module with leaf-lists of prefixes and VLAN
+identifiers. For each size, the leaf-lists are populated by appending to
+them, and then reconciled with a new set of values - half of which are
+already present - by loading JSON into the existing object. The time per
+element is reported for each, and should remain constant as the size of
+the leaf-lists grows.
+
+Usage: python benchmarks/leaflist_load.py [pyang options]
+"""
+from __future__ import print_function, unicode_literals
+
+import sys
+import time
+
+from common import generate_bindings
+
+from pyangbind.lib.serialise import pybindJSONDecoder
+
+MODULE = """module leaflist-load {
+    yang-version "1";
+    namespace "http://rob.sh/yang/test/leaflist-load";
+    prefix "foo";
+
+    container sets {
+        leaf-list prefix {
+            type string;
+        }
+
+        leaf-list vlan {
+            type uint32;
+        }
+    }
+}
+"""
+SIZES = [12500, 25000, 50000]
+
+
+def prefixes(start, size):
+    return ["10.%d.%d.0/24" % (index // 256, index % 256) for index in range(start, start + size)]
+
+
+def append_entries(instance, size):
+    start = time.time()
+    for prefix in prefixes(0, size):
+        instance.sets.prefix.append(prefix)
+    for vlan in range(size):
+        instance.sets.vlan.append(vlan)
+    return time.time() - start
+
+
+def reconcile_entries(instance, size):
+    document = {"sets": {"prefix": prefixes(size // 2, size), "vlan": list(range(size // 2, size + size // 2))}}
+    start = time.time()
+    pybindJSONDecoder.load_json(document, None, None, obj=instance)
+    return time.time() - start
+
+
+def main():
+    bindings = generate_bindings("leaflist-load", MODULE, sys.argv[1:])
+    for size in SIZES:
+        instance = bindings.leaflist_load()
+        appended = append_entries(instance, size)
+        reconciled = reconcile_entries(instance, size)
+        print(
+            "%-6d append %6.2f us/element  reconcile %6.2f us/element"
+            % (size, appended * 1e6 / (2 * size), reconciled * 1e6 / (2 * size))
+        )
+
+
+if __name__ == "__main__":
+    main()
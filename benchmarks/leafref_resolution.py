@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+Benchmark for reading leafrefs that refer to other leaves.
+
+Bindings are generated for a module with a keyed list of interfaces, and a
+list of references, each of which has a leafref to the description of an
+interface - selected by a current() predicate - and a leafref to the name
+of an interface. For each path helper, the leafrefs are read repeatedly,
+each read resolving the referenced path, and the tree is serialised to
+IETF JSON. The time per leafref read, and per serialisation of the tree,
+is reported.
+
+Any additional arguments are passed to pyang.
+
+Usage: python benchmarks/leafref_resolution.py [references] [pyang options]
+"""
+from __future__ import print_function, unicode_literals
+
+import sys
+
+from common import generate_bindings, process_time
+
+from pyangbind.lib import pybindJSON
+from pyangbind.lib.xpathhelper import YANGPathHelper, YANGTriePathHelper
+
+MODULE = """module leafref-resolution {
+    yang-version "1.1";
+    namespace "http://rob.sh/yang/test/leafref-resolution";
+    prefix "foo";
+
+    container interfaces {
+        list interface {
+            key "name";
+            leaf name { type string; }
+            leaf description { type string; }
+        }
+    }
+
+    container references {
+        list reference {
+            key "index";
+            leaf index { type uint16; }
+            leaf interface {
+                type leafref {
+                    path "/interfaces/interface/name";
+                    require-instance true;
+                }
+            }
+            leaf description {
+                type leafref {
+                    path "/interfaces/interface[name=current()/../interface]/description";
+                }
+            }
+        }
+    }
+}
+"""
+INTERFACES = 100
+READS = 10
+HELPERS = [("lxml", YANGPathHelper), ("trie", YANGTriePathHelper)]
+
+
+def build(bindings, helper_class, size):
+    path_helper = helper_class()
+    instance = bindings.leafref_resolution(path_helper=path_helper)
+    for index in range(INTERFACES):
+        instance.interfaces.interface.add("eth%d" % index).description = "interface %d" % index
+    for index in range(size):
+        reference = instance.references.reference.add(index)
+        reference.interface = "eth%d" % (index % INTERFACES)
+        reference.description = "interface %d" % (index % INTERFACES)
+    return instance
+
+
+def main():
+    args = sys.argv[1:]
+    size = int(args.pop(0)) if args and args[0].isdigit() else 1000
+    bindings = generate_bindings("leafref-resolution", MODULE, ["--use-xpathhelper"] + args)
+    for helper_name, helper_class in HELPERS:
+        instance = build(bindings, helper_class, size)
+        references = list(instance.references.reference.values())
+        start = process_time()
+        for _ in range(READS):
+            for reference in references:
+                str(reference.description)
+        read = (process_time() - start) * 1e6 / (READS * size)
+        start = process_time()
+        pybindJSON.dumps(instance, mode="ietf")
+        dump = (process_time() - start) * 1e3
+        print("%-4s read %8.1f us/leafref  dumps %8.1f ms" % (helper_name, read, dump))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""
+Benchmark for adding entries to a YANG list.
+
+Bindings are generated for a module with a keyed list whose entries hold
+a container of leaves, similar to an interface or BGP neighbor list, and
+entries are added to it using add(), and in bulk using add_many(). The
+number of entries that are added per second, in the best of a number of
+repeats, is reported for each list size. With --path-helper, entries
+are registered with a YANGPathHelper. With --extmethods, extension methods
+are bound to each entry and to its config container.
+
+Any additional arguments are passed to pyang.
+
+Usage: python benchmarks/list_add.py [--path-helper] [--extmethods] [pyang options]
+"""
+from __future__ import print_function, unicode_literals
+
+import sys
+
+from common import generate_bindings, process_time
+
+from pyangbind.lib.xpathhelper import YANGPathHelper
+
+MODULE = """module list-add {
+    yang-version "1";
+    namespace "http://rob.sh/yang/test/list-add";
+    prefix "foo";
+
+    container neighbors {
+        list neighbor {
+            key "address";
+            leaf address { type string; }
+
+            container config {
+                leaf address { type string; }
+                leaf peer-as { type uint32; }
+                leaf description { type string; }
+                leaf enabled { type boolean; }
+            }
+        }
+    }
+}
+"""
+SIZES = [10000, 100000]
+REPEATS = 3
+
+
+class NeighborHelper(object):
+
+    def soft_reset(self, *args, **kwargs):
+        pass
+
+    def hard_reset(self, *args, **kwargs):
+        pass
+
+
+def new_instance(bindings, path_helper, extmethods):
+    if extmethods:
+        helper = NeighborHelper()
+        return bindings.list_add(
+            path_helper=path_helper, extmethods={"/neighbors/neighbor": helper, "/neighbors/neighbor/config": helper}
+        )
+    return bindings.list_add(path_helper=path_helper)
+
+
+def add_entries(bindings, size, path_helper, extmethods):
+    instance = new_instance(bindings, path_helper, extmethods)
+    start = process_time()
+    for index in range(size):
+        instance.neighbors.neighbor.add("192.0.%d.%d" % (index // 256, index % 256))
+    return size / (process_time() - start)
+
+
+def add_many_entries(bindings, size, path_helper, extmethods):
+    instance = new_instance(bindings, path_helper, extmethods)
+    start = process_time()
+    instance.neighbors.neighbor.add_many(
+        {"address": "192.0.%d.%d" % (index // 256, index % 256)} for index in range(size)
+    )
+    return size / (process_time() - start)
+
+
+def main():
+    pyang_flags = sys.argv[1:]
+    use_path_helper = "--path-helper" in pyang_flags
+    if use_path_helper:
+        pyang_flags.remove("--path-helper")
+    use_extmethods = "--extmethods" in pyang_flags
+    if use_extmethods:
+        pyang_flags.remove("--extmethods")
+        pyang_flags.append("--use-extmethods")
+    bindings = generate_bindings("list-add", MODULE, ["--use-xpathhelper"] + pyang_flags)
+    for size in SIZES:
+        for name, add in [("add", add_entries), ("add_many", add_many_entries)]:
+            rate = 0
+            for _ in range(REPEATS):
+                path_helper = YANGPathHelper() if use_path_helper else False
+                rate = max(rate, add(bindings, size, path_helper, use_extmethods))
+            print("%-7d %-8s %10.0f adds/s" % (size, name, rate))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""
+Benchmark for the path helpers.
+
+Bindings are generated for a module with a keyed list of interfaces, each
+of which holds a container of leaves, and a leafref to the names of the
+interfaces. For each path helper, entries are added to the list - which
+registers each entry and its leaves - and then each entry is looked up by
+its path, and the leafref is set to the name of each entry. The time per
+operation is reported for each list size.
+
+Any additional arguments are passed to pyang.
+
+Usage: python benchmarks/path_helper.py [pyang options]
+"""
+from __future__ import print_function, unicode_literals
+
+import sys
+
+from common import generate_bindings, process_time
+
+from pyangbind.lib.xpathhelper import YANGPathHelper, YANGTriePathHelper
+
+MODULE = """module path-helper {
+    yang-version "1.1";
+    namespace "http://rob.sh/yang/test/path-helper";
+    prefix "foo";
+
+    container interfaces {
+        list interface {
+            key "name";
+            leaf name { type string; }
+
+            container config {
+                leaf description { type string; }
+                leaf mtu { type uint16; }
+                leaf enabled { type boolean; }
+            }
+        }
+    }
+
+    container reference {
+        leaf interface {
+            type leafref {
+                path "/interfaces/interface/name";
+                require-instance true;
+            }
+        }
+    }
+}
+"""
+SIZES = [1000, 5000]
+HELPERS = [("lxml", YANGPathHelper), ("trie", YANGTriePathHelper)]
+
+
+def timed(operation, names):
+    start = process_time()
+    for name in names:
+        operation(name)
+    return (process_time() - start) * 1e6 / len(names)
+
+
+def main():
+    bindings = generate_bindings("path-helper", MODULE, ["--use-xpathhelper"] + sys.argv[1:])
+    for size in SIZES:
+        names = ["eth%d" % index for index in range(size)]
+        for helper_name, helper_class in HELPERS:
+            path_helper = helper_class()
+            instance = bindings.path_helper(path_helper=path_helper)
+            add = timed(instance.interfaces.interface.add, names)
+            get = timed(lambda name: path_helper.get("/interfaces/interface[name='%s']/config" % name), names)
+            setref = timed(lambda name: setattr(instance.reference, "interface", name), names)
+            print("%-5d %-4s add %8.1f us  get %8.1f us  leafref %8.1f us" % (size, helper_name, add, get, setref))
+
+
+if __name__ == "__main__":
+    main()
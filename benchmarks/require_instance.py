@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""
+Benchmark for validating leafrefs that require an instance.
+
+Bindings are generated for a module with a keyed list of peer groups, and
+a keyed list of neighbors, each of which has a leafref to the name of a
+peer group that requires the peer group to exist. For each number of peer groups, and each path
+helper, the peer groups and neighbors are added, and then the peer group
+of each neighbor is set, which checks that it exists. The time per check
+is reported, and should remain constant as the number of peer groups
+grows.
+
+Any additional arguments are passed to pyang.
+
+Usage: python benchmarks/require_instance.py [pyang options]
+"""
+from __future__ import print_function, unicode_literals
+
+import gc
+import sys
+
+from common import generate_bindings, process_time
+
+from pyangbind.lib.xpathhelper import YANGPathHelper, YANGTriePathHelper
+
+MODULE = """module require-instance {
+    yang-version "1.1";
+    namespace "http://rob.sh/yang/test/require-instance";
+    prefix "foo";
+
+    container bgp {
+        container peer-groups {
+            list peer-group {
+                key "peer-group-name";
+                leaf peer-group-name { type string; }
+            }
+        }
+
+        container neighbors {
+            list neighbor {
+                key "neighbor-address";
+                leaf neighbor-address { type string; }
+                leaf peer-group {
+                    type leafref {
+                        path "/bgp/peer-groups/peer-group/peer-group-name";
+                        require-instance true;
+                    }
+                }
+            }
+        }
+    }
+}
+"""
+SIZES = [1000, 4000, 16000]
+NEIGHBORS_PER_GROUP = 2
+HELPERS = [("lxml", YANGPathHelper), ("trie", YANGTriePathHelper)]
+
+
+def main():
+    bindings = generate_bindings("require-instance", MODULE, ["--use-xpathhelper"] + sys.argv[1:])
+    for size in SIZES:
+        neighbors = size * NEIGHBORS_PER_GROUP
+        for helper_name, helper_class in HELPERS:
+            instance = bindings.require_instance(path_helper=helper_class())
+            for index in range(size):
+                instance.bgp.peer_groups.peer_group.add("group%d" % index)
+            for index in range(neighbors):
+                instance.bgp.neighbors.neighbor.add("192.0.2.%d" % index)
+            # as per timeit, the garbage collector is disabled while timing,
+            # since the time of each collection grows with the size of the
+            # tree rather than with the checks that are made.
+            gc.disable()
+            start = process_time()
+            for index, neighbor in enumerate(instance.bgp.neighbors.neighbor.values()):
+                neighbor.peer_group = "group%d" % (index % size)
+            elapsed = process_time() - start
+            gc.enable()
+            print("%-6d %-4s %8.1f us/check" % (size, helper_name, elapsed * 1e6 / neighbors))
+
+
+if __name__ == "__main__":
+    main()
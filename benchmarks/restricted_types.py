@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark for setting leaves with restricted types.
+
+Each case mirrors the call that a generated setter makes - a value is
+wrapped by YANGDynClass using a RestrictedClassType base - and reports the
+number of sets per second. The cases after "pattern" set unions - an
+inet:ip-address style union of IPv4 and IPv6 patterns, and an OpenConfig
+style union of an enumeration, a uint32 and a string. The final case sets
+an identityref whose base has a large number of derived identities.
+
+Usage: python benchmarks/restricted_types.py [iterations]
+"""
+from __future__ import print_function, unicode_literals
+
+import sys
+import timeit
+
+import six
+from common import process_time
+
+from pyangbind.lib.yangtypes import RestrictedClassType, YANGDynClass
+
+if six.PY3:
+    long = int
+
+IPV4_PATTERN = (
+    "(([0-9]|[1-9][0-9]|1[0-9][0-9]|2[0-4][0-9]|25[0-5])\\.){3}"
+    "([0-9]|[1-9][0-9]|1[0-9][0-9]|2[0-4][0-9]|25[0-5])(%[\\p{N}\\p{L}]+)?"
+)
+IPV6_PATTERN = (
+    "((:|[0-9a-fA-F]{0,4}):)([0-9a-fA-F]{0,4}:){0,5}((([0-9a-fA-F]{0,4}:)?(:|[0-9a-fA-F]{0,4}))|"
+    "(((25[0-5]|2[0-4][0-9]|[01]?[0-9]?[0-9])\\.){3}(25[0-5]|2[0-4][0-9]|[01]?[0-9]?[0-9])))(%[\\p{N}\\p{L}]+)?"
+)
+
+
+def set_uint32():
+    return YANGDynClass(
+        4000000000,
+        base=RestrictedClassType(base_type=long, restriction_dict={"range": ["0..4294967295"]}, int_size=32),
+        is_leaf=True,
+        yang_name="uint32",
+        yang_type="uint32",
+    )
+
+
+def set_string():
+    return YANGDynClass(
+        "a-description",
+        base=RestrictedClassType(base_type=six.text_type, restriction_dict={"length": ["1..255"]}),
+        is_leaf=True,
+        yang_name="string",
+        yang_type="string",
+    )
+
+
+def set_pattern():
+    return YANGDynClass(
+        "192.0.2.1",
+        base=RestrictedClassType(base_type=six.text_type, restriction_dict={"pattern": IPV4_PATTERN}),
+        is_leaf=True,
+        yang_name="pattern",
+        yang_type="inet:ipv4-address",
+    )
+
+
+def set_ip_address(value):
+    return YANGDynClass(
+        value,
+        base=[
+            RestrictedClassType(base_type=six.text_type, restriction_dict={"pattern": IPV4_PATTERN}),
+            RestrictedClassType(base_type=six.text_type, restriction_dict={"pattern": IPV6_PATTERN}),
+        ],
+        is_leaf=True,
+        yang_name="ip-address",
+        yang_type="inet:ip-address",
+    )
+
+
+def set_enum_int_string(value):
+    return YANGDynClass(
+        value,
+        base=[
+            RestrictedClassType(
+                base_type=six.text_type, restriction_type="dict_key", restriction_arg={"ALL": {}, "NONE": {}}
+            ),
+            RestrictedClassType(base_type=long, restriction_dict={"range": ["0..4294967295"]}, int_size=32),
+            six.text_type,
+        ],
+        is_leaf=True,
+        yang_name="union",
+        yang_type="union",
+    )
+
+
+def identityref_setter(identities):
+    # the generated setter builds the table of identities from a literal
+    # each time that it is called, so the benchmark must do the same.
+    table = dict(
+        (
+            "ident-%d" % index,
+            {"@module": "identities", "@namespace": "urn:identities", "ident-%d" % index: {"@module": "identities"}},
+        )
+        for index in range(identities)
+    )
+    code = """def set_identityref():
+    return YANGDynClass(
+        "ident-1",
+        base=RestrictedClassType(base_type=six.text_type, restriction_type="dict_key", restriction_arg=%r),
+        is_leaf=True,
+        yang_name="identityref",
+        yang_type="identityref",
+    )
+""" % (
+        table,
+    )
+    namespace = {"RestrictedClassType": RestrictedClassType, "YANGDynClass": YANGDynClass, "six": six}
+    exec(code, namespace)
+    return namespace["set_identityref"]
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for name, fn in [
+        ("uint32", set_uint32),
+        ("string", set_string),
+        ("pattern", set_pattern),
+        ("ipv6", lambda: set_ip_address("2001:db8::1")),
+        ("ipv4", lambda: set_ip_address("192.0.2.1")),
+        ("enum", lambda: set_enum_int_string("ALL")),
+        ("int", lambda: set_enum_int_string(65000)),
+        ("string", lambda: set_enum_int_string("peer-group")),
+        ("identity", identityref_setter(300)),
+    ]:
+        elapsed = min(timeit.repeat(fn, number=iterations, repeat=5, timer=process_time))
+        print("%-8s %10.0f sets/s" % (name, iterations / elapsed))
+
+
+if __name__ == "__main__":
+    main()
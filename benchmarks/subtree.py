@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Benchmark for registering and unregistering subtrees with a path helper.
+
+Bindings are generated for a module with a keyed list of interfaces, each
+of which holds a container of leaves. For each path helper, the list is
+loaded into a tree that does not have a path helper, and the tree is
+registered using register_subtree() - which is compared to registering
+each object with register(). Each entry is then deleted from the list, and
+the number of objects that the path helper still refers to is reported.
+
+Any additional arguments are passed to pyang.
+
+Usage: python benchmarks/subtree.py [entries] [pyang options]
+"""
+from __future__ import print_function, unicode_literals
+
+import sys
+
+from common import generate_bindings, process_time
+
+from pyangbind.lib.xpathhelper import YANGPathHelper, YANGTriePathHelper, _subtree_registrations
+
+MODULE = """module subtree {
+    yang-version "1";
+    namespace "http://rob.sh/yang/test/subtree";
+    prefix "foo";
+
+    container interfaces {
+        list interface {
+            key "name";
+            leaf name { type string; }
+
+            container config {
+                leaf description { type string; }
+                leaf mtu { type uint16; }
+                leaf enabled { type boolean; }
+            }
+        }
+    }
+}
+"""
+HELPERS = [("lxml", YANGPathHelper), ("trie", YANGTriePathHelper)]
+
+
+def register_each(path_helper, instance):
+    for object_path, object_ptr in _subtree_registrations(["interfaces"], instance.interfaces):
+        path_helper.register(object_path, object_ptr)
+
+
+def register_subtree(path_helper, instance):
+    path_helper.register_subtree(["interfaces"], instance.interfaces)
+
+
+CASES = [("register", register_each), ("subtree", register_subtree)]
+
+
+def main():
+    args = sys.argv[1:]
+    size = int(args.pop(0)) if args and args[0].isdigit() else 2000
+    bindings = generate_bindings("subtree", MODULE, ["--use-xpathhelper"] + args)
+    instance = bindings.subtree()
+    for index in range(size):
+        config = instance.interfaces.interface.add("eth%d" % index).config
+        config.mtu = 1500
+        config.description = "interface %d" % index
+    objects = len(list(_subtree_registrations(["interfaces"], instance.interfaces)))
+    for helper_name, helper_class in HELPERS:
+        for name, register in CASES:
+            path_helper = helper_class()
+            start = process_time()
+            register(path_helper, instance)
+            elapsed = process_time() - start
+            print("%-4s %-8s %8.2f us/object" % (helper_name, name, elapsed * 1e6 / objects))
+
+        # entries that are deleted are unregistered by the path helper of the
+        # tree, so a tree that is built with one is loaded.
+        path_helper = helper_class()
+        loaded = bindings.subtree(path_helper=path_helper)
+        loaded.interfaces.interface.add_many({"name": "eth%d" % index} for index in range(size))
+        for name in list(loaded.interfaces.interface):
+            loaded.interfaces.interface.delete(name)
+        if hasattr(path_helper, "_library"):
+            print("%-4s %-8s %8d objects still referenced" % (helper_name, "delete", len(path_helper._library)))
+
+
+if __name__ == "__main__":
+    main()
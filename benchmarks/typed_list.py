@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark for appending values to leaf-lists.
+
+Each case creates a leaf-list in the same way as a generated class - a
+TypedListType wrapped by YANGDynClass with unique=True - and appends
+distinct values to it, reporting the number of appends per second. The
+union case appends a mixture of integers and strings to a leaf-list of a
+union of uint32 and string, such that both members of the union are used.
+
+Usage: python benchmarks/typed_list.py [iterations]
+"""
+from __future__ import print_function, unicode_literals
+
+import sys
+
+import six
+from common import process_time
+
+from pyangbind.lib.yangtypes import RestrictedClassType, TypedListType, YANGDynClass
+
+if six.PY3:
+    long = int
+
+UINT32 = RestrictedClassType(base_type=long, restriction_dict={"range": ["0..4294967295"]}, int_size=32)
+
+
+def string_list():
+    return YANGDynClass(unique=True, base=TypedListType(allowed_type=six.text_type), is_leaf=False, yang_name="s")
+
+
+def int_list():
+    return YANGDynClass(unique=True, base=TypedListType(allowed_type=UINT32), is_leaf=False, yang_name="i")
+
+
+def union_list():
+    return YANGDynClass(
+        unique=True, base=TypedListType(allowed_type=[UINT32, six.text_type]), is_leaf=False, yang_name="u"
+    )
+
+
+CASES = [
+    ("string", string_list, lambda index: "value-%d" % index),
+    ("int", int_list, lambda index: index),
+    ("union", union_list, lambda index: index if index % 2 else "value-%d" % index),
+]
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    for name, new_list, value in CASES:
+        values = [value(index) for index in range(iterations)]
+        best = None
+        for _ in range(5):
+            leaflist = new_list()
+            start = process_time()
+            for v in values:
+                leaflist.append(v)
+            elapsed = process_time() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print("%-7s %10.0f appends/s" % (name, iterations / best))
+
+
+if __name__ == "__main__":
+    main()
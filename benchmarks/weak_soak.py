@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""
+Soak benchmark for path helpers that are shared between trees.
+
+Bindings are generated for a module with a keyed list of interfaces, and
+a tree is repeatedly created with a path helper that is shared between
+cycles, loaded from IETF JSON - where the names of the interfaces differ
+in each cycle - and discarded. This is run with a YANGPathHelper that holds
+weak references to the objects that are registered with it, and - for a
+tenth of the cycles, since the tree that it holds grows in each cycle -
+with one that holds strong references. The resident memory of the process
+and the number of objects referenced by the path helper are reported after
+each tenth of the cycles. The resident memory must not grow, after the
+first tenth of the cycles, when weak references are used.
+
+Any additional arguments are passed to pyang. Requires Linux for the
+resident memory of the process.
+
+Usage: python benchmarks/weak_soak.py [cycles] [pyang options]
+"""
+from __future__ import print_function, unicode_literals
+
+import gc
+import os
+import sys
+
+from common import generate_bindings
+
+from pyangbind.lib.serialise import pybindJSONDecoder
+from pyangbind.lib.xpathhelper import YANGPathHelper
+
+MODULE = """module weak-soak {
+    yang-version "1";
+    namespace "http://rob.sh/yang/test/weak-soak";
+    prefix "foo";
+
+    container interfaces {
+        list interface {
+            key "name";
+            leaf name { type string; }
+
+            container counters {
+                leaf in-octets { type uint64; }
+                leaf out-octets { type uint64; }
+                leaf description { type string; }
+            }
+        }
+    }
+}
+"""
+INTERFACES = 20
+# the growth in resident memory that is allowed for weak references, since
+# the allocator does not return all memory that is freed.
+TOLERANCE = 1024 * 1024
+
+
+def rss():
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def document(cycle):
+    interfaces = []
+    for index in range(INTERFACES):
+        interfaces.append(
+            {
+                "name": "eth%d-%d" % (cycle, index),
+                "counters": {"in-octets": cycle * index, "out-octets": cycle, "description": "cycle %d" % cycle},
+            }
+        )
+    return {"weak-soak:interfaces": {"interface": interfaces}}
+
+
+def soak(bindings, path_helper, cycles):
+    samples = []
+    for cycle in range(cycles):
+        instance = bindings.weak_soak(path_helper=path_helper)
+        pybindJSONDecoder.load_ietf_json(document(cycle), None, None, obj=instance)
+        del instance
+        if (cycle + 1) % max(cycles // 10, 1) == 0:
+            gc.collect()
+            path_helper.get("/interfaces")
+            samples.append((cycle + 1, rss(), len(path_helper._library)))
+    return samples
+
+
+def main():
+    args = sys.argv[1:]
+    cycles = int(args.pop(0)) if args and args[0].isdigit() else 1000
+    bindings = generate_bindings("weak-soak", MODULE, ["--use-xpathhelper"] + args)
+    for mode, weak_references, mode_cycles in [("strong", False, max(cycles // 10, 1)), ("weak", True, cycles)]:
+        samples = soak(bindings, YANGPathHelper(weak_references=weak_references), mode_cycles)
+        for cycle, resident, objects in samples:
+            print("%-6s cycle %5d  rss %8.1f MiB  %7d objects" % (mode, cycle, resident / 1048576.0, objects))
+        growth = samples[-1][1] - samples[0][1]
+        print("%-6s grew %8.1f KiB after cycle %d" % (mode, growth / 1024.0, samples[0][0]))
+        if weak_references:
+            assert growth <= TOLERANCE, "resident memory grew by %d bytes" % growth
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+Benchmark for repeated path lookups.
+
+Bindings are generated for a module with a keyed list of interfaces, and a
+list of references to them whose leafref uses a current() predicate. For
+each path helper, a fixed set of paths is looked up repeatedly - as the
+referenced paths of leafrefs are - and the references are set, each of
+which resolves its path. The number of lookups per second is reported,
+along with the hits and misses of the cache of compiled paths.
+
+Any additional arguments are passed to pyang.
+
+Usage: python benchmarks/xpath_cache.py [repeats] [pyang options]
+"""
+from __future__ import print_function, unicode_literals
+
+import sys
+
+from common import generate_bindings, process_time
+
+from pyangbind.lib.xpathhelper import YANGPathHelper, YANGTriePathHelper, clear_query_cache, query_cache_info
+
+MODULE = """module xpath-cache {
+    yang-version "1.1";
+    namespace "http://rob.sh/yang/test/xpath-cache";
+    prefix "foo";
+
+    container interfaces {
+        list interface {
+            key "name";
+            leaf name { type string; }
+            leaf mtu { type uint16; }
+        }
+    }
+
+    container references {
+        list reference {
+            key "index";
+            leaf index { type uint16; }
+            leaf interface { type string; }
+            leaf mtu {
+                type leafref {
+                    path "/interfaces/interface[name=current()/../interface]/mtu";
+                    require-instance true;
+                }
+            }
+        }
+    }
+}
+"""
+INTERFACES = 100
+PATHS = [
+    "/interfaces/interface[name='eth1']/mtu",
+    "/interfaces/interface[name='eth50']",
+    "/interfaces/interface/name",
+    "/references/reference[index='1']/interface",
+]
+HELPERS = [("lxml", YANGPathHelper), ("trie", YANGTriePathHelper)]
+
+
+def build(bindings, helper_class):
+    path_helper = helper_class()
+    instance = bindings.xpath_cache(path_helper=path_helper)
+    for index in range(INTERFACES):
+        instance.interfaces.interface.add("eth%d" % index).mtu = 1500 + index
+        reference = instance.references.reference.add(index)
+        reference.interface = "eth%d" % index
+    return path_helper, instance
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    bindings = generate_bindings("xpath-cache", MODULE, ["--use-xpathhelper"] + sys.argv[2:])
+    for helper_name, helper_class in HELPERS:
+        path_helper, instance = build(bindings, helper_class)
+        clear_query_cache()
+        start = process_time()
+        for _ in range(repeats):
+            for path in PATHS:
+                path_helper.get(path)
+        gets = repeats * len(PATHS) / (process_time() - start)
+
+        references = list(instance.references.reference.values())
+        start = process_time()
+        for _ in range(repeats // 20):
+            for index, reference in enumerate(references):
+                reference.mtu = 1500 + index
+        sets = (repeats // 20) * len(references) / (process_time() - start)
+        info = query_cache_info()
+        print(
+            "%-4s get %8.0f/s  leafref %8.0f/s  hits %d misses %d" % (helper_name, gets, sets, info.hits, info.misses)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -21,7 +21,25 @@ limitations under the License.
 
 class PybindBase(object):
 
-    __slots__ = ()
+    # containers can be weakly referenced, such as by a path helper.
+    __slots__ = ("__weakref__",)
+
+    # Mapping of the names of child elements that are not built when the
+    # class is instantiated, to the attribute holding them - populated by
+    # classes generated with --lazy-subtrees or --sparse-leaves.
+    _pyangbind_lazy_elements = {}
+
+    def _pyangbind_built(self, element_name):
+        """
+      Determine whether the child element_name has been built. Elements are
+      always built unless the class was generated with --lazy-subtrees (and
+      the container or list has not yet been accessed) or --sparse-leaves
+      (and the leaf has not been set).
+    """
+        attr = self._pyangbind_lazy_elements.get(element_name)
+        if attr is None:
+            return True
+        return getattr(self, attr) is not None
 
     def elements(self):
         return self._pyangbind_elements
@@ -37,6 +55,10 @@ class PybindBase(object):
         d = {}
         # for each YANG element within this container.
         for element_name in self._pyangbind_elements:
+            if filter is True and not self._pyangbind_built(element_name):
+                # an element that has not been built cannot have been
+                # changed, so there is no need to build it.
+                continue
             element = getattr(self, element_name, error)
             if hasattr(element, "yang_name"):
                 # retrieve the YANG name method
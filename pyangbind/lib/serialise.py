@@ -27,6 +27,7 @@ from __future__ import unicode_literals
 
 import json
 from collections import OrderedDict
+from contextlib import contextmanager
 from decimal import Decimal
 
 import six
@@ -409,6 +410,8 @@ def make_generate_ietf_tree(yname_ns_func):
 
         d = {}
         for element_name in obj._pyangbind_elements:
+            if flt and with_defaults is None and not obj._pyangbind_built(element_name):
+                continue
             element = getattr(obj, element_name, None)
             yang_name = getattr(element, "yang_name", None)
             yname = yang_name() if yang_name is not None else element_name
@@ -444,6 +447,23 @@ def make_generate_ietf_tree(yname_ns_func):
     return generate_ietf_tree
 
 
+@contextmanager
+def _deferred_registration(obj, path_helper):
+    # the objects that are created by a load are registered with the path
+    # helper in one pass when the load completes - or when the path helper is
+    # queried during the load, such as by a leafref - rather than each being
+    # registered as it is created. Where the load fails, the objects that it
+    # created remain in the tree, so they are still registered.
+    if obj is not None:
+        path_helper = getattr(obj, "_path_helper", None)
+    batch = getattr(path_helper, "batch", None) if path_helper else None
+    if batch is None:
+        yield
+        return
+    with batch(discard=False):
+        yield
+
+
 class pybindIETFXMLDecoder(object):
     """
     IETF XML decoder for pybind object tree deserialisation.
@@ -460,6 +480,13 @@ class pybindIETFXMLDecoder(object):
     @staticmethod
     def load_xml(d, parent, yang_base, obj=None, path_helper=None, extmethods=None):
         """low-level XML deserialisation function, based on pybindJSONDecoder.load_ietf_json()"""
+        with _deferred_registration(obj, path_helper):
+            return pybindIETFXMLDecoder._load_xml(
+                d, parent, yang_base, obj=obj, path_helper=path_helper, extmethods=extmethods
+            )
+
+    @staticmethod
+    def _load_xml(d, parent, yang_base, obj=None, path_helper=None, extmethods=None):
         if obj is None:
             # we need to find the class to create, as one has not been supplied.
             base_mod_cls = getattr(parent, safe_name(yang_base))
@@ -497,7 +524,7 @@ class pybindIETFXMLDecoder(object):
                     if chobj._presence:
                         chobj._set_present()
 
-                pybindIETFXMLDecoder.load_xml(
+                pybindIETFXMLDecoder._load_xml(
                     child, None, None, obj=chobj, path_helper=path_helper, extmethods=extmethods
                 )
 
@@ -518,7 +545,7 @@ class pybindIETFXMLDecoder(object):
                     nobj = chobj[key_str]
 
                 # now we have created the nested object element, we add other members
-                pybindIETFXMLDecoder.load_xml(
+                pybindIETFXMLDecoder._load_xml(
                     child, None, None, obj=nobj, path_helper=path_helper, extmethods=extmethods
                 )
 
@@ -568,6 +595,22 @@ class pybindJSONDecoder(object):
     def load_json(
         d, parent, yang_base, obj=None, path_helper=None, extmethods=None, overwrite=False, skip_unknown=False
     ):
+        with _deferred_registration(obj, path_helper):
+            return pybindJSONDecoder._load_json(
+                d,
+                parent,
+                yang_base,
+                obj=obj,
+                path_helper=path_helper,
+                extmethods=extmethods,
+                overwrite=overwrite,
+                skip_unknown=skip_unknown,
+            )
+
+    @staticmethod
+    def _load_json(
+        d, parent, yang_base, obj=None, path_helper=None, extmethods=None, overwrite=False, skip_unknown=False
+    ):
 
         if obj is None:
             # we need to find the class to create, as one has not been supplied.
@@ -615,7 +658,12 @@ class pybindJSONDecoder(object):
                     for elem in chobj._pyangbind_elements:
                         unsetchildelem = getattr(chobj, "_unset_%s" % elem)
                         unsetchildelem()
-                pybindJSONDecoder.load_json(
+                    # the objects that were beneath the container are replaced
+                    # in the path helper by those that have been reset.
+                    helper = getattr(chobj, "_path_helper", False)
+                    if helper and hasattr(helper, "register_subtree"):
+                        helper.register_subtree(chobj._path(), chobj)
+                pybindJSONDecoder._load_json(
                     d[key], chobj, yang_base, obj=chobj, path_helper=path_helper, skip_unknown=skip_unknown
                 )
                 set_via_stdmethod = False
@@ -653,7 +701,7 @@ class pybindJSONDecoder(object):
                     if child_key not in chobj:
                         chobj.add(child_key)
                     parent = chobj[child_key]
-                    pybindJSONDecoder.load_json(
+                    pybindJSONDecoder._load_json(
                         d[key][child_key],
                         parent,
                         yang_base,
@@ -672,12 +720,22 @@ class pybindJSONDecoder(object):
                     for item in d[key]:
                         if item not in list_obj:
                             list_obj.append(item)
-                    list_copy = []
-                    for elem in list_obj:
-                        list_copy.append(elem)
-                    for e in list_copy:
-                        if e not in d[key]:
-                            list_obj.remove(e)
+                    # remove the items that are no longer in the list in a
+                    # single pass, using a set of the new items where they
+                    # are all hashable.
+                    try:
+                        new_items = set(d[key])
+                    except TypeError:
+                        new_items = d[key]
+
+                    def keep(item):
+                        try:
+                            return item in new_items
+                        except TypeError:
+                            return item in d[key]
+
+                    if list_obj._retain(keep):
+                        list_obj._set()
                     set_via_stdmethod = False
                 else:
                     # use the set method
@@ -707,6 +765,22 @@ class pybindJSONDecoder(object):
     @staticmethod
     def load_ietf_json(
         d, parent, yang_base, obj=None, path_helper=None, extmethods=None, overwrite=False, skip_unknown=False
+    ):
+        with _deferred_registration(obj, path_helper):
+            return pybindJSONDecoder._load_ietf_json(
+                d,
+                parent,
+                yang_base,
+                obj=obj,
+                path_helper=path_helper,
+                extmethods=extmethods,
+                overwrite=overwrite,
+                skip_unknown=skip_unknown,
+            )
+
+    @staticmethod
+    def _load_ietf_json(
+        d, parent, yang_base, obj=None, path_helper=None, extmethods=None, overwrite=False, skip_unknown=False
     ):
         if obj is None:
             # we need to find the class to create, as one has not been supplied.
@@ -768,7 +842,7 @@ class pybindJSONDecoder(object):
                         chobj._set_present()
 
                 pybindJSONDecoder.check_metadata_add(key, d, chobj)
-                pybindJSONDecoder.load_ietf_json(
+                pybindJSONDecoder._load_ietf_json(
                     d[key],
                     None,
                     None,
@@ -812,7 +886,7 @@ class pybindJSONDecoder(object):
                                 nobj = this_attr.add(k)
                             else:
                                 nobj = this_attr[k]
-                        pybindJSONDecoder.load_ietf_json(
+                        pybindJSONDecoder._load_ietf_json(
                             elem,
                             None,
                             None,
@@ -25,8 +25,9 @@ xpathhelper:
 """
 from __future__ import unicode_literals
 
-import uuid
-from collections import OrderedDict
+import weakref
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
 
 import regex
 import six
@@ -48,6 +49,114 @@ class PybindImplementationError(Exception):
     pass
 
 
+# Paths that are looked up by get() - most often the referenced paths of
+# leafrefs - are compiled once, and cached between lookups by any path helper.
+_query_cache = OrderedDict()
+_query_cache_maxsize = 1024
+_query_cache_stats = {"hits": 0, "misses": 0}
+
+QueryCacheInfo = namedtuple("QueryCacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+def query_cache_info():
+    """
+    Report the number of hits and misses of the cache of compiled paths,
+    along with its maximum and current size.
+  """
+    return QueryCacheInfo(
+        _query_cache_stats["hits"], _query_cache_stats["misses"], _query_cache_maxsize, len(_query_cache)
+    )
+
+
+def clear_query_cache():
+    _query_cache.clear()
+    _query_cache_stats["hits"] = 0
+    _query_cache_stats["misses"] = 0
+
+
+class _CompiledQuery(object):
+    # The form of a path that does not depend on the caller - its parts, and
+    # the XPATH expression that selects it, in which the current()
+    # expressions are variables that are resolved on each lookup. Relative
+    # paths are evaluated from the element of the caller. The expression,
+    # and the names of the nodes that the values of a path are indexed by,
+    # are compiled when they are first used. Queries are shared by all path
+    # helpers, which differ in the paths that they walk their tree for - so
+    # the steps to walk the tree with are stored for each class of helper.
+    __slots__ = ("parts", "relative", "xpath", "variables", "steps", "names")
+
+    def __init__(self, helper, object_path, caller):
+        if isinstance(object_path, six.string_types + (six.text_type,)):
+            object_path = helper._path_parts(object_path)
+        self.parts = list(object_path)
+        self.relative = bool(len(self.parts) and helper._relative_path_re.match(self.parts[0]) and caller)
+        self.xpath = None
+        self.variables = None
+        self.steps = {}
+        self.names = None
+
+
+def _subtree_children(object_ptr):
+    # yields the name of each object directly beneath object_ptr that is
+    # registered with a path helper - as it appears in the path of the object
+    # - and the object itself. Lists are not registered themselves, so their
+    # entries are yielded in their place. Elements that have not been built
+    # are skipped, as are the entries of keyless lists, which cannot be
+    # registered.
+    elements = getattr(object_ptr, "_pyangbind_elements", None)
+    if elements is None or getattr(object_ptr, "_is_container", None) == "list":
+        return
+    for element_name in elements:
+        if not object_ptr._pyangbind_built(element_name):
+            continue
+        child = getattr(object_ptr, element_name)
+        if hasattr(child, "_keyval"):
+            if not child._keyval:
+                continue
+            for entry in child.itervalues():
+                yield (entry._supplied_register_path[-1], entry)
+        elif getattr(child, "_register_paths", True):
+            if getattr(child, "_supplied_register_path", None) is not None:
+                yield (child._supplied_register_path[-1], child)
+            else:
+                yield (child._yang_name, child)
+
+
+def _subtree_registrations(object_path, object_ptr):
+    # yields the (path, object_ptr) of object_ptr and each object beneath it,
+    # such that the parent of each object precedes it.
+    stack = [(list(object_path), object_ptr)]
+    while len(stack):
+        (path, obj) = stack.pop()
+        yield (path, obj)
+        stack.extend(reversed([(path + [name], child) for name, child in _subtree_children(obj)]))
+
+
+class _ValueIndex(object):
+    # The nodes at a path that selects every node with the same names (e.g.,
+    # /interfaces/interface/name) - stored with the text of the value of
+    # their object, and by that text, in the order that they were added.
+    __slots__ = ("nodes", "values")
+
+    def __init__(self):
+        self.nodes = OrderedDict()
+        self.values = {}
+
+    def add(self, node, value):
+        self.remove(node)
+        self.nodes[node] = value
+        self.values.setdefault(value, OrderedDict())[node] = None
+
+    def remove(self, node):
+        value = self.nodes.pop(node, None)
+        if value is None:
+            return
+        nodes = self.values[value]
+        del nodes[node]
+        if not len(nodes):
+            del self.values[value]
+
+
 class PybindXpathHelper(object):
 
     def register(self, path, object_ptr, caller=False):
@@ -82,6 +191,47 @@ class PybindXpathHelper(object):
     """
         raise PybindImplementationError("The path helper class specified does " + "not implement unregister()")
 
+    def register_subtree(self, path, object_ptr, caller=False):
+        """
+      A PybindXpathHelper class may supply a register_subtree() method that
+      takes the same arguments as register(), and registers object_ptr along
+      with every object beneath it - replacing any objects that were
+      registered beneath path. By default, the objects are registered using
+      register_many().
+    """
+        self.register_many(_subtree_registrations(path, object_ptr), caller=caller)
+
+    def unregister_subtree(self, path, caller=False):
+        """
+      A PybindXpathHelper class may supply an unregister_subtree() method that
+      takes the same arguments as unregister(), and unregisters the object at
+      path along with every object beneath it. By default, unregister() is
+      used.
+    """
+        self.unregister(path, caller=caller)
+
+    def register_many(self, registrations, caller=False):
+        """
+      A PybindXpathHelper class may supply a register_many() method that
+      takes an iterable of (path, object_ptr) tuples, in the order that the
+      objects were created, and registers each of them. By default, each
+      object is registered using register().
+    """
+        for object_path, object_ptr in registrations:
+            self.register(object_path, object_ptr, caller=caller)
+
+    @contextmanager
+    def batch(self, discard=True):
+        """
+      A PybindXpathHelper class may supply a batch() context manager, within
+      which registrations may be deferred until the context is exited, such
+      that they can be made using register_many(). If an exception is raised
+      within the context, the deferred registrations are discarded - unless
+      discard is False, in which case they are made before the exception is
+      propagated. By default, registrations are not deferred.
+    """
+        yield
+
     def get(self, path, caller=False):
         """
       A PybindXpathHelper class should supply a get() method that takes one
@@ -94,6 +244,25 @@ class PybindXpathHelper(object):
     """
         raise PybindImplementationError("The path helper class specified does " + "not implement get()")
 
+    def get_by_value(self, path, value, caller=False):
+        """
+      A PybindXpathHelper class may supply a get_by_value() method that takes
+      the same arguments as get(), along with a value, and returns the objects
+      at path whose value is the same as value when both are converted to
+      text - such as the instances that a leafref may refer to. By default,
+      each of the objects returned by get() is compared.
+    """
+        value = six.text_type(value)
+        return [obj for obj in self.get(path, caller=caller) if six.text_type(obj) == value]
+
+    def count(self, path, caller=False):
+        """
+      A PybindXpathHelper class may supply a count() method that takes the
+      same arguments as get(), and returns the number of objects at path. By
+      default, the objects returned by get() are counted.
+    """
+        return len(self.get(path, caller=caller))
+
 
 # A class which acts as "/" within the hierarchy - it acts as per any other
 # PyangBind element for the purposes of get() calls - allowing "/" to be
@@ -104,6 +273,29 @@ class FakeRoot(PybindBase):
     def __init__(self):
         self._pyangbind_elements = OrderedDict()
 
+    def __getattr__(self, name):
+        # elements that are weakly referenced by a path helper are only
+        # stored as their get method.
+        if name in self.__dict__.get("_pyangbind_elements", ()):
+            return getattr(self, "_get_%s" % safe_name(name))()
+        raise AttributeError(name)
+
+
+class _ChildReference(object):
+    # A weak reference to an object that cannot be weakly referenced itself
+    # (e.g., a leaf whose type is int), which is retrieved from its parent.
+    __slots__ = ("parent", "name")
+
+    def __init__(self, parent, name):
+        self.parent = parent
+        self.name = name
+
+    def __call__(self):
+        parent = self.parent()
+        if parent is None:
+            return None
+        return getattr(parent, "_get_%s" % safe_name(self.name))()
+
 
 class YANGPathHelper(PybindXpathHelper):
     _attr_re = regex.compile("^(?P<tagname>[^\[]+)(?P<args>(\[[^\]]+\])+)$")
@@ -113,14 +305,49 @@ class YANGPathHelper(PybindXpathHelper):
         + "(?P<remainder>.*)"
     )
     _relative_path_re = regex.compile("^(\.|\.\.)")
+    _name_re = regex.compile("^[a-zA-Z_][a-zA-Z0-9\-\_\.:]*$")
+    _weak_references = False
+    # the maximum number of (path, caller) pairs whose results are cached.
+    _resolved_maxsize = 8192
 
-    def __init__(self):
+    def __init__(self, id_generator=None, weak_references=False):
         # Initialise an empty library and a new FakeRoot class to act as the
         # data tree's root.
         self._root = etree.Element("root")
         self._library = {}
         self._library["root"] = FakeRoot()
         self._root.set("obj_ptr", "root")
+        # the entries of each list, keyed by the element of their parent, the
+        # name of the list, and then the (name, value) pairs of their keys.
+        self._keyed = {}
+        if weak_references:
+            # the library holds weak references to the objects, such that a
+            # tree that is discarded can be collected. The identifiers of the
+            # objects that have been finalised are queued, and their elements
+            # are removed before the tree is next read.
+            root = self._library["root"]
+            self._library["root"] = lambda: root
+            self._weak_references = True
+            self._elements = {}
+            self._collected = []
+        # registrations that are deferred by batch(), or None when
+        # registrations are made immediately.
+        self._pending = None
+        # objects in the library are identified by a counter, unless a
+        # callable that returns a new identifier (e.g., uuid_key) is supplied.
+        self._id_generator = id_generator
+        self._last_id = 0
+        # the elements found by get() for each (path, caller) pair, which are
+        # valid until the tree next changes - when the generation is
+        # incremented.
+        self._resolved = {}
+        self._generation = 0
+        self._resolved_generation = 0
+        # the values of the nodes at the paths that get_by_value() has been
+        # used with, keyed by the names of the nodes along the path, which are
+        # updated as nodes are added, replaced and removed.
+        self._value_indices = {}
+        self._value_index_tags = set()
 
     def _path_parts(self, path):
         c = 0
@@ -149,7 +376,9 @@ class YANGPathHelper(PybindXpathHelper):
         parts.append(buf)
         return parts
 
-    def _encode_path(self, path, mode="search", find_parent=False, normalise_namespace=True, caller=False):
+    def _encode_path(
+        self, path, mode="search", find_parent=False, normalise_namespace=True, caller=False, variables=None
+    ):
         if mode not in ["search", "set"]:
             raise XPathError("Path can only be encoded based on searching or " + "setting attributes")
 
@@ -173,22 +402,15 @@ class YANGPathHelper(PybindXpathHelper):
             if attributes is not None:
                 epath += tagname + "["
                 for k, v in six.iteritems(attributes):
-                    # handling for rfc6020 current() specification
-                    if "current()" in v:
-                        remaining_path = regex.sub("current\(\)(?P<remaining>.*)", "\g<remaining>", v).split("/")
-                        # since the calling leaf may not exist, we need to do a
-                        # lookup on a path that will do, which is the parent
-                        if remaining_path[1] == "..":
-                            lookup = caller[:-1] + remaining_path[2:]
-                        else:
-                            lookup = caller + remaining_path[1:]
-                        resolved_current_attr = self.get(lookup)
-                        if not len(resolved_current_attr) == 1:
-                            raise XPathError(
-                                "XPATH specified a current() expression that " + "returned a non-unique list"
-                            )
-                        v = resolved_current_attr[0]
-                    epath += "@%s='%s' " % (k, v)
+                    if "current()" in v and variables is not None:
+                        # the expression is resolved when the path is looked
+                        # up, and supplied as a variable.
+                        variables.append(v)
+                        epath += "@%s=$current%d " % (k, len(variables) - 1)
+                    else:
+                        if "current()" in v:
+                            v = self._resolve_current(v, caller)
+                        epath += "@%s='%s' " % (k, v)
                     if mode == "search":
                         epath += "and "
                 if mode == "search":
@@ -200,6 +422,20 @@ class YANGPathHelper(PybindXpathHelper):
         epath = epath.rstrip("/")
         return epath
 
+    def _resolve_current(self, value, caller):
+        # handling for rfc6020 current() specification
+        remaining_path = regex.sub("current\(\)(?P<remaining>.*)", "\g<remaining>", value).split("/")
+        # since the calling leaf may not exist, we need to do a
+        # lookup on a path that will do, which is the parent
+        if remaining_path[1] == "..":
+            lookup = caller[:-1] + remaining_path[2:]
+        else:
+            lookup = caller + remaining_path[1:]
+        resolved_current_attr = self.get(lookup)
+        if not len(resolved_current_attr) == 1:
+            raise XPathError("XPATH specified a current() expression that " + "returned a non-unique list")
+        return resolved_current_attr[0]
+
     def _tagname_attributes(self, tag, normalise_namespace=True):
         tagname, attributes = tag, None
         if self._attr_re.match(tag):
@@ -224,92 +460,544 @@ class YANGPathHelper(PybindXpathHelper):
                         )
         return (tagname, attributes)
 
-    def register(self, object_path, object_ptr, caller=False):
+    def _check_register_path(self, object_path):
         if isinstance(object_path, str):
             raise XPathError("not meant to receive strings as input to register()")
 
-        if regex.match("^\.\.", object_path[0]):
+        if object_path[0].startswith(".."):
             raise XPathError("unhandled relative path in register()")
 
+    def register(self, object_path, object_ptr, caller=False):
+        self._check_register_path(object_path)
+        if self._pending is not None:
+            self._pending.append((object_path, object_ptr))
+            return
+        (_, created) = self._register(object_path, object_ptr)
+        if not created:
+            return True
+
+    def register_many(self, registrations, caller=False):
+        # An object whose parent was added to the tree by this call cannot
+        # already be registered, and the element for its parent is known, so
+        # it can be added without searching the tree. Parents that were
+        # already in the tree are searched for once.
+        added = {}
+        parents = {}
+        for object_path, object_ptr in registrations:
+            self._check_register_path(object_path)
+            parent_path = tuple(object_path[:-1])
+            parent_o = added.get(parent_path)
+            if tuple(object_path) in added:
+                # the object was replaced after it was registered by this call.
+                self._update_element(added[tuple(object_path)], object_ptr)
+                continue
+            if parent_o is not None:
+                (element, created) = self._register(object_path, object_ptr, parent_o=parent_o, check_existing=False)
+            else:
+                if parent_path not in parents and len(parent_path):
+                    parents[parent_path] = self._get_parent_etree(object_path)
+                (element, created) = self._register(object_path, object_ptr, parent_o=parents.get(parent_path))
+            if created:
+                added[tuple(object_path)] = element
+
+    def register_subtree(self, object_path, object_ptr, caller=False):
+        # The subtree is walked once, and each object is added beneath the
+        # element of its parent, without searching the tree. Where an object
+        # is already registered at object_path, the objects beneath it are
+        # replaced - so registrations that are deferred by a batch are made
+        # first, and the subtree is registered immediately.
+        self._check_register_path(object_path)
+        if self._pending:
+            self._flush_pending()
+        (element, created) = self._register(object_path, object_ptr)
+        if not created:
+            for child in self._child_elements(element):
+                self._remove_element(child)
+        stack = [(element, object_ptr)]
+        while len(stack):
+            (parent_o, parent_ptr) = stack.pop()
+            for name, child_ptr in _subtree_children(parent_ptr):
+                (tagname, attributes) = self._tagname_attributes(name)
+                stack.append((self._add_element(parent_o, tagname, attributes, child_ptr), child_ptr))
+
+    @contextmanager
+    def batch(self, discard=True):
+        if self._pending is not None:
+            # nested batches are registered when the outermost is exited.
+            yield
+            return
+        self._pending = []
+        try:
+            yield
+        except Exception:
+            pending, self._pending = self._pending, None
+            if not discard:
+                # the objects that were created before the exception still
+                # exist, so they are registered.
+                self.register_many(pending)
+            raise
+        pending, self._pending = self._pending, None
+        self.register_many(pending)
+
+    def _flush_pending(self):
+        # registrations that are deferred by a batch are made before the tree
+        # is read or modified, such that lookups made within the batch (e.g.,
+        # by leafrefs) see the objects that it has created.
+        pending, self._pending = self._pending, []
+        self.register_many(pending)
+
+    def _new_id(self):
+        if self._id_generator is not None:
+            return self._id_generator()
+        self._last_id += 1
+        return six.text_type(self._last_id)
+
+    def _register(self, object_path, object_ptr, parent_o=None, check_existing=True):
         # This is a hack to register anything that is a top-level object,
         # it allows modules to register themselves against the FakeRoot
         # class which acts as per other PyangBind objects.
         if len(object_path) == 1:
-            setattr(self._library["root"], object_path[0], object_ptr)
-            setattr(self._library["root"], "_get_%s" % safe_name(object_path[0]), lambda: object_ptr)
-            self._library["root"]._pyangbind_elements[object_path[0]] = None
+            fake_root = self._root_object()
+            if self._weak_references:
+                setattr(fake_root, "_get_%s" % safe_name(object_path[0]), self._reference(object_ptr))
+            else:
+                setattr(fake_root, object_path[0], object_ptr)
+                setattr(fake_root, "_get_%s" % safe_name(object_path[0]), lambda: object_ptr)
+            fake_root._pyangbind_elements[object_path[0]] = None
 
         # check whether we're updating
-        this_obj_existing = self._get_etree(object_path)
-        if len(this_obj_existing) > 1:
-            raise XPathError("duplicate objects in tree - %s" % object_path)
-        if this_obj_existing is not None and not this_obj_existing == []:
-            this_obj_existing = this_obj_existing[0]
-            if self._library[this_obj_existing.get("obj_ptr")] == object_ptr:
-                return True
-            else:
-                del self._library[this_obj_existing.get("obj_ptr")]
-                new_uuid = str(uuid.uuid1())
-                self._library[new_uuid] = object_ptr
-                this_obj_existing.set("obj_ptr", new_uuid)
-                return True
-
-        this_obj_id = str(uuid.uuid1())
-        self._library[this_obj_id] = object_ptr
-        parent = object_path[:-1]
+        if check_existing:
+            this_obj_existing = self._get_etree(object_path, cache=False)
+            if len(this_obj_existing) > 1:
+                raise XPathError("duplicate objects in tree - %s" % object_path)
+            if this_obj_existing is not None and not this_obj_existing == []:
+                this_obj_existing = this_obj_existing[0]
+                self._update_element(this_obj_existing, object_ptr)
+                return (this_obj_existing, False)
+
         (tagname, attributes) = self._tagname_attributes(object_path[-1])
 
-        if parent == []:
-            parent_o = self._root
+        if parent_o is None:
+            parent_o = self._get_parent_etree(object_path)
+
+        return (self._add_element(parent_o, tagname, attributes, object_ptr), True)
+
+    def _root_object(self):
+        return self._object("root")
+
+    def _object(self, obj_id):
+        if self._weak_references:
+            return self._library[obj_id]()
+        return self._library[obj_id]
+
+    def _reference(self, object_ptr, obj_id=None):
+        # returns a callable that returns object_ptr until it is finalised,
+        # after which the identifier obj_id is queued for removal. Objects
+        # that cannot be weakly referenced are retrieved from their parent.
+        callback = None
+        if obj_id is not None:
+            collected = self._collected
+
+            def callback(ref):
+                collected.append(obj_id)
+
+        try:
+            return weakref.ref(object_ptr, callback)
+        except TypeError:
+            pass
+        parent = getattr(object_ptr, "_parent", None)
+        try:
+            return _ChildReference(weakref.ref(parent, callback), object_ptr._yang_name)
+        except (TypeError, AttributeError):
+            return lambda: object_ptr
+
+    def _store(self, obj_id, object_ptr, element):
+        if self._weak_references:
+            self._library[obj_id] = self._reference(object_ptr, obj_id)
+            self._elements[obj_id] = element
         else:
-            parent_o = self._get_etree(parent)
-            if len(parent_o) > 1:
-                raise XPathError(
-                    "multiple elements returned for parent %s, must be "
-                    + "exact path for registration" % "/"
-                    + "/".join(parent)
-                )
-            if parent_o == []:
-                raise XPathError("parent node did not exist for %s @ %s" % (tagname, "/" + "/".join(parent)))
-            parent_o = parent_o[0]
+            self._library[obj_id] = object_ptr
+
+    def _release(self, obj_id):
+        del self._library[obj_id]
+        if self._weak_references:
+            del self._elements[obj_id]
 
+    def _release_collected(self):
+        # removes the elements of objects that have been finalised, along
+        # with the elements beneath them.
+        while len(self._collected):
+            element = self._elements.get(self._collected.pop())
+            if element is None:
+                continue
+            if element.getparent() is self._root:
+                fake_root = self._root_object()
+                fake_root._pyangbind_elements.pop(element.tag, None)
+                fake_root.__dict__.pop("_get_%s" % safe_name(element.tag), None)
+            self._remove_element(element)
+
+    def _add_element(self, parent_o, tagname, attributes, object_ptr):
+        this_obj_id = self._new_id()
         added_item = etree.SubElement(parent_o, tagname, obj_ptr=this_obj_id)
+        self._generation += 1
+        self._store(this_obj_id, object_ptr, added_item)
         if attributes is not None:
             for k, v in six.iteritems(attributes):
                 added_item.set(k, v)
+            key = tuple(sorted(six.iteritems(attributes)))
+            self._keyed.setdefault(parent_o, {}).setdefault(tagname, OrderedDict())[key] = added_item
+        if tagname in self._value_index_tags:
+            self._index_node(added_item, object_ptr)
+        return added_item
+
+    def _update_element(self, element, object_ptr):
+        # the object that is registered is replaced even where it is equal
+        # to the new object (e.g., a leaf that is set to the same value), as
+        # it may no longer be referenced.
+        if self._object(element.get("obj_ptr")) is object_ptr:
+            return
+        self._generation += 1
+        self._release(element.get("obj_ptr"))
+        new_id = self._new_id()
+        self._store(new_id, object_ptr, element)
+        element.set("obj_ptr", new_id)
+        if element.tag in self._value_index_tags:
+            self._index_node(element, object_ptr)
+
+    def _get_parent_etree(self, object_path):
+        parent = object_path[:-1]
+        if parent == []:
+            return self._root
+
+        parent_o = self._get_etree(parent, cache=False)
+        if len(parent_o) > 1:
+            raise XPathError(
+                "multiple elements returned for parent %s, must be "
+                + "exact path for registration" % "/"
+                + "/".join(parent)
+            )
+        if parent_o == []:
+            (tagname, _) = self._tagname_attributes(object_path[-1])
+            raise XPathError("parent node did not exist for %s @ %s" % (tagname, "/" + "/".join(parent)))
+        return parent_o[0]
 
     def unregister(self, object_path, caller=False):
         if isinstance(object_path, str):
             raise XPathError("should not receive paths as a str in unregister()")
         if regex.match("^(\.|\.\.|\/)", object_path[0]):
             raise XPathError("unhandled relative path in unregister()")
+        if self._pending:
+            self._flush_pending()
 
-        existing_objs = self._get_etree(object_path)
+        existing_objs = self._get_etree(object_path, cache=False)
         if len(existing_objs) == 0:
             raise XPathError("object did not exist to unregister - %s" % object_path)
 
         for obj in existing_objs:
-            ref = obj.get("obj_ptr")
-            del self._library[ref]
-            obj.getparent().remove(obj)
-
-    def _get_etree(self, object_path, caller=False):
-        fx_q = self._encode_path(object_path, caller=caller)
-        if self._relative_path_re.match(fx_q) and caller:
-            fx_q = "." + self._encode_path(caller)
-            fx_q += "/" + self._encode_path(object_path, caller=caller)
+            self._remove_element(obj)
+
+    def unregister_subtree(self, object_path, caller=False):
+        # removing an element from the tree removes the elements beneath it,
+        # and releases the objects that they refer to.
+        self.unregister(object_path, caller=caller)
+
+    def _child_elements(self, element):
+        return list(element)
+
+    def _remove_element(self, element):
+        # the objects that are registered beneath the element are released
+        # along with it, since they can no longer be looked up.
+        self._generation += 1
+        for removed in element.iter():
+            self._release(removed.get("obj_ptr"))
+            self._keyed.pop(removed, None)
+            if removed.tag in self._value_index_tags:
+                self._unindex_node(removed)
+        parent = element.getparent()
+        entries = self._keyed.get(parent, {}).get(element.tag)
+        if entries is not None:
+            key = tuple(sorted((k, v) for k, v in element.items() if k != "obj_ptr"))
+            if entries.get(key) is element:
+                del entries[key]
+            if not len(entries):
+                del self._keyed[parent][element.tag]
+        parent.remove(element)
+
+    def _parent_node(self, node):
+        return node.getparent()
+
+    def _child_nodes(self, node, tagname):
+        return node.iterchildren(tagname)
+
+    def _keyed_nodes(self, node, tagname):
+        return self._keyed.get(node, {}).get(tagname)
+
+    def _node_tag(self, node):
+        return node.tag
+
+    def _node_object(self, node):
+        return self._object(node.get("obj_ptr"))
+
+    def _node_names(self, node):
+        names = []
+        while node is not None and node is not self._root:
+            names.append(self._node_tag(node))
+            node = self._parent_node(node)
+        return tuple(reversed(names))
+
+    def _index_node(self, node, object_ptr):
+        index = self._value_indices.get(self._node_names(node))
+        if index is not None:
+            index.add(node, six.text_type(object_ptr))
+
+    def _unindex_node(self, node):
+        index = self._value_indices.get(self._node_names(node))
+        if index is not None:
+            index.remove(node)
+
+    def _index_names(self, object_path, caller=False):
+        # returns the names of the nodes along a path that selects every
+        # node with those names - such that its nodes can be indexed by their
+        # values - or None.
+        query = self._compile(object_path, caller=caller)
+        if query.names is None:
+            steps = self._parse_steps(query)
+            names = None
+            if steps is not None and not steps[0] and len(steps[1]):
+                names = []
+                for step in steps[1]:
+                    if not isinstance(step, tuple) or step[1] is not None:
+                        names = None
+                        break
+                    names.append(step[0])
+            query.names = (tuple(names) if names is not None else None,)
+        return query.names[0]
+
+    def _value_index(self, object_path, caller=False):
+        # returns the index of the values of the nodes at a path, which is
+        # built when it is first used, or None where the path cannot be
+        # indexed.
+        names = self._index_names(object_path, caller=caller)
+        if names is None:
+            return None
+        self._refresh()
+        index = self._value_indices.get(names)
+        if index is None:
+            nodes = self._get_etree(object_path, caller=caller)
+            index = self._value_indices[names] = _ValueIndex()
+            self._value_index_tags.add(names[-1])
+            for node in nodes:
+                index.add(node, six.text_type(self._node_object(node)))
+        return index
+
+    def get_by_value(self, object_path, value, caller=False):
+        index = self._value_index(object_path, caller=caller)
+        if index is None:
+            return super(YANGPathHelper, self).get_by_value(object_path, value, caller=caller)
+        retr_obj = [self._node_object(node) for node in index.values.get(six.text_type(value), ())]
+        if self._weak_references:
+            return [obj for obj in retr_obj if obj is not None]
+        return retr_obj
+
+    def count(self, object_path, caller=False):
+        index = self._value_index(object_path, caller=caller)
+        if index is None:
+            return super(YANGPathHelper, self).count(object_path, caller=caller)
+        return len(index.nodes)
+
+    def _parse_part(self, part):
+        # returns the name of the node that a part of a path refers to, and
+        # the (name, value) pairs of its predicate, or None where the part is
+        # not a name that can be looked up in the tree.
+        if "[" in part:
+            (tagname, attributes) = self._tagname_attributes(part)
+        else:
+            (tagname, attributes) = (part, None)
+        if ":" in tagname:
+            tagname = tagname.split(":")[1]
+        if not self._name_re.match(tagname):
+            return None
+        return (tagname, attributes)
+
+    def _predicate_key(self, attributes, caller):
+        key = []
+        for k, v in six.iteritems(attributes):
+            if "current()" in v:
+                v = "%s" % self._resolve_current(v, caller)
+            key.append((k, v))
+        return tuple(sorted(key))
+
+    def _match(self, entries, key):
+        # entries is the index of the entries of a list, keyed by the (name,
+        # value) pairs of their keys. Returns None where the predicate is not
+        # on all of the keys of the list, such that the path is evaluated as
+        # XPATH.
+        entry = entries.get(key)
+        if entry is not None:
+            return [entry]
+        if [k for k, _ in next(iter(entries))] == [k for k, _ in key]:
+            return []
+        return None
+
+    def _steps(self, query):
+        # Paths without predicates are evaluated as XPATH, which is quicker
+        # than walking the tree where there are many nodes at a step.
+        steps = self._parse_steps(query)
+        if steps is None or not any(isinstance(step, tuple) and step[1] is not None for step in steps[1]):
+            return None
+        return steps
+
+    def _parse_steps(self, query):
+        # returns whether a path is relative to the caller, and the steps to
+        # walk the tree from the root or the caller - which are "." or "..",
+        # or the name of a node and its predicate - or None if the path
+        # cannot be resolved by walking the tree.
+        parts = list(query.parts)
+        while len(parts) and parts[-1] == "":
+            parts.pop()
+        relative = False
+        if len(parts) and parts[0] == "":
+            parts = parts[1:]
+        elif len(parts) and self._relative_path_re.match(parts[0]):
+            if not query.relative:
+                return None
+            relative = True
+        steps = []
+        for part in parts:
+            step = part if part in [".", ".."] else self._parse_part(part)
+            if step is None:
+                return None
+            steps.append(step)
+        return (relative, steps)
+
+    def _find(self, query, caller=False):
+        # returns the nodes at a path, or None if the path cannot be resolved
+        # by walking the tree - in which case, it is evaluated as XPATH. List
+        # entries that are selected by all of their keys are found using the
+        # index of the entries of the list. As per XPATH, an empty path - as
+        # opposed to "/" - does not refer to the root.
+        if not len(query.parts):
+            return []
+        try:
+            plan = query.steps[type(self)]
+        except KeyError:
+            plan = query.steps[type(self)] = self._steps(query)
+        if plan is None:
+            return None
+        (relative, steps) = plan
+        nodes = [self._root]
+        if relative:
+            nodes = self._find(self._compile(caller))
+            if nodes is None:
+                return None
+
+        for step in steps:
+            if step == ".":
+                continue
+            elif step == "..":
+                parents = OrderedDict()
+                for node in nodes:
+                    parent = self._parent_node(node)
+                    if parent is not None:
+                        parents[id(parent)] = parent
+                nodes = list(parents.values())
+                continue
+            (tagname, attributes) = step
+            key = self._predicate_key(attributes, caller) if attributes is not None else None
+            matched = []
+            for node in nodes:
+                if key is None:
+                    matched.extend(self._child_nodes(node, tagname))
+                    continue
+                entries = self._keyed_nodes(node, tagname)
+                if entries is None:
+                    continue
+                entries = self._match(entries, key)
+                if entries is None:
+                    return None
+                matched.extend(entries)
+            nodes = matched
+            if not len(nodes):
+                break
+        return nodes
+
+    def _compile(self, object_path, caller=False, cache=True):
+        # paths that are registered are generally only looked up once, so are
+        # not cached, such that they do not displace paths that are reused.
+        if not cache:
+            return _CompiledQuery(self, object_path, caller)
+        if isinstance(object_path, six.string_types + (six.text_type,)):
+            key = (object_path, bool(caller))
         else:
-            if not fx_q == "/":
+            key = (tuple(object_path), bool(caller))
+        try:
+            query = _query_cache.pop(key)
+            _query_cache_stats["hits"] += 1
+        except KeyError:
+            _query_cache_stats["misses"] += 1
+            query = _CompiledQuery(self, object_path, caller)
+            while len(_query_cache) >= _query_cache_maxsize:
+                _query_cache.popitem(last=False)
+        _query_cache[key] = query
+        return query
+
+    def _evaluate(self, root, query, caller=False):
+        # returns the elements below root that are selected by query.
+        if query.xpath is None:
+            query.variables = []
+            fx_q = self._encode_path(query.parts, variables=query.variables)
+            if not query.relative and not fx_q == "/":
                 fx_q = "." + fx_q
+            query.xpath = etree.XPath(fx_q)
+        variables = {}
+        for index, expression in enumerate(query.variables):
+            variables["current%d" % index] = "%s" % self._resolve_current(expression, caller)
+        if not query.relative:
+            return query.xpath(root, **variables)
+        contexts = self._evaluate(root, self._compile(caller), False)
+        if len(contexts) == 1:
+            return query.xpath(contexts[0], **variables)
+        retr_obj = []
+        for context in contexts:
+            retr_obj.extend(e for e in query.xpath(context, **variables) if e not in retr_obj)
+        return retr_obj
+
+    def _refresh(self):
+        # registrations that are deferred by a batch are made, and the objects
+        # that have been finalised are removed, before the tree is read.
+        if self._pending:
+            self._flush_pending()
+        if self._weak_references and len(self._collected):
+            self._release_collected()
 
-        retr_obj = self._root.xpath(fx_q)
+    def _get_etree(self, object_path, caller=False, cache=True):
+        self._refresh()
+        query = self._compile(object_path, caller=caller, cache=cache)
+        if not cache:
+            return self._lookup(query, caller=caller)
+        # the referenced paths of leafrefs are looked up each time that they
+        # are read, so the results are cached until the tree changes.
+        if self._resolved_generation != self._generation or len(self._resolved) >= self._resolved_maxsize:
+            self._resolved.clear()
+            self._resolved_generation = self._generation
+        key = (query, tuple(caller) if isinstance(caller, list) else caller)
+        retr_obj = self._resolved.get(key)
+        if retr_obj is None:
+            retr_obj = self._resolved[key] = self._lookup(query, caller=caller)
         return retr_obj
 
-    def get(self, object_path, caller=False):
-        if isinstance(object_path, six.string_types + (six.text_type,)):
-            object_path = self._path_parts(object_path)
+    def _lookup(self, query, caller=False):
+        retr_obj = self._find(query, caller=caller)
+        if retr_obj is None:
+            retr_obj = self._evaluate(self._root, query, caller=caller)
+        return retr_obj
 
-        return [self._library[i.get("obj_ptr")] for i in self._get_etree(object_path, caller=caller)]
+    def get(self, object_path, caller=False):
+        retr_obj = [self._object(i.get("obj_ptr")) for i in self._get_etree(object_path, caller=caller)]
+        if self._weak_references:
+            # objects that are finalised during the lookup are not returned.
+            return [obj for obj in retr_obj if obj is not None]
+        return retr_obj
 
     def get_unique(self, object_path, caller=False, exception_to_raise=YANGPathHelperException):
         obj = self.get(object_path, caller=caller)
@@ -334,4 +1022,156 @@ class YANGPathHelper(PybindXpathHelper):
         return list_get_attr()
 
     def tostring(self, pretty_print=False):
+        self._refresh()
         return etree.tostring(self._root, pretty_print=pretty_print)
+
+
+class _PathNode(object):
+    # A node of the tree held by a YANGTriePathHelper. Its children are
+    # stored by their name, and then by the (name, value) pairs of their keys
+    # - which are empty for nodes other than list entries.
+    __slots__ = ("obj", "parent", "tagname", "key", "children")
+
+    def __init__(self, obj, parent=None, tagname="root", key=()):
+        self.obj = obj
+        self.parent = parent
+        self.tagname = tagname
+        self.key = key
+        self.children = None
+
+
+class YANGTriePathHelper(YANGPathHelper):
+    """
+    A path helper with the same interface as YANGPathHelper, which stores
+    the registered objects in a tree of dictionaries - keyed by the name of
+    each node, and the values of the keys of list entries - rather than in
+    an XML document. Registering an object, and retrieving the objects at a
+    path made up of names and key predicates, takes time proportional to the
+    depth of the path. Paths that cannot be resolved by walking the tree
+    (e.g., those including '//', wildcards or XPATH functions) are evaluated
+    as XPATH against an XML document built from the tree.
+  """
+
+    def __init__(self):
+        self._root = _PathNode(FakeRoot())
+        # registrations that are deferred by batch(), or None when
+        # registrations are made immediately.
+        self._pending = None
+        # the XML document that XPATH expressions are evaluated against, and
+        # the nodes that its elements refer to - built when first needed.
+        self._document = None
+        self._resolved = {}
+        self._generation = 0
+        self._resolved_generation = 0
+        # the values of the nodes at the paths that get_by_value() has been
+        # used with, keyed by the names of the nodes along the path, which are
+        # updated as nodes are added, replaced and removed.
+        self._value_indices = {}
+        self._value_index_tags = set()
+
+    def _xml_document(self):
+        if self._document is None:
+            root = etree.Element("root", obj_ptr="0")
+            nodes = [self._root]
+            stack = [(self._root, root)]
+            while len(stack):
+                (node, element) = stack.pop()
+                if node.children is None:
+                    continue
+                for entries in six.itervalues(node.children):
+                    for child in six.itervalues(entries):
+                        child_element = etree.SubElement(element, child.tagname, obj_ptr=six.text_type(len(nodes)))
+                        for k, v in child.key:
+                            child_element.set(k, v)
+                        nodes.append(child)
+                        stack.append((child, child_element))
+            self._document = (root, nodes)
+        return self._document
+
+    def _lookup(self, query, caller=False):
+        nodes = self._find(query, caller=caller)
+        if nodes is None:
+            (root, all_nodes) = self._xml_document()
+            nodes = []
+            for element in self._evaluate(root, query, caller=caller):
+                if isinstance(element, etree._Element) and element.get("obj_ptr") is not None:
+                    nodes.append(all_nodes[int(element.get("obj_ptr"))])
+        return nodes
+
+    def get(self, object_path, caller=False):
+        return [node.obj for node in self._get_etree(object_path, caller=caller)]
+
+    def _root_object(self):
+        return self._root.obj
+
+    def _add_element(self, parent_o, tagname, attributes, object_ptr):
+        if ":" in tagname:
+            tagname = tagname.split(":")[1]
+        key = tuple(sorted(six.iteritems(attributes))) if attributes is not None else ()
+        added_item = _PathNode(object_ptr, parent_o, tagname, key)
+        if parent_o.children is None:
+            parent_o.children = OrderedDict()
+        parent_o.children.setdefault(tagname, OrderedDict())[key] = added_item
+        self._document = None
+        self._generation += 1
+        if tagname in self._value_index_tags:
+            self._index_node(added_item, object_ptr)
+        return added_item
+
+    def _update_element(self, element, object_ptr):
+        if element.obj is not object_ptr:
+            element.obj = object_ptr
+            self._generation += 1
+            if element.tagname in self._value_index_tags:
+                self._index_node(element, object_ptr)
+
+    def _match(self, entries, key):
+        # the entries of a list are stored by the values of all of their
+        # keys, so are only searched where the predicate is on other names.
+        matched = super(YANGTriePathHelper, self)._match(entries, key)
+        if matched is None:
+            matched = [entry for entry_key, entry in six.iteritems(entries) if set(key) <= set(entry_key)]
+        return matched
+
+    def _steps(self, query):
+        return self._parse_steps(query)
+
+    def _parent_node(self, node):
+        return node.parent
+
+    def _child_nodes(self, node, tagname):
+        entries = node.children.get(tagname) if node.children is not None else None
+        return entries.values() if entries is not None else ()
+
+    def _keyed_nodes(self, node, tagname):
+        return node.children.get(tagname) if node.children is not None else None
+
+    def _node_tag(self, node):
+        return node.tagname
+
+    def _node_object(self, node):
+        return node.obj
+
+    def _child_elements(self, element):
+        if element.children is None:
+            return []
+        return [child for entries in six.itervalues(element.children) for child in six.itervalues(entries)]
+
+    def _remove_element(self, element):
+        if len(self._value_index_tags):
+            stack = [element]
+            while len(stack):
+                node = stack.pop()
+                if node.tagname in self._value_index_tags:
+                    self._unindex_node(node)
+                stack.extend(self._child_elements(node))
+        entries = element.parent.children[element.tagname]
+        del entries[element.key]
+        if not len(entries):
+            del element.parent.children[element.tagname]
+        self._document = None
+        self._generation += 1
+
+    def tostring(self, pretty_print=False):
+        self._refresh()
+        return etree.tostring(self._xml_document()[0], pretty_print=pretty_print)
@@ -22,8 +22,8 @@ limitations under the License.
 from __future__ import unicode_literals
 
 import collections
-import copy
 import uuid
+import weakref
 from decimal import Decimal
 
 import regex
@@ -130,6 +130,13 @@ def safe_name(arg):
     return arg
 
 
+# Types built by the RestrictedPrecisionDecimalType, RestrictedClassType and
+# TypedListType factories are interned on their arguments. The generated
+# bindings call these factories each time that a value is set, so this means
+# that a single type is used per restriction rather than a new type per call.
+_type_cache = weakref.WeakValueDictionary()
+
+
 def RestrictedPrecisionDecimalType(*args, **kwargs):
     """
     Function to return a new type that is based on decimal.Decimal with
@@ -137,6 +144,13 @@ def RestrictedPrecisionDecimalType(*args, **kwargs):
   """
     precision = kwargs.pop("precision", False)
 
+    cache_key = None
+    if not args and not kwargs:
+        cache_key = ("RestrictedPrecisionDecimal", precision)
+        cached_type = _type_cache.get(cache_key)
+        if cached_type is not None:
+            return cached_type
+
     class RestrictedPrecisionDecimal(Decimal):
         """
       Class extending decimal.Decimal to restrict the precision that is
@@ -163,7 +177,341 @@ def RestrictedPrecisionDecimalType(*args, **kwargs):
             obj = Decimal.__new__(self, value, **kwargs)
             return obj
 
-    return type(RestrictedPrecisionDecimal(*args, **kwargs))
+    restricted_type = type(RestrictedPrecisionDecimal(*args, **kwargs))
+    if cache_key is not None:
+        _type_cache[cache_key] = restricted_type
+    return restricted_type
+
+
+# Regular expressions used to parse the range and length arguments of a
+# restricted type.
+_range_regex = regex.compile(r"(?P<low>\-?[0-9\.]+|min)([ ]+)?\.\.([ ]+)?" + r"(?P<high>(\-?[0-9\.]+|max))")
+_range_single_value_regex = regex.compile(r"(?P<value>\-?[0-9\.]+)")
+
+
+def convert_regexp(pattern):
+    # Some patterns include a $ character in them in some IANA modules, this
+    # is not escaped. Do some logic to escape them, whilst leaving one at the
+    # end of the string if it's there.
+    trimmed = False
+    if pattern[-1] == "$":
+        tmp_pattern = pattern[:-1]
+        trimmed = True
+    else:
+        tmp_pattern = pattern
+    tmp_pattern = tmp_pattern.replace("$", r"\$")
+    pattern = tmp_pattern
+    if trimmed:
+        pattern += "$"
+
+    if not pattern[0] == "^":
+        pattern = "^%s" % pattern
+    if not pattern[len(pattern) - 1] == "$":
+        pattern = "%s$" % pattern
+
+    return pattern
+
+
+def _build_length_range_tuples(range_spec, base_type, length=False, multiplier=1):
+    if _range_regex.match(range_spec):
+        low, high = _range_regex.sub(r"\g<low>,\g<high>", range_spec).split(",")
+        if not length:
+            high = base_type(high) if not high == "max" else None
+            low = base_type(low) if not low == "min" else None
+        else:
+            high = int(high) * multiplier if not high == "max" else None
+            low = int(low) * multiplier if not low == "min" else None
+        return (low, high)
+    elif _range_single_value_regex.match(range_spec):
+        eqval = _range_single_value_regex.sub(r"\g<value>", range_spec)
+        if not length:
+            eqval = base_type(eqval) if eqval not in ["max", "min"] else None
+        else:
+            eqval = int(eqval) * multiplier
+        return (eqval,)
+    else:
+        raise ValueError("Invalid range or length argument specified")
+
+
+class _PatternNotAnalysed(Exception):
+    pass
+
+
+def _pattern_first_characters(pattern):
+    """
+    Return the set of characters that a non-empty string that matches the
+    regular expression pattern can start with, or None where this cannot be
+    determined. Only literals, simple character classes, groups, alternation
+    and quantifiers are analysed - the set is not determined for patterns
+    where any other construct can match the first character.
+  """
+    try:
+        (first, _, end) = _first_of_alternation(pattern, 0)
+    except (_PatternNotAnalysed, IndexError):
+        return None
+    if end != len(pattern):
+        return None
+    return frozenset(first)
+
+
+def _first_of_alternation(pattern, i):
+    # returns the characters that the alternation starting at i can start
+    # with, whether it can match an empty string, and the index at which
+    # it ends.
+    first, nullable = set(), False
+    while True:
+        (branch_first, branch_nullable, i) = _first_of_sequence(pattern, i)
+        first |= branch_first
+        nullable = nullable or branch_nullable
+        if i < len(pattern) and pattern[i] == "|":
+            i += 1
+            continue
+        return (first, nullable, i)
+
+
+def _first_of_sequence(pattern, i):
+    first, nullable = set(), True
+    while i < len(pattern) and pattern[i] not in "|)":
+        (atom_first, atom_nullable, i) = _first_of_atom(pattern, i)
+        (minimum, i) = _quantifier_minimum(pattern, i)
+        if nullable:
+            if atom_first is None:
+                raise _PatternNotAnalysed()
+            first |= atom_first
+        nullable = nullable and (atom_nullable or minimum == 0)
+    return (first, nullable, i)
+
+
+def _first_of_atom(pattern, i):
+    # returns None as the characters for an atom that is understood well
+    # enough to be skipped, but whose characters are not determined.
+    c = pattern[i]
+    if c == "(":
+        if pattern[i + 1 : i + 3] == "?:":
+            i += 3
+        elif pattern[i + 1] == "?":
+            raise _PatternNotAnalysed()
+        else:
+            i += 1
+        (first, nullable, i) = _first_of_alternation(pattern, i)
+        if pattern[i] != ")":
+            raise _PatternNotAnalysed()
+        return (first, nullable, i + 1)
+    elif c == "[":
+        return _first_of_class(pattern, i)
+    elif c == "\\":
+        escaped = pattern[i + 1]
+        if escaped in "pP":
+            if pattern[i + 2] == "{":
+                return (None, False, pattern.index("}", i) + 1)
+            return (None, False, i + 3)
+        elif escaped in "dDwWsS":
+            return (None, False, i + 2)
+        elif escaped.isalnum():
+            raise _PatternNotAnalysed()
+        return (set([escaped]), False, i + 2)
+    elif c == ".":
+        return (None, False, i + 1)
+    elif c in "^$":
+        return (set(), True, i + 1)
+    elif c in "*+?{}]":
+        raise _PatternNotAnalysed()
+    return (set([c]), False, i + 1)
+
+
+def _first_of_class(pattern, i):
+    i += 1
+    # the characters that negated classes, and those that include escapes
+    # such as \d or \p{L}, match are not determined.
+    determined = pattern[i] != "^"
+    if not determined:
+        i += 1
+    characters = set()
+    start = i
+    while pattern[i] != "]" or i == start:
+        if pattern[i] == "[":
+            raise _PatternNotAnalysed()
+        if pattern[i] == "\\":
+            escaped = pattern[i + 1]
+            if escaped in "pP" and pattern[i + 2] == "{":
+                determined = False
+                i = pattern.index("}", i) + 1
+                continue
+            elif escaped in "dDwWsS":
+                determined = False
+                i += 2
+                continue
+            elif escaped.isalnum():
+                raise _PatternNotAnalysed()
+            low = escaped
+            i += 2
+        else:
+            low = pattern[i]
+            i += 1
+        if pattern[i] == "-" and pattern[i + 1] != "]":
+            high = pattern[i + 1]
+            i += 2
+            if high == "\\":
+                high = pattern[i]
+                if high.isalnum():
+                    raise _PatternNotAnalysed()
+                i += 1
+            if ord(high) - ord(low) > 1024:
+                raise _PatternNotAnalysed()
+            characters.update(six.unichr(o) for o in range(ord(low), ord(high) + 1))
+        else:
+            characters.add(low)
+    return (characters if determined else None, False, i + 1)
+
+
+_quantifier_regex = regex.compile(r"\{(?P<minimum>[0-9]*)(,[0-9]*)?\}")
+
+
+def _quantifier_minimum(pattern, i):
+    if i >= len(pattern):
+        return (1, i)
+    c = pattern[i]
+    if c in "*?":
+        minimum, i = 0, i + 1
+    elif c == "+":
+        minimum, i = 1, i + 1
+    elif c == "{":
+        quantifier = _quantifier_regex.match(pattern, i)
+        if quantifier is None:
+            raise _PatternNotAnalysed()
+        minimum, i = int(quantifier.group("minimum") or 0), quantifier.end()
+    else:
+        return (1, i)
+    # lazy and possessive quantifiers
+    if i < len(pattern) and pattern[i] in "?+":
+        i += 1
+    return (minimum, i)
+
+
+def _in_range_check(low_high_tuples, length=False):
+
+    def range_check(value):
+        if length and isinstance(value, bitarray):
+            value = value.length()
+        elif length:
+            value = len(value)
+        for check_tuple in low_high_tuples:
+            if len(check_tuple) == 2:
+                if check_tuple[0] is not None and value < check_tuple[0]:
+                    continue
+                if check_tuple[1] is not None and value > check_tuple[1]:
+                    continue
+                return True
+            elif len(check_tuple) == 1:
+                if value == float(check_tuple[0]):
+                    return True
+            else:
+                raise AttributeError("Invalid check tuple length specified")
+        return False
+
+    return range_check
+
+
+# Compiled YANG pattern statements, keyed on the pattern as it appears in the
+# module. Models such as the IANA and OpenConfig types re-use the same
+# patterns (addresses, prefixes etc.) across many types, so each one is only
+# translated and compiled once. The cache is bounded, evicting the least
+# recently used pattern - types hold their own reference to the compiled
+# pattern, so eviction only affects types that are built subsequently.
+_pattern_cache = collections.OrderedDict()
+_pattern_cache_maxsize = 4096
+_pattern_cache_stats = {"hits": 0, "misses": 0}
+
+PatternCacheInfo = collections.namedtuple("PatternCacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+def compile_pattern(pattern):
+    """
+    Return a compiled regular expression for the YANG pattern statement
+    argument pattern, re-using a previously compiled expression if one is
+    held in the pattern cache.
+  """
+    try:
+        compiled = _pattern_cache.pop(pattern)
+        _pattern_cache_stats["hits"] += 1
+    except KeyError:
+        _pattern_cache_stats["misses"] += 1
+        compiled = regex.compile(convert_regexp(pattern))
+        while len(_pattern_cache) >= _pattern_cache_maxsize:
+            _pattern_cache.popitem(last=False)
+    _pattern_cache[pattern] = compiled
+    return compiled
+
+
+def pattern_cache_info():
+    """
+    Report the number of hits and misses of the compiled pattern cache, along
+    with its maximum and current size.
+  """
+    return PatternCacheInfo(
+        _pattern_cache_stats["hits"], _pattern_cache_stats["misses"], _pattern_cache_maxsize, len(_pattern_cache)
+    )
+
+
+def clear_pattern_cache():
+    _pattern_cache.clear()
+    _pattern_cache_stats["hits"] = 0
+    _pattern_cache_stats["misses"] = 0
+
+
+def _match_pattern_check(regexp):
+    fullmatch = compile_pattern(regexp).fullmatch
+
+    def mp_check(value):
+        if not isinstance(value, six.string_types + (six.text_type,)):
+            return False
+        if fullmatch(value):
+            return True
+        return False
+
+    return mp_check
+
+
+def _in_dictionary_check(dictionary):
+    return lambda i: six.text_type(i) in dictionary
+
+
+def _build_enumeration_dict(rarg):
+    """
+    Normalise the argument of a dict_key restriction, removing the keys that
+    are prefixed with "@" and numbering the entries that do not specify a
+    value. Returns the normalised dictionary, along with maps from each name
+    to its value and from each value to its name.
+  """
+    new_rarg = collections.OrderedDict()
+    used_values = set()
+    for k, v in rarg.items():
+        if k.startswith("@"):
+            continue
+        # only the entries themselves are modified, the identity tables that
+        # they hold are shared with rarg.
+        new_rarg[k] = dict(v)
+        if "value" in v:
+            used_values.add(int(v["value"]))
+    # populate enum values
+    c = 0
+    for entry in new_rarg.values():
+        while c in used_values:
+            c += 1
+        if "value" not in entry:
+            entry["value"] = c
+        c += 1
+    values = dict((k, entry["value"]) for k, entry in new_rarg.items())
+    names = {}
+    for k, value in values.items():
+        names.setdefault(value, k)
+    return dict(new_rarg), values, names
+
+
+# Base types whose values cannot be modified once an instance is created -
+# such that the default value of an unset leaf of one of these types can be
+# shared between its instances. Other types (e.g., bitarray) are not.
+_immutable_types = six.string_types + (six.text_type, bytes, float, Decimal) + six.integer_types
 
 
 def RestrictedClassType(*args, **kwargs):
@@ -179,26 +527,104 @@ def RestrictedClassType(*args, **kwargs):
     restriction_dict = kwargs.pop("restriction_dict", None)
     int_size = kwargs.pop("int_size", None)
 
+    cache_key = None
+    names_key = None
+    if not args and not kwargs:
+        cached_type = None
+        if restriction_type == "dict_key" and restriction_dict is None and isinstance(restriction_arg, dict):
+            # Identity tables can hold hundreds of entries, such that building
+            # their repr() costs far more than the set that creates the type.
+            # They are first looked up by the names that they hold, and the
+            # type that is found is used if its table is equal to this one.
+            names_key = ("RestrictedClassType", base_type, restriction_type, tuple(restriction_arg), int_size)
+            cached_type = _type_cache.get(names_key)
+            if cached_type is not None:
+                cached_arg = cached_type._restriction_dict.get(restriction_type)
+                # generated bindings share a single table between every type
+                # that uses it, such that it is usually the same object.
+                if cached_arg is not restriction_arg and cached_arg != restriction_arg:
+                    cached_type = None
+        if cached_type is None:
+            cache_key = (
+                "RestrictedClassType",
+                base_type,
+                restriction_type,
+                repr(restriction_arg),
+                repr(restriction_dict),
+                int_size,
+            )
+            cached_type = _type_cache.get(cache_key)
+        if cached_type is not None:
+            if names_key is not None:
+                _type_cache[names_key] = cached_type
+            return cached_type
+
     # this gives deserialisers some hints as to how to encode/decode this value
     # it must be a list since a restricted class can encapsulate a restricted
     # class
-    current_restricted_class_type = regex.sub("<(type|class) '(?P<class>.*)'>", "\g<class>", six.text_type(base_type))
+    current_restricted_class_type = regex.sub("<(type|class) '(?P<class>.*)'>", r"\g<class>", six.text_type(base_type))
     if hasattr(base_type, "_restricted_class_base"):
         restricted_class_hint = getattr(base_type, "_restricted_class_base")
         restricted_class_hint.append(current_restricted_class_type)
     else:
         restricted_class_hint = [current_restricted_class_type]
 
+    if restriction_dict is None:
+        if restriction_type is not None and restriction_arg is not None:
+            restriction_dict = {restriction_type: restriction_arg}
+        else:
+            raise ValueError("must specify either a restriction dictionary or" + " a type and argument")
+
+    # The validation functions are built once, when the type is created,
+    # such that creating an instance of the type only needs to run them.
+    restriction_tests = []
+    enumeration_dict = enumeration_values = enumeration_names = None
+    for rtype, rarg in restriction_dict.items():
+        if rtype == "pattern":
+            restriction_tests.append(_match_pattern_check(rarg))
+        elif rtype == "range":
+            ranges = [_build_length_range_tuples(range_spec, base_type) for range_spec in rarg]
+            restriction_tests.append(_in_range_check(ranges))
+        elif rtype == "length":
+            # When the type is a binary then the length is specified in
+            # octets rather than bits, so we must specify the length to
+            # be multiplied by 8.
+            multiplier = 1
+            if base_type == bitarray:
+                multiplier = 8
+            lengths = [
+                _build_length_range_tuples(range_spec, base_type, length=True, multiplier=multiplier)
+                for range_spec in rarg
+            ]
+            restriction_tests.append(_in_range_check(lengths, length=True))
+        elif rtype == "dict_key":
+            enumeration_dict, enumeration_values, enumeration_names = _build_enumeration_dict(rarg)
+            restriction_tests.append(_in_dictionary_check(enumeration_dict))
+        else:
+            raise TypeError("unsupported restriction type")
+    cast_to_base = "range" in restriction_dict
+    # instances of the type itself have already been validated, and where the
+    # base type is immutable, they do not need to be validated again when
+    # they are used as the value of a new instance (e.g., by YANGDynClass).
+    immutable_base = issubclass(base_type, _immutable_types)
+
     class RestrictedClass(base_type):
         """
       A class that restricts the base_type class with a new function that the
-      input value is validated against before being applied. The function is
-      a static method which is assigned to _restricted_test.
+      input value is validated against before being applied. The validation
+      functions are stored in _restriction_tests.
     """
         _pybind_generated_by = "RestrictedClassType"
 
         _restricted_class_base = restricted_class_hint
         _restricted_int_size = int_size
+        _restriction_dict = restriction_dict
+        _restriction_tests = restriction_tests
+        if enumeration_dict is not None:
+            _enumeration_dict = enumeration_dict
+            # the value of each name, and the name of each value.
+            _enumeration_values = enumeration_values
+            _enumeration_names = enumeration_names
 
         def __init__(self, *args, **kwargs):
             """
@@ -207,7 +633,8 @@ def RestrictedClassType(*args, **kwargs):
         class, which can be manipulated as per a usual Python object.
       """
             try:
-                self.__check(args[0])
+                if not (immutable_base and type(args[0]) is RestrictedClass):
+                    self.__check(args[0])
             except IndexError:
                 pass
             try:
@@ -216,162 +643,22 @@ def RestrictedClassType(*args, **kwargs):
                 super(RestrictedClass, self).__init__()
 
         def __new__(self, *args, **kwargs):
-            self._restriction_dict = restriction_dict
-            self._restriction_tests = []
-
             """
-        Create a new class instance, and dynamically define the
-        _restriction_test method so that it can be called by other functions.
+        Create a new class instance, having checked the supplied value
+        against the restriction tests of the type.
       """
-
-            range_regex = regex.compile("(?P<low>\-?[0-9\.]+|min)([ ]+)?\.\.([ ]+)?" + "(?P<high>(\-?[0-9\.]+|max))")
-            range_single_value_regex = regex.compile("(?P<value>\-?[0-9\.]+)")
-
-            def convert_regexp(pattern):
-
-                # Some patterns include a $ character in them in some IANA modules, this
-                # is not escaped. Do some logic to escape them, whilst leaving one at the
-                # end of the string if it's there.
-                trimmed = False
-                if pattern[-1] == "$":
-                    tmp_pattern = pattern[:-1]
-                    trimmed = True
-                else:
-                    tmp_pattern = pattern
-                tmp_pattern = tmp_pattern.replace("$", "\$")
-                pattern = tmp_pattern
-                if trimmed:
-                    pattern += "$"
-
-                if not pattern[0] == "^":
-                    pattern = "^%s" % pattern
-                if not pattern[len(pattern) - 1] == "$":
-                    pattern = "%s$" % pattern
-
-                return pattern
-
-            def build_length_range_tuples(range, length=False, multiplier=1):
-                if range_regex.match(range_spec):
-                    low, high = range_regex.sub("\g<low>,\g<high>", range_spec).split(",")
-                    if not length:
-                        high = base_type(high) if not high == "max" else None
-                        low = base_type(low) if not low == "min" else None
-                    else:
-                        high = int(high) * multiplier if not high == "max" else None
-                        low = int(low) * multiplier if not low == "min" else None
-                    return (low, high)
-                elif range_single_value_regex.match(range_spec):
-                    eqval = range_single_value_regex.sub("\g<value>", range_spec)
-                    if not length:
-                        eqval = base_type(eqval) if eqval not in ["max", "min"] else None
-                    else:
-                        eqval = int(eqval) * multiplier
-                    return (eqval,)
-                else:
-                    raise ValueError("Invalid range or length argument specified")
-
-            def in_range_check(low_high_tuples, length=False):
-
-                def range_check(value):
-                    if length and isinstance(value, bitarray):
-                        value = value.length()
-                    elif length:
-                        value = len(value)
-                    range_results = []
-                    for check_tuple in low_high_tuples:
-                        chk = True
-                        if len(check_tuple) == 2:
-                            if check_tuple[0] is not None and value < check_tuple[0]:
-                                chk = False
-                            if check_tuple[1] is not None and value > check_tuple[1]:
-                                chk = False
-                        elif len(check_tuple) == 1:
-                            if value != float(check_tuple[0]):
-                                chk = False
-                        else:
-                            raise AttributeError("Invalid check tuple length specified")
-                        range_results.append(chk)
-                    return True in range_results
-
-                return range_check
-
-            def match_pattern_check(regexp):
-
-                def mp_check(value):
-                    if not isinstance(value, six.string_types + (six.text_type,)):
-                        return False
-                    if regex.match(convert_regexp(regexp), value):
-                        return True
-                    return False
-
-                return mp_check
-
-            def in_dictionary_check(dictionary):
-                return lambda i: six.text_type(i) in dictionary
-
-            val = False
-            try:
-                val = args[0]
-            except IndexError:
-                pass
-            if self._restriction_dict is None:
-                if restriction_type is not None and restriction_arg is not None:
-                    self._restriction_dict = {restriction_type: restriction_arg}
-                else:
-                    raise ValueError("must specify either a restriction dictionary or" + " a type and argument")
-
-            for rtype, rarg in self._restriction_dict.items():
-                if rtype == "pattern":
-                    self._restriction_tests.append(match_pattern_check(rarg))
-                elif rtype == "range":
-                    ranges = []
-                    for range_spec in rarg:
-                        ranges.append(build_length_range_tuples(range_spec))
-                    self._restriction_tests.append(in_range_check(ranges))
-                    if val:
-                        try:
-                            val = base_type(val)
-                        except Exception:
-                            raise TypeError("must specify a numeric type for a range " + "argument")
-                elif rtype == "length":
-                    # When the type is a binary then the length is specified in
-                    # octets rather than bits, so we must specify the length to
-                    # be multiplied by 8.
-                    multiplier = 1
-                    if base_type == bitarray:
-                        multiplier = 8
-                    lengths = []
-                    for range_spec in rarg:
-                        lengths.append(build_length_range_tuples(range_spec, length=True, multiplier=multiplier))
-                    self._restriction_tests.append(in_range_check(lengths, length=True))
-                elif rtype == "dict_key":
-                    new_rarg = copy.deepcopy(rarg)
-                    for k in rarg:
-                        if k.startswith("@"):
-                            new_rarg.pop(k, None)
-                    # populate enum values
-                    used_values = []
-                    for k in new_rarg:
-                        if "value" in new_rarg[k]:
-                            used_values.append(int(new_rarg[k]["value"]))
-                    c = 0
-                    for k in new_rarg:
-                        while c in used_values:
-                            c += 1
-                        if "value" not in new_rarg[k]:
-                            new_rarg[k]["value"] = c
-                        c += 1
-                    self._restriction_tests.append(in_dictionary_check(new_rarg))
-                    self._enumeration_dict = new_rarg
-                else:
-                    raise TypeError("unsupported restriction type")
-
-            if val is not False:
-                for test in self._restriction_tests:
-                    passed = False
-                    # python 3 support for string base type
-                    if isinstance(val, objectify.StringElement):
-                        val = val.pyval
+            val = args[0] if len(args) else False
+            if val is not False and not (immutable_base and type(val) is RestrictedClass):
+                if cast_to_base and val:
+                    try:
+                        val = base_type(val)
+                    except Exception:
+                        raise TypeError("must specify a numeric type for a range " + "argument")
+                # python 3 support for string base type
+                if isinstance(val, objectify.StringElement):
+                    val = val.pyval
+                passed = False
+                for test in restriction_tests:
                     if test(val) is not False:
                         passed = True
                         break
@@ -386,11 +673,11 @@ def RestrictedClassType(*args, **kwargs):
 
         def __check(self, v):
             """
-        Run the _restriction_test static method against the argument v,
-        returning an error if the value does not validate.
+        Run the restriction tests against the argument v, returning an error
+        if the value does not validate.
       """
             v = base_type(v)
-            for chkfn in self._restriction_tests:
+            for chkfn in restriction_tests:
                 if not chkfn(v):
                     raise ValueError("did not match restricted type")
             return True
@@ -400,13 +687,21 @@ def RestrictedClassType(*args, **kwargs):
         For types where there is a dict_key restriction (such as YANG
         enumeration), return the value of the dictionary key.
       """
-            if "dict_key" in self._restriction_dict:
-                value = kwargs.pop("mapped", False)
-                if value:
-                    return self._enumeration_dict[self.__str__()]["value"]
+            if enumeration_values is not None and kwargs.pop("mapped", False):
+                return enumeration_values[self]
             return self
 
-    return type(RestrictedClass(*args, **kwargs))
+    restricted_type = type(RestrictedClass(*args, **kwargs))
+    if cache_key is not None:
+        _type_cache[cache_key] = restricted_type
+    if names_key is not None:
+        _type_cache[names_key] = restricted_type
+    return restricted_type
+
+
+# The maximum number of types of value for which the conversion that is
+# made when the value is added to a TypedList is cached.
+_COERCION_CACHE_SIZE = 64
 
 
 def TypedListType(*args, **kwargs):
@@ -419,9 +714,55 @@ def TypedListType(*args, **kwargs):
     if not isinstance(allowed_type, list):
         allowed_type = [allowed_type]
 
+    cache_key = None
+    if not args and not kwargs:
+        cache_key = ("TypedListType", tuple(allowed_type))
+        cached_type = _type_cache.get(cache_key)
+        if cached_type is not None:
+            return cached_type
+
+    # The allowed types that a value could be converted to depend only on
+    # its type, so are determined once for each type of value that is added
+    # to the list, rather than for every value. Each entry is the list of
+    # types to try to convert the value to, in order, where None indicates
+    # that the value is already of an allowed type.
+    coercions = {}
+
+    def coercion_for(v):
+        coercion = []
+        for i in allowed_type:
+            if isinstance(v, i):
+                coercion.append(None)
+                break
+            if hasattr(i, "_pybind_generated_by"):
+                if i._pybind_generated_by in (
+                    "RestrictedClassType",
+                    "ReferencePathType",
+                    "RestrictedPrecisionDecimal",
+                ):
+                    coercion.append(i)
+            elif i == six.text_type and isinstance(v, six.string_types + (six.text_type,)):
+                coercion.append(six.text_type)
+            elif i not in six.string_types + (six.text_type,):
+                # for anything other than string we try
+                # and cast. Using things for string or
+                # unicode gives us strange results because we get
+                # class name represetnations
+                coercion.append(i)
+        if len(coercions) >= _COERCION_CACHE_SIZE:
+            coercions.clear()
+        coercions[type(v)] = coercion
+        return coercion
+
     class TypedList(collections.MutableSequence):
         _pybind_generated_by = "TypedListType"
         _list = list()
+        # For lists whose values must be unique, the number of times that
+        # each value is stored is indexed, such that uniqueness can be
+        # checked without scanning the list. Values that cannot be hashed
+        # are counted, and the list is scanned when any are stored.
+        _index = None
+        _unindexed = 0
 
         def __init__(self, *args, **kwargs):
             self._unique = kwargs.pop("unique", False)
@@ -429,64 +770,84 @@ def TypedListType(*args, **kwargs):
             self._list = list()
             if len(args):
                 if isinstance(args[0], list):
-                    tmp = []
                     for i in args[0]:
-                        if not self._unique or i not in tmp:
-                            tmp.append(self.check(i))
-                    self._list.extend(tmp)
+                        if not self._unique or not self._contains(i):
+                            self._store(len(self._list), self.check(i))
                 else:
                     tmp = self.check(args[0])
-                    self._list.append(tmp)
+                    self._store(0, tmp)
+
+        def _contains(self, v):
+            if self._index is None:
+                return v in self._list
+            try:
+                if v in self._index:
+                    return True
+            except TypeError:
+                return v in self._list
+            if self._unindexed:
+                return v in self._list
+            return False
+
+        def _store(self, i, v):
+            self._list.insert(i, v)
+            if not self._unique:
+                return
+            if self._index is None:
+                self._index = {}
+            try:
+                self._index[v] = self._index.get(v, 0) + 1
+            except TypeError:
+                self._unindexed += 1
+
+        def _retain(self, keep):
+            # removes the values for which keep() is false in a single pass,
+            # rather than deleting each of them in turn, and returns whether
+            # any were removed.
+            kept = [v for v in self._list if keep(v)]
+            if len(kept) == len(self._list):
+                return False
+            self._list = kept
+            if self._index is not None:
+                self._index = {}
+                self._unindexed = 0
+                for v in kept:
+                    try:
+                        self._index[v] = self._index.get(v, 0) + 1
+                    except TypeError:
+                        self._unindexed += 1
+            return True
+
+        def _unindex(self, v):
+            try:
+                count = self._index.pop(v)
+            except TypeError:
+                self._unindexed -= 1
+                return
+            if count > 1:
+                self._index[v] = count - 1
 
         def check(self, v):
             # Short circuit uniqueness check
-            if self._unique and v in self._list:
+            if self._unique and self._contains(v):
                 raise ValueError("Values in this list must be unique.")
 
-            passed = False
-            count = 0
-            for i in self._allowed_type:
-                if isinstance(v, i):
-                    tmp = v
-                    passed = True
-                    break
+            try:
+                coercion = coercions[type(v)]
+            except KeyError:
+                coercion = coercion_for(v)
+
+            for convert in coercion:
+                if convert is None:
+                    return v
                 try:
-                    if hasattr(i, "_pybind_generated_by"):
-                        attr = getattr(i, "_pybind_generated_by")
-                        if attr == "RestrictedClassType":
-                            tmp = i(v)
-                            passed = True
-                            break
-                        elif attr == "ReferencePathType":
-                            tmp = i(v)
-                            passed = True
-                            break
-                        elif attr == "RestrictedPrecisionDecimal":
-                            tmp = i(v)
-                            passed = True
-                            break
-                    elif i == six.text_type and isinstance(v, six.string_types + (six.text_type,)):
-                        tmp = six.text_type(v)
-                        passed = True
-                        break
-                    elif i not in six.string_types + (six.text_type,):
-                        # for anything other than string we try
-                        # and cast. Using things for string or
-                        # unicode gives us strange results because we get
-                        # class name represetnations
-                        tmp = i(v)
-                        passed = True
-                        break
+                    return convert(v)
                 except Exception:
                     # we catch all exceptions because we duck-type as
                     # much as possible and some types - e.g., decimal do
                     # not use builtins.
                     pass
-                count += 1
-            if not passed:
-                raise ValueError("Cannot add %s to TypedList (accepts only %s)" % (v, self._allowed_type))
-            else:
-                return tmp
+            raise ValueError("Cannot add %s to TypedList (accepts only %s)" % (v, self._allowed_type))
 
         def __len__(self):
             return len(self._list)
@@ -495,19 +856,26 @@ def TypedListType(*args, **kwargs):
             return self._list[i]
 
         def __delitem__(self, i):
+            if self._index is not None:
+                removed = self._list[i] if isinstance(i, slice) else [self._list[i]]
+                for v in removed:
+                    self._unindex(v)
             del self._list[i]
 
         def __setitem__(self, i, v):
             self.insert(i, v)
 
+        def __contains__(self, v):
+            return self._contains(v)
+
         def insert(self, i, v):
             val = self.check(v)
-            self._list.insert(i, val)
+            self._store(i, val)
 
         def append(self, v):
-            if not self._unique or v not in self._list:
+            if not self._unique or not self._contains(v):
                 val = self.check(v)
-                self._list.append(val)
+                self._store(len(self._list), val)
 
         def __str__(self):
             return str(self._list)
@@ -523,7 +891,19 @@ def TypedListType(*args, **kwargs):
         def get(self, filter=False):
             return self._list
 
-    return type(TypedList(*args, **kwargs))
+    list_type = type(TypedList(*args, **kwargs))
+    if cache_key is not None:
+        _type_cache[cache_key] = list_type
+    return list_type
+
+
+def uuid_key():
+    """
+    Return a key generated from a uuid1. Supplying this function as the
+    key_generator of a YANGListType, or the id_generator of a YANGPathHelper,
+    retains the keys and identifiers used by earlier versions of PyangBind.
+  """
+    return six.text_type(uuid.uuid1())
 
 
 def YANGListType(*args, **kwargs):
@@ -539,8 +919,10 @@ def YANGListType(*args, **kwargs):
     .delete(key) - removes it.
 
     Where a list exists that does not have a key - which can be the
-    case for 'config false' lists - a uuid is generated and used
-    as the key for the list.
+    case for 'config false' lists - a key is generated for each entry
+    by the key_generator argument, a callable that takes no arguments.
+    By default, each list numbers its entries from 1, such that the keys
+    are short and generated cheaply.
   """
     try:
         keyname = args[0]
@@ -548,15 +930,69 @@ def YANGListType(*args, **kwargs):
     except Exception:
         raise TypeError("A YANGList must be specified with a key value and a " + "contained class")
     is_container = kwargs.pop("is_container", False)
-    parent = kwargs.pop("parent", False)
+    kwargs.pop("parent", None)
     yang_name = kwargs.pop("yang_name", False)
     yang_keys = kwargs.pop("yang_keys", False)
     user_ordered = kwargs.pop("user_ordered", False)
-    path_helper = kwargs.pop("path_helper", None)
+    kwargs.pop("path_helper", None)
     extensions = kwargs.pop("extensions", None)
+    key_generator = kwargs.pop("key_generator", None)
+
+    if not type(listclass) == type(int):
+        raise ValueError("contained class of a YANGList must be a class")
+
+    # The type is interned in the same way as restricted types, the parent
+    # and path helper of the list are taken from the YANGDynClass instance
+    # that wraps it, rather than the arguments.
+    cache_key = (
+        "YANGListType",
+        keyname,
+        listclass,
+        is_container,
+        yang_name,
+        yang_keys,
+        user_ordered,
+        _hashable(extensions),
+        key_generator,
+    )
+    cached_type = _type_cache.get(cache_key)
+    if cached_type is not None:
+        return cached_type
+
+    # The names of the keys, the setters for them, and the template of the
+    # predicate that is added to the path of each entry are the same for
+    # every entry in the list, so are calculated once.
+    keynames = keyname.split(" ") if keyname else []
+    key_setters = ["_set_%s" % safe_name(kn) for kn in keynames]
+    key_templates = {}
+
+    def yang_key_names():
+        if "names" not in key_templates:
+            if yang_keys and not yang_keys == "False":
+                names = yang_keys.split(" ")
+            else:
+                # the YANG names of the keys were not supplied, so retrieve
+                # them from an instance of the contained class - once.
+                probe = listclass()
+                names = [getattr(probe, kn).yang_name() for kn in keynames]
+            key_templates["names"] = names
+        return key_templates["names"]
+
+    def register_template():
+        if "register" not in key_templates:
+            key_templates["register"] = "[%s]" % " ".join("%s='%%s'" % n for n in yang_key_names())
+        return key_templates["register"]
+
+    def delete_template():
+        if "delete" not in key_templates:
+            if len(keynames) > 1:
+                key_templates["delete"] = "[%s]" % " ".join("%s=%%s" % n for n in yang_key_names())
+            else:
+                key_templates["delete"] = "[@%s=%%s]" % yang_key_names()[0]
+        return key_templates["delete"]
 
     class YANGList(object):
-        __slots__ = ("_members", "_keyval", "_contained_class", "_path_helper", "_yang_keys", "_ordered")
+        __slots__ = ("_members", "_keyval", "_contained_class", "_path_helper", "_yang_keys", "_ordered", "_last_key")
         _pybind_generated_by = "YANGListType"
 
         def __init__(self, *args, **kwargs):
@@ -566,11 +1002,10 @@ def YANGListType(*args, **kwargs):
             self._members._user_ordered = True if user_ordered else False
 
             self._keyval = keyname
-            if not type(listclass) == type(int):
-                raise ValueError("contained class of a YANGList must be a class")
             self._contained_class = listclass
-            self._path_helper = path_helper
+            self._path_helper = kwargs.get("path_helper", None)
             self._yang_keys = yang_keys
+            self._last_key = 0
 
         def __str__(self):
             return str(self._members)
@@ -579,26 +1014,7 @@ def YANGListType(*args, **kwargs):
             return repr(self._members)
 
         def __check__(self, v):
-            if self._contained_class is None:
-                return False
-            try:
-                tmp = YANGDynClass(
-                    base=self._contained_class,
-                    parent=parent,
-                    yang_name=yang_name,
-                    is_container=is_container,
-                    path_helper=False,
-                )
-                valid = False
-                if not tmp.__slots__ == v.__slots__:
-                    valid = True
-                elif self._contained_class.__slots__ == v.__slots__:
-                    valid = True
-                if valid is False:
-                    return valid
-            except Exception:
-                return False
-            return True
+            return isinstance(v, self._contained_class)
 
         def iteritems(self):
             return six.iteritems(self._members)
@@ -606,10 +1022,22 @@ def YANGListType(*args, **kwargs):
         def itervalues(self):
             return six.itervalues(self._members)
 
+        def _new_key(self, pending=()):
+            # returns a key for an entry of a keyless list that is not used by
+            # an existing entry, or one that is yet to be added.
+            while True:
+                if key_generator is not None:
+                    k = key_generator()
+                else:
+                    self._last_key += 1
+                    k = six.text_type(self._last_key)
+                if k not in self._members and k not in pending:
+                    return k
+
         def _key_to_native_key_type(self, k):
             if self._keyval is False:
                 raise AttributeError("List does not have a key")
-            elif " " in self._keyval:
+            elif len(keynames) > 1:
                 raise AttributeError("Multiple key, string type should be used")
             else:
                 member = self._members[k]
@@ -637,11 +1065,11 @@ def YANGListType(*args, **kwargs):
 
             if k is None and self._keyval and not named_set:
                 k = args[0]
-            elif k is None:
+            elif k is None and not self._keyval:
                 # this is a list that does not have a key specified, and hence
-                # we generate a uuid that is used as the key, the method then
-                # returns the uuid for the upstream process to use
-                k = six.text_type(uuid.uuid1())
+                # we generate a key, the method then returns the key for the
+                # upstream process to use
+                k = self._new_key()
 
             update = False
             if v is not None:
@@ -655,54 +1083,29 @@ def YANGListType(*args, **kwargs):
 
             if self._keyval:
                 try:
-                    tmp = YANGDynClass(
-                        base=self._contained_class,
-                        parent=parent,
-                        yang_name=yang_name,
-                        is_container="container",
-                        path_helper=False,
-                    )
-                    keydict = None
-
-                    if " " in self._keyval and not named_set:
-                        keys = self._keyval.split(" ")
-                        keyparts = k.split(" ")
-                        keydict = {}
-                        for kp, kv in zip(keys, keyparts):
-                            keydict[kp] = kv
-
-                        if not len(keyparts) == len(keys):
-                            raise KeyError(
-                                "YANGList key must contain all key elements (%s)" % (self._keyval.split(" "))
-                            )
-                    elif named_set:
+                    if named_set:
                         k = kwargs.pop("_python_key", None)
-                        keydict = copy.copy(kwargs)
+                        keyvalues = [kwargs[kn] for kn in keynames]
+                    elif len(keynames) > 1:
+                        keyvalues = k.split(" ")
+                        if not len(keyvalues) == len(keynames):
+                            raise KeyError("YANGList key must contain all key elements (%s)" % (keynames))
                     else:
                         if k == "":
                             raise KeyError("Cannot set a null key for a list entry!")
-                        keydict = {self._keyval: k}
-                        kv_obj = getattr(tmp, self._keyval)
-                        path_keystring = "[%s='%s']" % (kv_obj.yang_name(), k)
-
-                    if keydict is not None:
-                        keys = self._keyval.split(" ")
-                        path_keystring = "["
-                        for kv in keys:
-                            kv_obj = getattr(tmp, kv)
-                            path_keystring += "%s='%s' " % (kv_obj.yang_name(), keydict[kv])
-                        path_keystring = path_keystring[:-1]
-                        path_keystring += "]"
+                        keyvalues = [k]
 
+                    register_path = self._parent._path() + [yang_name + register_template() % tuple(keyvalues)]
                     if not update:
                         tmp = YANGDynClass(
                             base=self._contained_class,
-                            parent=parent,
+                            parent=self._parent,
                             yang_name=yang_name,
                             is_container="container",
-                            path_helper=path_helper,
-                            register_path=(self._parent._path() + [self._yang_name + path_keystring]),
+                            path_helper=self._path_helper,
+                            register_path=register_path,
                             extmethods=self._parent._extmethods,
+                            choice=self._choice,
                             extensions=extensions,
                         )
                     else:
@@ -711,20 +1114,24 @@ def YANGListType(*args, **kwargs):
                         tmp = YANGDynClass(
                             v,
                             base=self._contained_class,
-                            parent=parent,
+                            parent=self._parent,
                             yang_name=yang_name,
                             is_container="container",
-                            path_helper=path_helper,
-                            register_path=(self._parent._path() + [self._yang_name + path_keystring]),
+                            path_helper=self._path_helper,
+                            register_path=register_path,
                             extmethods=self._parent._extmethods,
+                            choice=self._choice,
                             load=True,
                             extensions=extensions,
                         )
 
-                    if keydict is not None:
-                        for kn in keydict:
-                            key = getattr(tmp, "_set_%s" % safe_name(kn))
-                            key(keydict[kn], load=True)
+                    for setter, keyvalue in zip(key_setters, keyvalues):
+                        getattr(tmp, setter)(keyvalue, load=True)
+
+                    if update:
+                        # the entry is copied from one that may have had another
+                        # key, or been beneath another parent.
+                        tmp._invalidate_path(register_path)
 
                     if hasattr(k, "_referenced_object") and k._referenced_object is not None:
                         k = k._referenced_object
@@ -736,11 +1143,12 @@ def YANGListType(*args, **kwargs):
             else:
                 self._members[k] = YANGDynClass(
                     base=self._contained_class,
-                    parent=parent,
+                    parent=self._parent,
                     yang_name=yang_name,
                     is_container=is_container,
-                    path_helper=path_helper,
+                    path_helper=self._path_helper,
                     extmethods=self._parent._extmethods,
+                    choice=self._choice,
                     extensions=extensions,
                 )
                 return k
@@ -767,7 +1175,7 @@ def YANGListType(*args, **kwargs):
             elif len(kwargs):
                 keyargs = {}
                 k = ""
-                for kn in self._keyval.split(" "):
+                for kn in keynames:
                     try:
                         keyargs[kn] = kwargs[kn]
                     except KeyError as m:
@@ -781,10 +1189,9 @@ def YANGListType(*args, **kwargs):
             return (k, keyargs)
 
         def _extract_key(self, obj):
-            kp = self._keyval.split(" ")
-            if len(kp) > 1:
+            if len(keynames) > 1:
                 ks = ""
-                for k in kp:
+                for k in keynames:
                     kv = getattr(obj, "_get_%s" % safe_name(k), None)
                     if kv is None:
                         raise KeyError("Invalid key attribute specified for object")
@@ -828,40 +1235,167 @@ def YANGListType(*args, **kwargs):
                 k = self.__set()
                 return k
 
+        def add_many(self, records):
+            """
+          Add an entry to the list for each of the records supplied - which
+          may be a generator. Each record is a dict, or a sequence of
+          (name, value) tuples, keyed by the names of the leaves of the entry,
+          and must include the keys of the list.
+
+          The entries are registered with the path helper in a single batch,
+          and the change is propagated to the parent of the list once, after
+          all entries have been created. If any record is invalid, none of the
+          entries are added. Returns a list of the keys of the new entries.
+        """
+            batch = getattr(self._path_helper, "batch", None) if self._path_helper else None
+            entries = collections.OrderedDict()
+            try:
+                if batch is None:
+                    self._entries_from_records(records, entries)
+                else:
+                    # registrations are made even where a record is invalid,
+                    # since those of earlier entries may already have been
+                    # made by a lookup within the batch - such that all of
+                    # them can be unregistered.
+                    with batch(discard=False):
+                        self._entries_from_records(records, entries)
+            except Exception:
+                if self._path_helper and self._keyval:
+                    unregister = getattr(self._path_helper, "unregister_subtree", self._path_helper.unregister)
+                    for entry in six.itervalues(entries):
+                        if len(self._path_helper.get(entry._supplied_register_path)):
+                            unregister(entry._supplied_register_path)
+                raise
+
+            for entry in six.itervalues(entries):
+                entry._parent = self._parent
+                entry._invalidate_path()
+            self._members.update(entries)
+            if len(entries) and self._parent is not None and hasattr(self._parent, "_set"):
+                self._parent._set(choice=self._choice)
+            return list(entries)
+
+        def from_records(self, records):
+            """
+          Replace the entries of the list with those created from the
+          records supplied, as per add_many().
+        """
+            for k in list(self._members):
+                if self._keyval:
+                    self.delete(k)
+                else:
+                    del self._members[k]
+            return self.add_many(records)
+
+        def _record_items(self, record, names):
+            # names caches the safe name of each name that has been seen, as
+            # the records of a list generally all have the same names.
+            if hasattr(record, "_asdict"):
+                record = record._asdict()
+            if hasattr(record, "items"):
+                record = record.items()
+            items = collections.OrderedDict()
+            for name, value in record:
+                try:
+                    items[names[name]] = value
+                except KeyError:
+                    names[name] = safe_name(name)
+                    items[names[name]] = value
+            return items
+
+        def _entries_from_records(self, records, entries):
+            # Entries are created without a parent, such that setting each of
+            # their leaves does not mark every node above them as changed, and
+            # are only attached to the parent once all records are valid. Each
+            # entry is added to entries as it is created. All of the entries
+            # are of the same class, which is only looked up for the first.
+            parent_path = self._parent._path()
+            extmethods = self._parent._extmethods
+            names = {}
+            key_names = [safe_name(kn) for kn in keynames] if self._keyval else []
+            entry_class = None
+            for record in records:
+                values = self._record_items(record, names)
+                if self._keyval:
+                    try:
+                        keyvalues = [values.pop(kn) for kn in key_names]
+                    except KeyError as m:
+                        raise KeyError("Records added to a list must have all keys specified - cannot find %s" % m)
+                    # entries are keyed as per add() - by the value of the key
+                    # where the list has a single key.
+                    if len(keynames) > 1:
+                        k = " ".join("%s" % kv for kv in keyvalues)
+                    else:
+                        k = keyvalues[0]
+                    if k in self._members or k in entries:
+                        raise KeyError("%s is already defined as a list entry" % k)
+                    register_path = parent_path + [yang_name + register_template() % tuple(keyvalues)]
+                else:
+                    k = self._new_key(entries)
+                    keyvalues = []
+                    register_path = parent_path + [yang_name]
+
+                if entry_class is None:
+                    entry = YANGDynClass(
+                        base=self._contained_class,
+                        parent=None,
+                        yang_name=yang_name,
+                        is_container="container" if self._keyval else is_container,
+                        path_helper=self._path_helper,
+                        register_path=register_path,
+                        extmethods=extmethods,
+                        choice=self._choice,
+                        extensions=extensions,
+                    )
+                    entry_class = type(entry)
+                else:
+                    entry = entry_class(
+                        _yang_attrs={
+                            "parent": None,
+                            "path_helper": self._path_helper,
+                            "register_path": register_path,
+                            "extmethods": extmethods,
+                            "load": None,
+                        }
+                    )
+                entries[k] = entry
+                try:
+                    for setter, keyvalue in zip(key_setters, keyvalues):
+                        getattr(entry, setter)(keyvalue, load=True)
+                except ValueError as m:
+                    raise KeyError("key value must be valid, %s" % m)
+
+                for name, value in six.iteritems(values):
+                    setter = getattr(entry, "_set_%s" % name, None)
+                    if setter is None:
+                        raise AttributeError("%s does not have an element named %s" % (yang_name, name))
+                    setter(value, load=True)
+
         def delete(self, *args, **kwargs):
             (k, _) = self._generate_key(*args, **kwargs)
 
             if self._path_helper:
-                current_item = self._members[k]
-                if " " in self._keyval:
-                    keyparts = self._keyval.split(" ")
-                    keyargs = k.split(" ")
-                    key_string = "["
-                    for key, val in zip(keyparts, keyargs):
-                        kv_o = getattr(current_item, key)
-                        key_string += "%s=%s " % (kv_o.yang_name(), val)
-                    key_string = key_string.rstrip(" ")
-                    key_string += "]"
+                if k not in self._members:
+                    raise KeyError(k)
+                if len(keynames) > 1:
+                    key_string = delete_template() % tuple(k.split(" "))
                 else:
-                    kv_o = getattr(current_item, self._keyval)
-                    key_string = "[@%s=%s]" % (kv_o.yang_name(), k)
+                    key_string = delete_template() % k
 
-                obj_path = self._parent._path() + [self._yang_name + key_string]
+                obj_path = self._parent._path() + [yang_name + key_string]
 
             try:
                 del self._members[k]
                 if self._path_helper:
-                    self._path_helper.unregister(obj_path)
+                    # the objects beneath the entry are unregistered with it.
+                    unregister = getattr(self._path_helper, "unregister_subtree", self._path_helper.unregister)
+                    unregister(obj_path)
             except KeyError as m:
                 raise KeyError("key %s was not in list (%s)" % (k, m))
 
         def _item(self, *args, **kwargs):
             keystr = ""
-            if " " in self._keyval:
-                keyparts = self._keyval.split(" ")
-            else:
-                keyparts = [self._keyval]
-            for kn in keyparts:
+            for kn in keynames:
                 try:
                     keystr += "%s " % kwargs[kn]
                 except KeyError:
@@ -880,7 +1414,9 @@ def YANGListType(*args, **kwargs):
                     d[i] = self._members[i]
             return d
 
-    return type(YANGList(*args, **kwargs))
+    list_type = type(YANGList(*args, **kwargs))
+    _type_cache[cache_key] = list_type
+    return list_type
 
 
 class YANGBool(int):
@@ -911,6 +1447,140 @@ class YANGBool(int):
         return str(self.__repr__())
 
 
+# The attributes that are stored against every instance created by
+# YANGDynClass. Where the wrapped type allows it, these are used as the
+# __slots__ of the generated class. Everything else that describes the
+# schema node (its name, namespace, default etc.) is stored once on the
+# class.
+_yang_base_slots = (
+    "_mchanged",
+    "_parent",
+    "_supplied_register_path",
+    "_path_helper",
+    "_extmethods",
+    "_pybind_metadata",
+    "_cpresent",
+)
+
+# Containers and lists additionally cache their paths, since these are used
+# to build the path of each of their children.
+_yang_path_slots = ("_pybind_path", "_pybind_schema_path", "_pybind_yang_path")
+
+# They also record whether a change to them has been propagated to their
+# ancestors, and which case of each of their choices is in use, such that
+# setting a value beneath them does not repeat this work.
+_yang_set_slots = ("_pybind_propagated", "_pybind_cases")
+
+# Classes built by YANGDynClass are interned on the static parts of their
+# signature (the base type and the schema node that is being represented),
+# such that all instances of a schema node share one class rather than a new
+# type being created each time a value is set. Entries are dropped once no
+# instance of the class remains.
+_yang_class_cache = weakref.WeakValueDictionary()
+_yang_class_cache_stats = {"hits": 0, "misses": 0}
+
+YANGClassCacheInfo = collections.namedtuple("YANGClassCacheInfo", ["hits", "misses", "currsize"])
+
+
+# The resolvers for unions, keyed by the tuple of their member types, and the
+# number of values whose member is remembered by each resolver.
+_union_resolvers = {}
+_UNION_RESOLVER_CACHE_SIZE = 1024
+_UNION_MEMO_SIZE = 1024
+
+# The types of value for which the member of a union that a value resolves to
+# is remembered - values that are equal always resolve to the same member.
+_union_memo_types = frozenset((six.text_type, str, bool) + six.integer_types)
+_string_types = six.string_types + (six.text_type,)
+_numeric_types = six.integer_types + (float, Decimal)
+_non_integer_regex = regex.compile(r"[^\s\d+\-_lL]" if six.PY2 else r"[^\s\d+\-_]")
+
+
+def _union_discriminator(member):
+    """
+    Return a function that cheaply determines whether a value could be an
+    instance of the union member type, returning False only where creating
+    the instance is certain to fail - or None if there is no such check.
+  """
+    if getattr(member, "_pybind_generated_by", None) != "RestrictedClassType":
+        return None
+    restrictions = member._restriction_dict
+    if list(restrictions) == ["dict_key"]:
+        enumeration_dict = member._enumeration_dict
+
+        def enumeration(value):
+            try:
+                return six.text_type(value) in enumeration_dict
+            except Exception:
+                return True
+
+        return enumeration
+    elif list(restrictions) == ["pattern"]:
+        first_characters = _pattern_first_characters(convert_regexp(restrictions["pattern"]))
+
+        def pattern(value):
+            if isinstance(value, _string_types):
+                return first_characters is None or not value or value[0] in first_characters
+            return not isinstance(value, _numeric_types)
+
+        return pattern
+    elif list(restrictions) == ["range"] and issubclass(member, six.integer_types):
+
+        def integer(value):
+            return not isinstance(value, six.text_type) or _non_integer_regex.search(value) is None
+
+        return integer
+    return None
+
+
+def _union_resolver(members):
+    """
+    Return a function that resolves the member of the union of the types in
+    members that a value is an instance of - the first that the value can be
+    converted to - returning the member, and the instance of it that was
+    created, if any.
+  """
+    discriminators = [(member, _union_discriminator(member)) for member in members]
+    # leafrefs resolve according to the data tree, rather than the value.
+    memoise = not any(getattr(m, "_pybind_generated_by", None) == "ReferencePathType" for m in members)
+    memo = {}
+
+    def resolve(value):
+        key = None
+        if memoise and type(value) in _union_memo_types:
+            key = (type(value), value)
+            member = memo.get(key)
+            if member is not None:
+                return (member, None)
+
+        for member, discriminator in discriminators:
+            if discriminator is not None and not discriminator(value):
+                continue
+            try:
+                instance = member(value)  # does the slipper fit?
+            except Exception:
+                continue  # don't worry, move on, plenty more fish (types) in the sea...
+            if key is not None:
+                if len(memo) >= _UNION_MEMO_SIZE:
+                    memo.clear()
+                memo[key] = member
+            return (member, instance)
+        # we're left alone at midnight -- no types fit the arguments
+        raise TypeError("did not find a valid type using the argument as a" + " hint")
+
+    return resolve
+
+
+def _resolve_union(members, value):
+    members = tuple(members)
+    resolver = _union_resolvers.get(members)
+    if resolver is None:
+        if len(_union_resolvers) >= _UNION_RESOLVER_CACHE_SIZE:
+            _union_resolvers.clear()
+        resolver = _union_resolvers[members] = _union_resolver(members)
+    return resolver(value)
+
+
 def YANGDynClass(*args, **kwargs):
     """
     Wrap an type - specified in the base_type arugment - with
@@ -958,6 +1628,7 @@ def YANGDynClass(*args, **kwargs):
     load = kwargs.pop("load", None)
     is_config = kwargs.pop("is_config", True)
     has_presence = kwargs.pop("presence", None)
+    shared_default = kwargs.pop("shared_default", False)
 
     if not base_type:
         raise TypeError("must have a base type")
@@ -969,70 +1640,274 @@ def YANGDynClass(*args, **kwargs):
             # so use the first type (default)
             base_type = base_type[0]
         else:
-            type_test = False
-            for candidate_type in base_type:
-                try:
-                    type_test = candidate_type(args[0])  # does the slipper fit?
-                    break
-                except Exception:
-                    pass  # don't worry, move on, plenty more fish (types) in the sea...
-            if type_test is False:
-                # we're left alone at midnight -- no types fit the arguments
-                raise TypeError("did not find a valid type using the argument as a" + " hint")
-            # otherwise, hop, skip and jump with the last candidate
-            base_type = candidate_type
-
-    clsslots = [
-        "_default",
-        "_mchanged",
-        "_yang_name",
-        "_choice",
-        "_parent",
-        "_supplied_register_path",
-        "_path_helper",
-        "_base_type",
-        "_is_leaf",
-        "_is_container",
-        "_extensionsd",
-        "_extmethods",
-        "_is_keyval",
-        "_register_paths",
-        "_namespace",
-        "_yang_type",
-        "_defining_module",
-        "_metadata",
-        "_is_config",
-        "_cpresent",
-        "_presence",
-    ]
-
+            (base_type, type_test) = _resolve_union(base_type, args[0])
+            if (
+                type(type_test) is base_type
+                and getattr(base_type, "_pybind_generated_by", None) == "RestrictedClassType"
+            ):
+                # the instance that was created to resolve the type has been
+                # validated, so it is used as the value, rather than the value
+                # being validated again.
+                args = (type_test,) + args[1:]
+
+    container_node = yang_type in ["container", "list"] or is_container == "container"
+    clsslots = list(_yang_base_slots)
+    if container_node:
+        clsslots.extend(_yang_path_slots)
+        clsslots.extend(_yang_set_slots)
+
+    extmethod_names = ()
     if extmethods:
-        rpath = None
         if supplied_register_path is not None:
             rpath = supplied_register_path
-        if parent_instance is not None:
+        elif parent_instance:
             rpath = parent_instance._path() + [yang_name]
         else:
             rpath = []
         chk_path = "/" + "/".join(remove_path_attributes(rpath))
         if chk_path in extmethods:
-            for method in [i for i in dir(extmethods[chk_path]) if not i.startswith("_")]:
-                clsslots.append("_" + method)
+            extmethod_names = tuple(_extmethods_for(extmethods, chk_path))
+
+    clsslots = tuple(clsslots)
+    key = (
+        base_type,
+        clsslots,
+        yang_name,
+        choice_member,
+        is_container,
+        is_leaf,
+        is_config,
+        is_keyval,
+        register_paths,
+        yang_type,
+        namespace,
+        defining_module,
+        has_presence,
+        _hashable(extensions),
+        type(default),
+        _hashable(default),
+        extmethod_names,
+    )
+    yang_base_class = _yang_class_cache.get(key)
+    if yang_base_class is None:
+        _yang_class_cache_stats["misses"] += 1
+        yang_base_class = _build_yang_base_class(
+            base_type,
+            clsslots,
+            container_node,
+            {
+                "_default": default if default else False,
+                "_yang_name": yang_name,
+                "_choice": choice_member,
+                "_is_container": is_container,
+                "_is_leaf": is_leaf,
+                "_is_config": is_config,
+                "_extensionsd": extensions,
+                "_is_keyval": is_keyval,
+                "_register_paths": register_paths,
+                "_yang_type": yang_type,
+                "_namespace": namespace,
+                "_defining_module": defining_module,
+                "_presence": has_presence,
+                "_pybind_extmethods": extmethod_names,
+            },
+        )
+        _yang_class_cache[key] = yang_base_class
+    else:
+        _yang_class_cache_stats["hits"] += 1
+
+    if shared_default and not args and isinstance(base_type, type) and issubclass(base_type, _immutable_types):
+        # The caller only needs the value of an unset node, which is the same
+        # for every instance of the schema node - so hand back one instance
+        # that is shared between all of them. It is not attached to the tree.
+        instance = yang_base_class.__dict__.get("_pybind_shared_default")
+        if instance is None:
+            instance = yang_base_class(
+                _yang_attrs={
+                    "parent": None,
+                    "path_helper": False,
+                    "register_path": None,
+                    "extmethods": False,
+                    "load": None,
+                }
+            )
+            yang_base_class._pybind_shared_default = instance
+        return instance
+
+    kwargs["_yang_attrs"] = {
+        "parent": parent_instance,
+        "path_helper": path_helper,
+        "register_path": supplied_register_path,
+        "extmethods": extmethods,
+        "load": load,
+    }
+    return yang_base_class(*args, **kwargs)
+
+
+# The extension methods that each extmethods dictionary supplies for each
+# schema path, keyed on the id() of the dictionary. Each entry holds the
+# dictionary itself, such that its id() cannot be re-used while it is cached.
+_extmethod_tables = collections.OrderedDict()
+_EXTMETHOD_TABLE_SIZE = 16
+
+
+def _extmethods_for(extmethods, path):
+    """
+    Return the public methods of the object that extmethods binds to the
+    schema path path, keyed by name. These are found once for each binding
+    tree (i.e., extmethods dictionary) and path, rather than each time that
+    a node is created.
+  """
+    entry = _extmethod_tables.get(id(extmethods))
+    if entry is None or entry[0] is not extmethods:
+        while len(_extmethod_tables) >= _EXTMETHOD_TABLE_SIZE:
+            _extmethod_tables.popitem(last=False)
+        entry = (extmethods, {})
+        _extmethod_tables[id(extmethods)] = entry
+    table = entry[1]
+
+    helper = extmethods.get(path)
+    methods = table.get(path)
+    # the dictionary may have been changed since the methods were found.
+    if methods is None or methods[0] is not helper:
+        found = collections.OrderedDict()
+        if helper is not None:
+            for name in dir(helper):
+                if name.startswith("_"):
+                    continue
+                member = getattr(helper, name)
+                if hasattr(member, "__call__"):
+                    found[name] = member
+        methods = (helper, found)
+        table[path] = methods
+    return methods[1]
+
+
+class _ExtMethod(object):
+    """
+    A descriptor that binds the extension method name to the nodes of a
+    class built by YANGDynClass. Calls are proxied to the method of the
+    object that the extmethods of the node binds to its path, adding the
+    caller and path_helper keyword arguments.
+  """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        method = None
+        if instance._extmethods:
+            method = _extmethods_for(instance._extmethods, "/" + "/".join(instance._schema_path())).get(self.name)
+        if method is None:
+            raise AttributeError("%s has no extension method %s" % (instance._yang_name, self.name))
+
+        def extmethodfn(*args, **kwargs):
+            kwargs["caller"] = instance._register_path()
+            kwargs["path_helper"] = instance._path_helper
+            return method(*args, **kwargs)
+
+        return extmethodfn
+
+
+def _hashable(value):
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def yang_class_cache_info():
+    """
+    Report the number of hits and misses of the cache of classes built by
+    YANGDynClass, along with the number of classes currently held in it.
+  """
+    return YANGClassCacheInfo(
+        _yang_class_cache_stats["hits"], _yang_class_cache_stats["misses"], len(_yang_class_cache)
+    )
+
+
+def clear_yang_class_cache():
+    _yang_class_cache.clear()
+    _yang_class_cache_stats["hits"] = 0
+    _yang_class_cache_stats["misses"] = 0
+
+
+# The values of the per-instance attributes of a class built by YANGDynClass
+# that is not slotted. These are stored on the class, such that an instance
+# only stores those attributes which differ from them.
+_yang_instance_defaults = {
+    "_mchanged": False,
+    "_path_helper": False,
+    "_supplied_register_path": None,
+    "_extmethods": False,
+    "_pybind_metadata": None,
+    "_cpresent": False,
+}
+
+
+def _build_yang_base_class(base_type, clsslots, is_container, schema_attrs):
+    """
+    Build a new class extending base_type with the attributes that YANG
+    requires. The schema_attrs describing the schema node are stored on the
+    class. Nothing that is specific to an individual instance may be
+    captured here, since the class is shared between all instances of a
+    schema node - such values are handed to __init__ in the _yang_attrs
+    argument.
+  """
+    if is_container:
+        # containers and lists are restricted from having attributes that are
+        # not within the data model added to them.
+        return _define_yang_base_class(base_type, clsslots, schema_attrs, True)
+
+    # Leaves still allow leaf._someattr to be used by consuming code, so have
+    # a __dict__ (and can be weakly referenced) - but it is only created if
+    # such an attribute is set. Types that are variable-length inbuilts, such
+    # as long, cannot have slots, and fall back to storing their attributes
+    # in the __dict__.
+    leafslots = clsslots
+    if not base_type.__dictoffset__:
+        leafslots += ("__dict__",)
+    if not base_type.__weakrefoffset__:
+        leafslots += ("__weakref__",)
+    try:
+        return _define_yang_base_class(base_type, leafslots, schema_attrs, False)
+    except TypeError:
+        return _define_yang_base_class(base_type, None, schema_attrs, False)
+
+
+def _choice_unsets(choices):
+    """
+    Build a map from each (choice, case) in the __choices__ of a generated
+    class, to the names of the methods that unset the members of the other
+    cases of that choice.
+  """
+    unsets = {}
+    for choice, cases in six.iteritems(choices):
+        for case in cases:
+            unsets[(choice, case)] = tuple(
+                "_unset_%s" % elem for other in cases if other != case for elem in cases[other]
+            )
+    return unsets
+
+
+def _define_yang_base_class(base_type, clsslots, schema_attrs, cache_paths):
+    slotted = clsslots is not None
+    choice_unsets = _choice_unsets(base_type.__choices__) if hasattr(base_type, "__choices__") else None
 
     class YANGBaseClass(base_type):
-        # we only create slots for things that are restricted
-        # in adding attributes to them - this means containing
-        # data nodes. This means that we can allow
-        # leaf._someattr to be used by consuming code - it
-        # also fixes an issue whereby we could set __slots__
-        # and try and inherit a variable-length inbuilt such
-        # as long, which is not allowed.
-        if yang_type in ["container", "list"] or is_container == "container":
-            __slots__ = tuple(clsslots)
-
-        _pybind_base_class = regex.sub("<(type|class) '(?P<class>.*)'>", "\g<class>", str(base_type))
+        if slotted:
+            __slots__ = clsslots
+
+        _pybind_base_class = regex.sub("<(type|class) '(?P<class>.*)'>", r"\g<class>", str(base_type))
+        _base_type = base_type
 
         def __new__(self, *args, **kwargs):
+            kwargs.pop("_yang_attrs", None)
             try:
                 obj = base_type.__new__(self, *args, **kwargs)
             except TypeError:
@@ -1040,42 +1915,31 @@ def YANGDynClass(*args, **kwargs):
             return obj
 
         def __init__(self, *args, **kwargs):
-            self._default = False
-            self._mchanged = False
-            self._yang_name = yang_name
-            self._parent = parent_instance
-            self._choice = choice_member
-            self._path_helper = path_helper
-            self._supplied_register_path = supplied_register_path
-            self._base_type = base_type
-            self._is_leaf = is_leaf
-            self._is_container = is_container
-            self._is_config = is_config
-            self._extensionsd = extensions
-            self._extmethods = extmethods
-            self._is_keyval = is_keyval
-            self._register_paths = register_paths
-            self._namespace = namespace
-            self._yang_type = yang_type
-            self._defining_module = defining_module
-            self._metadata = {}
-            self._presence = has_presence
-            self._cpresent = False
-
-            if self._extmethods:
-                chk_path = "/" + "/".join(remove_path_attributes(self._register_path()))
-                if chk_path in self._extmethods:
-                    for method in [i for i in dir(self._extmethods[chk_path]) if not i.startswith("_")]:
-                        # Don't allow methods to be overwritten
-                        if hasattr(self, "_" + method):
-                            continue
-                        member = getattr(self._extmethods[chk_path], method)
-                        if hasattr(member, "__call__"):
-                            if not hasattr(self, "_method"):
-                                setattr(self, "_" + method, self.__generate_extmethod(member))
-
-            if default:
-                self._default = default
+            attrs = kwargs.pop("_yang_attrs")
+            self._parent = attrs["parent"]
+            if slotted:
+                self._mchanged = False
+                self._path_helper = attrs["path_helper"]
+                self._supplied_register_path = attrs["register_path"]
+                self._extmethods = attrs["extmethods"]
+                self._pybind_metadata = None
+                self._cpresent = False
+                if cache_paths:
+                    self._pybind_path = None
+                    self._pybind_schema_path = None
+                    self._pybind_yang_path = None
+                    self._pybind_propagated = False
+                    self._pybind_cases = None
+            else:
+                # otherwise, the values held by the class are used unless
+                # this instance differs from them.
+                if attrs["path_helper"] is not False:
+                    self._path_helper = attrs["path_helper"]
+                if attrs["register_path"] is not None:
+                    self._supplied_register_path = attrs["register_path"]
+                if attrs["extmethods"] is not False:
+                    self._extmethods = attrs["extmethods"]
+
             if len(args):
                 self._set()
 
@@ -1092,8 +1956,12 @@ def YANGDynClass(*args, **kwargs):
 
             if self._is_container == "list" or self._is_container == "container":
                 kwargs["path_helper"] = self._path_helper
-                if load is not None:
-                    kwargs["load"] = load
+                if attrs["load"] is not None:
+                    kwargs["load"] = attrs["load"]
+                # containers otherwise take the extmethods of their parent,
+                # which list entries that are created in bulk do not have yet.
+                if self._extmethods and self._is_container == "container":
+                    kwargs["extmethods"] = self._extmethods
 
             try:
                 super(YANGBaseClass, self).__init__(*args, **kwargs)
@@ -1112,8 +1980,19 @@ def YANGDynClass(*args, **kwargs):
             return self._register_path()
 
         def _yang_path(self):
+            if cache_paths:
+                if self._pybind_yang_path is None:
+                    self._pybind_yang_path = "/" + "/".join(self._register_path())
+                return self._pybind_yang_path
             return "/" + "/".join(self._register_path())
 
+        def _schema_path(self):
+            if cache_paths:
+                if self._pybind_schema_path is None:
+                    self._pybind_schema_path = remove_path_attributes(self._register_path())
+                return list(self._pybind_schema_path)
+            return remove_path_attributes(self._register_path())
+
         def __str__(self):
             return super(YANGBaseClass, self).__str__()
 
@@ -1121,30 +2000,72 @@ def YANGDynClass(*args, **kwargs):
             return super(YANGBaseClass, self).__repr__()
 
         def _set(self, choice=False):
-            if hasattr(self, "__choices__") and choice:
-                for ch in self.__choices__:
-                    if ch == choice[0]:
-                        for case in self.__choices__[ch]:
-                            if not case == choice[1]:
-                                for elem in self.__choices__[ch][case]:
-                                    method = "_unset_%s" % elem
-                                    if not hasattr(self, method):
-                                        raise AttributeError("unmapped choice!")
-                                    x = getattr(self, method)
-                                    x()
-
-            if self._choice and not choice:
-                choice = self._choice
+            """
+          Mark this node as changed, and propagate the change to its parent.
+          choice is the (choice, case) of the child that was set, where it is
+          within a case - the members of the other cases of that choice are
+          unset, unless the case is already the one that is in use.
+        """
+            if choice and choice_unsets is not None:
+                choice = tuple(choice)
+                if self._pybind_cases is None:
+                    self._pybind_cases = {}
+                if self._pybind_cases.get(choice[0]) != choice[1] and choice in choice_unsets:
+                    for method in choice_unsets[choice]:
+                        if not hasattr(self, method):
+                            raise AttributeError("unmapped choice!")
+                        getattr(self, method)()
+                    self._pybind_cases[choice[0]] = choice[1]
 
             self._mchanged = True
 
             if self._presence:
                 self._cpresent = True
 
+            # once a container has been marked as changed, so have all of its
+            # ancestors, and its case is the one in use by its parent.
+            if cache_paths and self._pybind_propagated:
+                return
+
             if self._parent and hasattr(self._parent, "_set"):
-                self._parent._set(choice=choice)
+                self._parent._set(choice=self._choice)
+            if cache_paths and self._parent is not None:
+                self._pybind_propagated = True
+
+        def _reset_propagation(self):
+            """
+          Discard the record that this node, and those beneath it, have
+          propagated their changes to their ancestors - such that the next
+          change beneath a container whose presence has been cleared marks
+          it as present again.
+        """
+            if not cache_paths:
+                return
+            self._pybind_propagated = False
+
+            if self._is_container == "list":
+                children = list(self.itervalues())
+            else:
+                children = [getattr(self, e) for e in self._pyangbind_elements if self._pyangbind_built(e)]
+            for child in children:
+                reset = getattr(child, "_reset_propagation", None)
+                if reset is not None:
+                    reset()
+
+        @property
+        def _metadata(self):
+            # most nodes never have metadata, so only create the dictionary
+            # when it is needed. The default value that is shared by unset
+            # leaves does not hold metadata, since it belongs to no tree.
+            if self._pybind_metadata is None:
+                if type(self).__dict__.get("_pybind_shared_default") is self:
+                    return {}
+                self._pybind_metadata = {}
+            return self._pybind_metadata
 
         def _add_metadata(self, k, v):
+            if type(self).__dict__.get("_pybind_shared_default") is self:
+                raise ValueError("metadata cannot be added to %s, which has not been set" % self._yang_name)
             self._metadata[k] = v
 
         def yang_name(self):
@@ -1158,6 +2079,12 @@ def YANGDynClass(*args, **kwargs):
             self._set()
             super(YANGBaseClass, self).__setitem__(*args, **kwargs)
 
+        def __delitem__(self, *args, **kwargs):
+            if not hasattr(super(YANGBaseClass, self), "__delitem__"):
+                raise TypeError("%s object does not support item deletion" % base_type)
+            self._set()
+            super(YANGBaseClass, self).__delitem__(*args, **kwargs)
+
         def append(self, *args, **kwargs):
             if not hasattr(super(YANGBaseClass, self), "append"):
                 raise AttributeError("%s object has no attribute append" % base_type)
@@ -1193,6 +2120,16 @@ def YANGDynClass(*args, **kwargs):
             super(YANGBaseClass, self).insert(*args, **kwargs)
 
         def _register_path(self):
+            # The path of a container or list is cached, such that building
+            # the path of a child only requires the path of its parent, rather
+            # than walking up the tree.
+            if cache_paths:
+                if self._pybind_path is None:
+                    self._pybind_path = list(self._build_path())
+                return list(self._pybind_path)
+            return self._build_path()
+
+        def _build_path(self):
             if self._supplied_register_path is not None:
                 return self._supplied_register_path
             if self._parent is not None:
@@ -1200,14 +2137,40 @@ def YANGDynClass(*args, **kwargs):
             else:
                 return []
 
-        def __generate_extmethod(self, methodfn):
-
-            def extmethodfn(*args, **kwargs):
-                kwargs["caller"] = self._register_path()
-                kwargs["path_helper"] = self._path_helper
-                return methodfn(*args, **kwargs)
-
-            return extmethodfn
+        def _invalidate_path(self, register_path=None):
+            """
+          Discard the paths that are cached by this node and those beneath
+          it. This must be called when the node is moved to a new parent, or
+          the key of the list entry that it represents is changed - in which
+          case, the new path is supplied as register_path.
+        """
+            if register_path is not None:
+                self._supplied_register_path = register_path
+            elif self._supplied_register_path is not None and self._parent is not None:
+                # list entries are registered with their key, which is kept.
+                self._supplied_register_path = self._parent._path() + self._supplied_register_path[-1:]
+
+            if not cache_paths:
+                return
+            # the paths beneath a container are built from its own path, so
+            # have not been cached where it has not, and are unchanged where
+            # its path is. The entries of a list are not built from the path
+            # of the list, so are always visited.
+            if self._is_container != "list":
+                if self._pybind_path is None or self._pybind_path == self._build_path():
+                    return
+            self._pybind_path = None
+            self._pybind_schema_path = None
+            self._pybind_yang_path = None
+
+            if self._is_container == "list":
+                children = list(self.itervalues())
+            else:
+                children = [getattr(self, e) for e in self._pyangbind_elements if self._pyangbind_built(e)]
+            for child in children:
+                invalidate = getattr(child, "_invalidate_path", None)
+                if invalidate is not None:
+                    invalidate()
 
         def _set_present(self, present=True):
             if not self._is_container == "container":
@@ -1215,6 +2178,8 @@ def YANGDynClass(*args, **kwargs):
             self._cpresent = present
             if present is True:
                 self._set()
+            else:
+                self._reset_propagation()
 
         def _present(self):
             if not self._is_container == "container":
@@ -1225,7 +2190,18 @@ def YANGDynClass(*args, **kwargs):
 
             return self._cpresent
 
-    return YANGBaseClass(*args, **kwargs)
+    for name, value in schema_attrs.items():
+        setattr(YANGBaseClass, name, value)
+    for name in schema_attrs.get("_pybind_extmethods", ()):
+        # extension methods do not replace the existing attributes of the
+        # class.
+        if not hasattr(YANGBaseClass, "_" + name):
+            setattr(YANGBaseClass, "_" + name, _ExtMethod(name))
+    if not slotted:
+        for name, value in _yang_instance_defaults.items():
+            setattr(YANGBaseClass, name, value)
+
+    return YANGBaseClass
 
 
 def ReferenceType(*args, **kwargs):
@@ -1274,7 +2250,17 @@ def ReferenceType(*args, **kwargs):
                 value = None
 
             if self._path_helper and value is not None:
-                path_chk = self._path_helper.get(self._referenced_path, caller=self._caller)
+                # where the path helper indexes the values at the path, only a
+                # path that selects a single object - which may be a pointer
+                # - is retrieved.
+                get_by_value = getattr(self._path_helper, "get_by_value", None)
+                if (
+                    get_by_value is not None
+                    and self._path_helper.count(self._referenced_path, caller=self._caller) != 1
+                ):
+                    path_chk = None
+                else:
+                    path_chk = self._path_helper.get(self._referenced_path, caller=self._caller)
 
                 # if the lookup returns only one leaf, then this means that we have
                 # something that could potentially be a pointer. However, this is not
@@ -1283,7 +2269,12 @@ def ReferenceType(*args, **kwargs):
                 # key value of a list (if it is then this is something that can be
                 # externally referenced) and 2) check that this is not
                 # a list itself (including a leaf-list)
-                if len(path_chk) == 1 and not path_chk[0]._is_keyval and not is_yang_list(path_chk[0]):
+                if (
+                    path_chk is not None
+                    and len(path_chk) == 1
+                    and not path_chk[0]._is_keyval
+                    and not is_yang_list(path_chk[0])
+                ):
                     # we are not checking whether this leaf exists, but rather
                     # this is a pointer to some other value.
                     path_parts = self._referenced_path.split("/")
@@ -1305,9 +2296,7 @@ def ReferenceType(*args, **kwargs):
                         self._referenced_object = None
                     else:
                         found = False
-                        path_chk = self._path_helper.get(self._referenced_path, caller=self._caller)
-
-                        if len(path_chk) == 1 and is_yang_leaflist(path_chk[0]):
+                        if path_chk is not None and len(path_chk) == 1 and is_yang_leaflist(path_chk[0]):
                             index = 0
                             for i in path_chk[0]:
                                 if six.text_type(i) == six.text_type(value):
@@ -1315,6 +2304,11 @@ def ReferenceType(*args, **kwargs):
                                     self._referenced_object = path_chk[0][index]
                                     break
                                 index += 1
+                        elif get_by_value is not None:
+                            matched = get_by_value(self._referenced_path, value, caller=self._caller)
+                            if len(matched):
+                                found = True
+                                self._referenced_object = matched[-1]
                         else:
                             found = False
                             for i in path_chk:
@@ -1323,6 +2317,8 @@ def ReferenceType(*args, **kwargs):
                                     self._referenced_object = i
 
                         if not found:
+                            if path_chk is None:
+                                path_chk = self._path_helper.get(self._referenced_path, caller=self._caller)
                             raise ValueError(
                                 "no such key (%s) existed in path (%s -> %s)"
                                 % (value, self._referenced_path, path_chk)
@@ -54,6 +54,10 @@ if DEBUG:
 # True and False boolean instances.
 class_bool_map = {"false": False, "False": False, "true": True, "True": True}
 
+# The name of the module that the tables of identities are written to when
+# the classes are split into a directory structure.
+IDENTITY_TABLE_MODULE = "_pyangbind_identities"
+
 class_map = {
     # this map is dynamically built upon but defines how we take
     # a YANG type  and translate it into a native Python class
@@ -269,6 +273,32 @@ class PyangBindClass(plugin.PyangPlugin):
                                     keyword is used in the generated
                                     code.""",
         ),
+        option_group.add_option(
+            "--lazy-subtrees",
+            dest="lazy_subtrees",
+            action="store_true",
+            help="""Build child containers and
+                                  lists when they are first
+                                  accessed, rather than when
+                                  their parent is created""",
+        ),
+        option_group.add_option(
+            "--sparse-leaves",
+            dest="sparse_leaves",
+            action="store_true",
+            help="""Store only leaves that have
+                                  been set, serving unset leaves
+                                  from a default value that is
+                                  shared between instances""",
+        ),
+        option_group.add_option(
+            "--uuid-list-keys",
+            dest="uuid_list_keys",
+            action="store_true",
+            help="""Key the entries of lists that
+                                  do not have a key by a UUID,
+                                  rather than by numbering them""",
+        ),
         option_group.add_option(
             "--build-notifications",
             dest="build_notifications",
@@ -319,6 +349,8 @@ def build_pybind(ctx, modules, fd):
         "YANGDynClass",
         "ReferenceType",
     ]
+    if ctx.opts.uuid_list_keys:
+        yangtypes_imports.append("uuid_key")
     for library in yangtypes_imports:
         ctx.pybind_common_hdr += "from pyangbind.lib.yangtypes import {}\n".format(library)
     ctx.pybind_common_hdr += "from pyangbind.lib.base import PybindBase\n"
@@ -404,6 +436,7 @@ elif six.PY2:
     # is globally referenced).
     build_identities(ctx, defn["identity"])
     build_typedefs(ctx, defn["typedef"])
+    write_identity_tables(ctx, fd)
 
     # Iterate through the tree which pyang has built, solely for the modules
     # that pyang was asked to build
@@ -470,13 +503,21 @@ def build_identities(ctx, defnd):
         if identity.name not in identity_dict:
             identity_dict[identity.name] = {}
 
+    # Each distinct table of identities is written once to the generated code
+    # (see write_identity_tables), and the types that use it reference it by
+    # name, rather than every leaf, setter and unsetter repeating the table.
+    ctx.pybind_identity_tables = OrderedDict()
+
     # Add entries to the class_map such that this identity can be referenced by
     # elements that use this identity ref.
     for i in identity_dict:
+        table = "%s" % identity_dict[i]
+        if table not in ctx.pybind_identity_tables:
+            ctx.pybind_identity_tables[table] = "_identity_table_%d" % len(ctx.pybind_identity_tables)
         id_type = {
             "native_type": """RestrictedClassType(base_type=six.text_type, """
             + """restriction_type="dict_key", """
-            + """restriction_arg=%s,)""" % identity_dict[i],
+            + """restriction_arg=%s,)""" % ctx.pybind_identity_tables[table],
             "restriction_argument": identity_dict[i],
             "restriction_type": "dict_key",
             "parent_type": "string",
@@ -485,6 +526,30 @@ def build_identities(ctx, defnd):
         class_map[i] = id_type
 
 
+def write_identity_tables(ctx, fd):
+    # Write the tables of identities that are referenced by the identityref
+    # types. When the classes are split into a directory structure, they are
+    # written to a module of their own that each file imports.
+    if not ctx.pybind_identity_tables:
+        return
+    if ctx.opts.split_class_dir:
+        fpath = os.path.join(ctx.pybind_split_basepath, "%s.py" % IDENTITY_TABLE_MODULE)
+        try:
+            if six.PY3:
+                fd = open(fpath, "w", encoding="utf-8")
+            else:
+                fd = codecs.open(fpath, "w", encoding="utf-8")
+        except IOError as m:
+            raise IOError("could not open pyangbind output file (%s)" % m)
+        fd.write("# -*- coding: utf-8 -*-\n")
+        fd.write("__all__ = %s\n" % repr([str(name) for name in ctx.pybind_identity_tables.values()]))
+    for table, name in ctx.pybind_identity_tables.items():
+        fd.write("%s = %s\n" % (name, table))
+    fd.write("\n")
+    if ctx.opts.split_class_dir:
+        fd.close()
+
+
 def build_typedefs(ctx, defnd):
     # Build the type definitions that are specified within a model. Since
     # typedefs are essentially derived from existing types, order of processing
@@ -666,6 +731,7 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
     if ctx.opts.split_class_dir:
         if path == "":
             fpath = ctx.pybind_split_basepath + "/__init__.py"
+            depth = 0
         else:
             pparts = path.split("/")
             npath = "/"
@@ -682,6 +748,7 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
                 npath += pname + "/"
 
             bpath = ctx.pybind_split_basepath + npath
+            depth = len(pparts) - 1
             if not os.path.exists(bpath):
                 os.makedirs(bpath)
             fpath = bpath + "/__init__.py"
@@ -694,6 +761,8 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
             except IOError as m:
                 raise IOError("could not open pyangbind output file (%s)" % m)
             nfd.write(ctx.pybind_common_hdr)
+            if ctx.pybind_identity_tables:
+                nfd.write("from %s%s import *\n\n" % ("." * (depth + 1), IDENTITY_TABLE_MODULE))
         else:
             try:
                 if six.PY3:
@@ -777,16 +846,15 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
     # 'container', 'module', 'list' and 'submodule' all have their own classes
     # generated.
     if parent.keyword in ["container", "module", "list", "submodule", "input", "output", "rpc", "notification"]:
-        if ctx.opts.split_class_dir:
-            nfd.write("class %s(PybindBase):\n" % safe_name(parent.arg))
+        if ctx.opts.split_class_dir or path == "":
+            class_name = safe_name(parent.arg)
         else:
-            if not path == "":
-                nfd.write(
-                    "class yc_%s_%s_%s(PybindBase):\n"
-                    % (safe_name(parent.arg), safe_name(module.arg), safe_name(path.replace("/", "_")))
-                )
-            else:
-                nfd.write("class %s(PybindBase):\n" % safe_name(parent.arg))
+            class_name = "yc_%s_%s_%s" % (
+                safe_name(parent.arg),
+                safe_name(module.arg),
+                safe_name(path.replace("/", "_")),
+            )
+        nfd.write("class %s(PybindBase):\n" % class_name)
 
         # If the container is actually a list, then determine what the key value
         # is and store this such that we can give a hint.
@@ -838,6 +906,31 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
         slots_str += ")\n"
         elements_str += "])\n"
         nfd.write(slots_str + "\n")
+
+        # When subtrees are built lazily, child containers and lists are left
+        # as None until they are first accessed. Similarly, sparse leaves are
+        # left as None until they are set, with the getter returning a default
+        # instance that is shared by every instance of the leaf. Record the
+        # (mangled) name of the attribute holding each of them, such that
+        # PybindBase can determine whether an element has been built without
+        # building it. leafrefs using the xpathhelper are not sparse, since
+        # their type is specific to the instance that refers.
+        lazy_elements = {}
+        sparse_elements = []
+        for i in elements:
+            if ctx.opts.lazy_subtrees and i["class"] in ["container", "list"]:
+                lazy_elements[i["name"]] = "_%s__%s" % (class_name.lstrip("_"), i["name"])
+            elif ctx.opts.sparse_leaves and i["class"] not in [
+                "container",
+                "list",
+                "leaf-list",
+                "leafref",
+                "leafref-list",
+            ]:
+                lazy_elements[i["name"]] = "_%s__%s" % (class_name.lstrip("_"), i["name"])
+                sparse_elements.append(i["name"])
+        if lazy_elements:
+            nfd.write("  _pyangbind_lazy_elements = %s\n" % repr(lazy_elements))
         # Store the real name of the element - since we often get values that are
         # not allowed in python as identifiers, but we need the real-name when
         # creating instance documents (e.g., peer-group is not valid due to '-').
@@ -894,6 +987,8 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
                 class_str["arg"] += ", path_helper=self._path_helper"
                 class_str["arg"] += ", yang_keys='%s'" % i["yang_keys"]
                 class_str["arg"] += ", extensions=%s" % i["extensions"]
+                if ctx.opts.uuid_list_keys and not i["key"]:
+                    class_str["arg"] += ", key_generator=uuid_key"
                 if i["choice"]:
                     class_str["arg"] += ", choice=%s" % repr(choice)
                 class_str["arg"] += ")"
@@ -1040,7 +1135,10 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
         # Write out the classes that are stored locally as self.__foo where
         # foo is the safe YANG name.
         for c in classes:
-            nfd.write("    self.%s = %s(%s)\n" % (classes[c]["name"], classes[c]["type"], classes[c]["arg"]))
+            if c in lazy_elements:
+                nfd.write("    self.%s = None\n" % classes[c]["name"])
+            else:
+                nfd.write("    self.%s = %s(%s)\n" % (classes[c]["name"], classes[c]["type"], classes[c]["arg"]))
         # Don't accept arguments to a container/list/submodule class
         nfd.write(
             """
@@ -1049,14 +1147,30 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
       if len(args) > 1:
         raise TypeError("cannot create a YANG container with >1 argument")
       all_attr = True
-      for e in self._pyangbind_elements:
-        if not hasattr(args[0], e):
-          all_attr = False
+      for e in self._pyangbind_elements:\n"""
+        )
+        # Checking for the attribute would build an unbuilt subtree of the
+        # supplied object, so check its elements instead where it has them.
+        if ctx.opts.lazy_subtrees or ctx.opts.sparse_leaves:
+            nfd.write(
+                """        if e not in getattr(args[0], "_pyangbind_elements", {}) and not hasattr(args[0], e):\n"""
+            )
+        else:
+            nfd.write("""        if not hasattr(args[0], e):\n""")
+        nfd.write(
+            """          all_attr = False
           break
       if not all_attr:
         raise ValueError("Supplied object did not have the correct attributes")
-      for e in self._pyangbind_elements:
-        nobj = getattr(args[0], e)
+      for e in self._pyangbind_elements:\n"""
+        )
+        if ctx.opts.lazy_subtrees or ctx.opts.sparse_leaves:
+            nfd.write(
+                """        if isinstance(args[0], PybindBase) and not args[0]._pyangbind_built(e):
+          continue\n"""
+            )
+        nfd.write(
+            """        nobj = getattr(args[0], e)
         if nobj._changed() is False:
           continue
         setmethod = getattr(self, "_set_%s" % e)
@@ -1090,10 +1204,33 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
   def _get_%s(self):
     """
     Getter method for %s, mapped from YANG variable %s (%s)%s
-    """
+    """'''
+                % (i["name"], i["name"], i["path"], i["origtype"], description_str)
+            )
+            if i["name"] in sparse_elements:
+                # the defaults of types that can be changed in place are not
+                # shared, so are stored when they are first read.
+                nfd.write(
+                    """
+    if self.__%s is None:
+      t = %s(%s, shared_default=True)
+      if t._parent is None:
+        return t
+      self.__%s = t"""
+                    % (i["name"], c_str["type"], c_str["arg"], i["name"])
+                )
+            elif i["name"] in lazy_elements:
+                nfd.write(
+                    """
+    if self.__%s is None:
+      self.__%s = %s(%s)"""
+                    % (i["name"], i["name"], c_str["type"], c_str["arg"])
+                )
+            nfd.write(
+                """
     return self.__%s
-      '''
-                % (i["name"], i["name"], i["path"], i["origtype"], description_str, i["name"])
+      """
+                % i["name"]
             )
 
             nfd.write(
@@ -1155,12 +1292,20 @@ def get_children(ctx, fd, i_children, module, parent, path=str(), parent_cfg=Tru
             # be used. Generally, this is done in a choice where one branch needs to
             # be set to the default, but may be used wherever re-initialiation of
             # the object is required.
-            nfd.write(
-                """
+            if i["name"] in lazy_elements:
+                nfd.write(
+                    """
+  def _unset_%s(self):
+    self.__%s = None\n\n"""
+                    % (i["name"], i["name"])
+                )
+            else:
+                nfd.write(
+                    """
   def _unset_%s(self):
     self.__%s = %s(%s)\n\n"""
-                % (i["name"], i["name"], c_str["type"], c_str["arg"])
-            )
+                    % (i["name"], i["name"], c_str["type"], c_str["arg"])
+                )
 
         # When an element is read-only, write out the _set and _get methods, but
         # we don't actually make the property object accessible. This ensures that
@@ -100,6 +100,35 @@ class ChoicesTests(PyangBindTestCase):
             "Adding to the second user list did not remove entries from the first",
         )
 
+    def test_set_in_nested_choice_resets_other_side_of_outer_choice(self):
+        self.choice_obj.nested.outer_two_leaf = 42
+        self.choice_obj.nested.outer_one_container.inner_one_leaf = 42
+        self.assertEqual(self.choice_obj.nested.outer_two_leaf, 0)
+        self.assertEqual(self.choice_obj.nested.outer_one_container.inner_one_leaf, 42)
+
+    def test_change_nested_choice_keeps_outer_choice(self):
+        self.choice_obj.nested.outer_one_container.inner_one_leaf = 42
+        self.choice_obj.nested.outer_one_container.inner_two_leaf = 42
+        self.assertEqual(self.choice_obj.nested.outer_one_container.inner_one_leaf, 0)
+        self.assertEqual(self.choice_obj.nested.outer_one_container.inner_two_leaf, 42)
+        self.assertTrue(self.choice_obj.nested._changed())
+
+    def test_add_to_list_in_case_resets_other_side(self):
+        self.choice_obj.nested.outer_one_container.inner_one_leaf = 42
+        self.choice_obj.nested.peer.add("first")
+        self.assertEqual(self.choice_obj.nested.outer_one_container.inner_one_leaf, 0)
+        self.choice_obj.nested.outer_one_container.inner_one_leaf = 42
+        self.assertEqual(len(self.choice_obj.nested.peer), 0)
+
+    def test_choices_switch_back_and_forth(self):
+        for value in range(1, 4):
+            with self.subTest(value=value):
+                self.choice_obj.container.case_one_container.case_one_leaf = value
+                self.choice_obj.container.case_one_container.case_one_leaf = value + 1
+                self.assertEqual(self.choice_obj.container.case_two_container.case_two_leaf, 0)
+                self.choice_obj.container.case_two_container.case_two_leaf = value
+                self.assertEqual(self.choice_obj.container.case_one_container.case_one_leaf, 0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+from __future__ import unicode_literals
+
+import unittest
+
+from pyangbind.lib.yangtypes import yang_class_cache_info
+from tests.base import PyangBindTestCase
+
+
+class ClassCacheTests(PyangBindTestCase):
+    yang_files = ["class-cache.yang"]
+
+    def setUp(self):
+        self.instance = self.bindings.class_cache()
+
+    def test_instances_share_leaf_classes(self):
+        other = self.bindings.class_cache()
+        for leaf in ["string", "restricted", "members"]:
+            with self.subTest(leaf=leaf):
+                self.assertIs(type(getattr(self.instance.container, leaf)), type(getattr(other.container, leaf)))
+
+    def test_instances_share_container_classes(self):
+        other = self.bindings.class_cache()
+        self.assertIs(type(self.instance.container), type(other.container))
+        self.assertIs(type(self.instance.container.inner), type(other.container.inner))
+
+    def test_setting_a_leaf_reuses_its_class(self):
+        before = type(self.instance.container.restricted)
+        self.instance.container.restricted = 10
+        self.assertIs(type(self.instance.container.restricted), before)
+
+    def test_setting_a_leaf_is_a_cache_hit(self):
+        self.instance.container.string = "one"
+        hits = yang_class_cache_info().hits
+        self.instance.container.string = "two"
+        self.assertGreater(yang_class_cache_info().hits, hits)
+
+    def test_restricted_value_is_still_validated(self):
+        self.instance.container.restricted = 50
+        with self.assertRaises(ValueError):
+            self.instance.container.restricted = 500
+        self.assertEqual(self.instance.container.restricted, 50)
+
+    def test_schema_attributes_are_stored_on_the_class(self):
+        leaf = self.instance.container.string
+        self.assertEqual(leaf._yang_name, "string")
+        self.assertEqual(leaf._namespace, "http://rob.sh/yang/test/class-cache")
+        for attr in ["_yang_name", "_namespace", "_defining_module", "_yang_type", "_extensionsd"]:
+            with self.subTest(attr=attr):
+                self.assertNotIn(attr, vars(leaf))
+
+    def test_string_leaf_is_slotted(self):
+        self.assertIn("_parent", type(self.instance.container.string).__slots__)
+
+    def test_unslotted_leaf_only_stores_non_default_attributes(self):
+        self.assertEqual(set(vars(self.instance.container.restricted)), set(["_parent"]))
+        self.instance.container.restricted = 10
+        self.assertEqual(set(vars(self.instance.container.restricted)), set(["_parent", "_mchanged"]))
+
+    def test_leaves_allow_additional_attributes(self):
+        for leaf in ["string", "restricted", "members"]:
+            with self.subTest(leaf=leaf):
+                element = getattr(self.instance.container, leaf)
+                element._custom = True
+                self.assertIs(element._custom, True)
+
+    def test_metadata_is_per_instance(self):
+        other = self.bindings.class_cache()
+        self.instance.container.string._add_metadata("key", "value")
+        self.assertEqual(self.instance.container.string._metadata, {"key": "value"})
+        self.assertEqual(other.container.string._metadata, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
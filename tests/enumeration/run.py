@@ -2,6 +2,9 @@
 
 import unittest
 
+import six
+
+from pyangbind.lib.yangtypes import RestrictedClassType
 from tests.base import PyangBindTestCase
 
 
@@ -51,6 +54,39 @@ class EnumerationTests(PyangBindTestCase):
             "Erroneously statically defined value returned (%s)" % self.enum_obj.container.e.getValue(mapped=True),
         )
 
+    def test_enum_values_are_numbered_around_static_value(self):
+        self.enum_obj.container.e = "three"
+        self.assertEqual(self.enum_obj.container.e.getValue(mapped=True), 2)
+        self.assertEqual(self.enum_obj.container.e._enumeration_names, {0: "one", 42: "two", 2: "three"})
+
+    def test_enum_type_is_shared_between_values(self):
+        self.enum_obj.container.e = "one"
+        first = type(self.enum_obj.container.e)
+        self.enum_obj.container.e = "three"
+        self.assertIs(type(self.enum_obj.container.e)._enumeration_dict, first._enumeration_dict)
+
+    def test_enums_with_same_names_and_different_values_are_distinct(self):
+        first = RestrictedClassType(
+            base_type=six.text_type, restriction_type="dict_key", restriction_arg={"a": {"value": 1}, "b": {}}
+        )
+        second = RestrictedClassType(
+            base_type=six.text_type, restriction_type="dict_key", restriction_arg={"a": {"value": 5}, "b": {}}
+        )
+        for _ in range(2):
+            with self.subTest(type=first):
+                self.assertEqual(first("a").getValue(mapped=True), 1)
+                self.assertIs(
+                    RestrictedClassType(
+                        base_type=six.text_type,
+                        restriction_type="dict_key",
+                        restriction_arg={"a": {"value": 1}, "b": {}},
+                    ),
+                    first,
+                )
+            with self.subTest(type=second):
+                self.assertEqual(second("a").getValue(mapped=True), 5)
+                self.assertEqual(second("b").getValue(mapped=True), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -23,6 +23,20 @@ class extmethodcls(object):
         return {"args": args, "kwargs": kwargs}
 
 
+class countingcls(object):
+
+    def __init__(self, name):
+        self.name = name
+        self.dir_calls = 0
+
+    def __dir__(self):
+        self.dir_calls += 1
+        return ["whoami", "name"]
+
+    def whoami(self, *args, **kwargs):
+        return (self.name, kwargs["caller"])
+
+
 class ExtMethodsTests(PyangBindTestCase):
     yang_files = ["extmethods.yang"]
     pyang_flags = ["--use-extmethods"]
@@ -62,6 +76,33 @@ class ExtMethodsTests(PyangBindTestCase):
         with self.assertRaises(AttributeError):
             self.instance.item.two
 
+    def test_extmethods_are_bound_to_list_entries(self):
+        helper = countingcls("first")
+        instance = self.bindings.extmethods(extmethods={"/items/entry": helper})
+        for name in ["one", "two", "three"]:
+            instance.items.entry.add(name)
+        self.assertEqual(instance.items.entry["two"]._whoami(), ("first", ["items", "entry[name='two']"]))
+        self.assertEqual(helper.dir_calls, 1)
+
+    def test_extmethods_are_bound_to_entries_added_in_bulk(self):
+        instance = self.bindings.extmethods(extmethods={"/items/entry": countingcls("first")})
+        instance.items.entry.add_many([{"name": "one"}, {"name": "two"}])
+        self.assertEqual(instance.items.entry["one"]._whoami(), ("first", ["items", "entry[name='one']"]))
+        self.assertEqual(instance.items.entry["two"]._whoami(), ("first", ["items", "entry[name='two']"]))
+
+    def test_non_callable_attributes_are_not_bound(self):
+        instance = self.bindings.extmethods(extmethods={"/items/entry": countingcls("first")})
+        instance.items.entry.add("one")
+        self.assertIsNone(getattr(instance.items.entry["one"], "_name", None))
+
+    def test_trees_call_their_own_extmethods(self):
+        first = self.bindings.extmethods(extmethods={"/items/entry": countingcls("first")})
+        second = self.bindings.extmethods(extmethods={"/items/entry": countingcls("second")})
+        first.items.entry.add("one")
+        second.items.entry.add("one")
+        self.assertEqual(first.items.entry["one"]._whoami()[0], "first")
+        self.assertEqual(second.items.entry["one"]._whoami()[0], "second")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -142,6 +142,13 @@ class IdentityRefTests(PyangBindTestCase):
                     allowed = False
                 self.assertEqual(allowed, valid)
 
+    def test_identity_table_is_shared_by_leaves_and_defined_once(self):
+        self.instance.test_container.id1 = "option-one"
+        table = self.instance.test_container.id1._restriction_dict["dict_key"]
+        shared = [value for name, value in vars(self.bindings).items() if name.startswith("_identity_table_")]
+        self.assertEqual(len([value for value in shared if value is table]), 1)
+        self.assertEqual(len(shared), len(set(repr(value) for value in shared)))
+
 
 if __name__ == "__main__":
     unittest.main()
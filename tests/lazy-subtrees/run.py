@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+from __future__ import unicode_literals
+
+import json
+import unittest
+
+import pyangbind.lib.pybindJSON as pbJ
+from pyangbind.lib.xpathhelper import YANGPathHelper
+from tests.base import PyangBindTestCase
+
+
+class LazySubtreeTests(PyangBindTestCase):
+    yang_files = ["lazy-subtrees.yang"]
+    pyang_flags = ["--lazy-subtrees", "--use-xpathhelper"]
+
+    def setUp(self):
+        self.path_helper = YANGPathHelper()
+        self.instance = self.bindings.lazy_subtrees(path_helper=self.path_helper)
+
+    def test_subtrees_are_not_built_on_instantiation(self):
+        for element in ["parent", "other"]:
+            with self.subTest(element=element):
+                self.assertFalse(self.instance._pyangbind_built(element))
+
+    def test_subtree_is_built_on_access(self):
+        self.instance.parent
+        self.assertTrue(self.instance._pyangbind_built("parent"))
+        self.assertFalse(self.instance.parent._pyangbind_built("child"))
+        self.assertFalse(self.instance._pyangbind_built("other"))
+
+    def test_leaves_are_always_built(self):
+        self.assertTrue(self.instance.parent._pyangbind_built("value"))
+
+    def test_built_subtree_is_retained(self):
+        self.instance.parent.child.grandchild.value = "kept"
+        self.assertEqual(self.instance.parent.child.grandchild.value, "kept")
+        self.assertIs(self.instance.parent.child, self.instance.parent.child)
+
+    def test_filtered_get_does_not_build_subtrees(self):
+        self.assertEqual(self.instance.get(filter=True), {})
+        self.assertFalse(self.instance._pyangbind_built("parent"))
+
+    def test_filtered_get_includes_changed_subtrees(self):
+        self.instance.parent.child.value = 10
+        self.assertEqual(self.instance.get(filter=True), {"parent": {"child": {"value": 10}}})
+        self.assertFalse(self.instance._pyangbind_built("other"))
+
+    def test_unfiltered_get_includes_unbuilt_subtrees(self):
+        self.assertEqual(set(self.instance.get().keys()), set(["parent", "other"]))
+
+    def test_ietf_serialisation_does_not_build_subtrees(self):
+        self.instance.other.value = "serialised"
+        self.assertEqual(
+            json.loads(pbJ.dumps(self.instance, mode="ietf")), {"lazy-subtrees:other": {"value": "serialised"}}
+        )
+        self.assertFalse(self.instance._pyangbind_built("parent"))
+
+    def test_list_is_built_on_access(self):
+        self.instance.parent.entry.add("one")
+        self.instance.parent.entry["one"].config.value = "set"
+        self.assertEqual(
+            self.instance.get(filter=True), {"parent": {"entry": {"one": {"name": "one", "config": {"value": "set"}}}}}
+        )
+
+    def test_choice_unsets_other_case(self):
+        self.instance.parent.first.value = "one"
+        self.instance.parent.second.value = "two"
+        self.assertFalse(self.instance.parent._pyangbind_built("first"))
+        self.assertEqual(self.instance.parent.first.value, "")
+
+    def test_unset_returns_subtree_to_unbuilt(self):
+        self.instance.parent.child.value = 1
+        self.instance.parent._unset_child()
+        self.assertFalse(self.instance.parent._pyangbind_built("child"))
+        self.assertEqual(self.instance.parent.child.value, 0)
+
+    def test_copy_does_not_build_subtrees(self):
+        self.instance.other.value = "copied"
+        copied = self.bindings.lazy_subtrees(self.instance)
+        self.assertEqual(copied.other.value, "copied")
+        self.assertFalse(self.instance._pyangbind_built("parent"))
+
+    def test_built_subtree_is_registered(self):
+        self.instance.parent.child.grandchild.value = "registered"
+        self.assertEqual(len(self.path_helper.get("/parent/child/grandchild/value")), 1)
+
+    def test_load_json(self):
+        loaded = pbJ.loads(
+            {"parent": {"child": {"value": 4}}}, self.bindings, "lazy_subtrees", path_helper=YANGPathHelper()
+        )
+        self.assertEqual(loaded.parent.child.value, 4)
+        self.assertFalse(loaded._pyangbind_built("other"))
+
+
+class LazySubtreeSplitClassTests(LazySubtreeTests):
+    pyang_flags = ["--lazy-subtrees", "--use-xpathhelper"]
+    split_class_dir = True
+
+
+if __name__ == "__main__":
+    unittest.main()
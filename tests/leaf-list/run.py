@@ -1,6 +1,9 @@
 #!/usr/bin/env python
 from __future__ import unicode_literals
 
+import six
+
+from pyangbind.lib.yangtypes import RestrictedClassType, TypedListType
 from tests.base import PyangBindTestCase
 
 try:
@@ -75,6 +78,12 @@ class LeafListTests(PyangBindTestCase):
 
         self.assertEqual(len(self.leaflist_obj.container.leaflist), 3)
 
+    def test_delete_item_marks_leaflist_changed(self):
+        leaflist = self.leaflist_obj.container.leaflist
+        del leaflist[:]
+
+        self.assertTrue(leaflist._changed())
+
     def test_get_full_leaflist(self):
         self.leaflist_obj.container.leaflist.append("itemOne")
         self.leaflist_obj.container.leaflist.append("itemTwo")
@@ -130,6 +139,50 @@ class LeafListTests(PyangBindTestCase):
         with self.assertRaises(ValueError):
             self.leaflist_obj.container.leaflist[2] = "foo"
 
+    def test_value_can_be_appended_again_after_it_is_removed(self):
+        leaflist = self.leaflist_obj.container.leaflist
+        leaflist.extend(["foo", "bar", "baz"])
+        leaflist.remove("foo")
+        leaflist.pop(0)
+        del leaflist[0:1]
+        self.assertEqual(len(leaflist), 0)
+        leaflist.append("bar")
+        leaflist.append("bar")
+        self.assertEqual(leaflist, ["bar"])
+
+    def test_leaflist_contains(self):
+        self.leaflist_obj.container.leaflist = ["foo", "bar"]
+        self.assertIn("bar", self.leaflist_obj.container.leaflist)
+        self.assertNotIn("baz", self.leaflist_obj.container.leaflist)
+
+    def test_unique_leaflist_with_unhashable_values(self):
+        self.leaflist_obj.container.listthree.append(1)
+        self.leaflist_obj.container.listthree._store(1, ["unhashable"])
+        self.assertIn(1, self.leaflist_obj.container.listthree)
+        self.assertIn(["unhashable"], self.leaflist_obj.container.listthree)
+        with self.assertRaises(ValueError):
+            self.leaflist_obj.container.listthree.check(["unhashable"])
+        del self.leaflist_obj.container.listthree[1]
+        self.assertNotIn(["unhashable"], self.leaflist_obj.container.listthree)
+
+    def test_union_leaflist_converts_each_type_of_value(self):
+        for value in ["one", 2, "three", 4]:
+            self.leaflist_obj.container.listthree.append(value)
+        self.assertEqual(
+            [getattr(v, "_pybind_generated_by", None) for v in self.leaflist_obj.container.listthree],
+            [None, "RestrictedClassType", None, "RestrictedClassType"],
+        )
+
+    def test_conversion_of_values_of_same_type_depends_on_value(self):
+        int8 = RestrictedClassType(base_type=int, restriction_dict={"range": ["-128..127"]}, int_size=8)
+        leaflist = TypedListType(allowed_type=[int8, six.text_type])()
+        for value in ["12", "abc", "200"]:
+            leaflist.append(value)
+        self.assertEqual(leaflist, [12, "abc", "200"])
+        self.assertIsInstance(leaflist[0], int8)
+        with self.assertRaises(ValueError):
+            leaflist.append(["a-list"])
+
 
 if __name__ == "__main__":
     unittest.main()
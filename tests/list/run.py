@@ -2,6 +2,7 @@
 from __future__ import unicode_literals
 
 import unittest
+import uuid
 
 from tests.base import PyangBindTestCase
 
@@ -277,6 +278,115 @@ class ListTests(PyangBindTestCase):
         with self.assertRaises(AttributeError):
             self.instance.list_eleven[1].nonexistent = False
 
+    def test_cant_set_item_to_instance_of_another_class(self):
+        with self.assertRaises(ValueError):
+            self.instance.list_nine[1] = self.instance.list_eleven._new_item()
+
+    def test_set_item_to_existing_entry(self):
+        entry = self.instance.list_nine.add(1)
+        entry.lv = "one"
+        other = self.bindings.list_()
+        other.list_nine[1] = entry
+        self.assertEqual(other.list_nine[1].lv, "one")
+        self.assertIs(other.list_nine[1]._parent, other)
+
+    def test_list_type_is_shared_between_instances(self):
+        self.assertIs(type(self.instance.list_nine), type(self.bindings.list_().list_nine))
+
+    def test_multiple_key_entry_path(self):
+        entry = self.instance.list_container.list_eight.add(val="one", additional="two")
+        self.assertEqual(entry._path(), ["list-container", "list-eight[val='one' additional='two']"])
+
+    def test_add_many_entries_from_dicts(self):
+        keys = self.instance.list_container.list_element.add_many(
+            [{"keyval": 1, "another-value": "one"}, {"keyval": 2, "another_value": "two"}]
+        )
+        self.assertEqual(keys, [1, 2])
+        self.assertEqual(self.instance.list_container.list_element[2].another_value, "two")
+        self.assertIs(self.instance.list_container.list_element[1]._parent, self.instance.list_container)
+
+    def test_add_many_entries_from_generator_of_tuples(self):
+        records = ((("val", "v%d" % i), ("additional", "a"), ("numeric", i)) for i in range(3))
+        self.instance.list_container.list_eight.add_many(records)
+        self.assertEqual(list(self.instance.list_container.list_eight.keys()), ["v0 a", "v1 a", "v2 a"])
+        self.assertEqual(self.instance.list_container.list_eight._item(val="v2", additional="a").numeric, 2)
+
+    def test_add_many_propagates_change_to_parent(self):
+        self.instance.list_container.list_five.add_many([{"val": 1}])
+        self.assertTrue(self.instance.list_container._changed())
+        self.assertTrue(self.instance.list_container.list_five[1]._changed())
+
+    def test_add_many_adds_nothing_when_a_record_is_invalid(self):
+        self.instance.list_container.list_element.add(3)
+        for records in [
+            [{"keyval": 1}, {"keyval": "invalid"}],
+            [{"keyval": 1}, {"keyval": 3}],
+            [{"another-value": 1}],
+        ]:
+            with self.subTest(records=records):
+                with self.assertRaises(KeyError):
+                    self.instance.list_container.list_element.add_many(records)
+                self.assertEqual(list(self.instance.list_container.list_element.keys()), [3])
+
+    def test_add_many_entries_are_keyed_as_per_add(self):
+        entries = self.instance.list_container.list_element
+        entries.add_many([{"keyval": 5}])
+        self.assertIn(5, entries)
+        self.assertEqual(entries[5].keyval, 5)
+        with self.assertRaises(KeyError):
+            entries.add(5)
+        entries.add(6)
+        with self.assertRaises(KeyError):
+            entries.add_many([{"keyval": 6}])
+        self.assertEqual(list(entries.keys()), [5, 6])
+        entries.delete(5)
+        self.assertNotIn(5, entries)
+        self.assertEqual(list(entries.keys()), [6])
+
+    def test_add_many_rejects_unknown_elements(self):
+        with self.assertRaises(AttributeError):
+            self.instance.list_container.list_element.add_many([{"keyval": 1, "nonexistent": 2}])
+
+    def test_add_many_to_list_without_key(self):
+        keys = self.instance.list_container.list_six.add_many([{"val": 1}, {"val": 2}])
+        self.assertEqual([self.instance.list_container.list_six[k].val for k in keys], [1, 2])
+
+    def test_from_records_replaces_entries(self):
+        self.instance.list_container.list_element.add(1)
+        self.instance.list_container.list_element.from_records([{"keyval": 2}])
+        self.assertEqual(list(self.instance.list_container.list_element.keys()), [2])
+
+    def test_entries_of_list_without_key_are_numbered(self):
+        self.assertEqual(self.instance.list_container.list_six.add(), "1")
+        self.assertEqual(self.instance.list_container.list_six.add_many([{"val": 2}, {"val": 3}]), ["2", "3"])
+        self.assertEqual(self.instance.list_container.list_six.add(), "4")
+
+    def test_generated_key_skips_existing_entry(self):
+        self.instance.list_container.list_six["2"] = self.instance.list_container.list_six._new_item()
+        keys = [self.instance.list_container.list_six.add() for _ in range(2)]
+        self.assertEqual(keys, ["1", "3"])
+
+    def test_entries_of_list_without_key_are_numbered_per_list(self):
+        self.instance.list_container.list_six.add()
+        self.assertEqual(self.bindings.list_().list_container.list_six.add(), "1")
+
+
+class UUIDListKeyTests(PyangBindTestCase):
+    yang_files = ["list.yang"]
+    pyang_flags = ["--uuid-list-keys"]
+
+    def setUp(self):
+        self.instance = self.bindings.list_()
+
+    def test_entries_of_list_without_key_are_keyed_by_uuid(self):
+        keys = [self.instance.list_container.list_six.add()]
+        keys += self.instance.list_container.list_six.add_many([{"val": 1}])
+        self.assertEqual([str(uuid.UUID(k)) for k in keys], keys)
+
+    def test_keyed_list_is_unaffected(self):
+        self.instance.list_container.list_element.add(1)
+        self.assertEqual(list(self.instance.list_container.list_element.keys()), [1])
+
 
 if __name__ == "__main__":
     unittest.main()
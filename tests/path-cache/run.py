@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+from __future__ import unicode_literals
+
+import unittest
+
+from pyangbind.lib.xpathhelper import YANGPathHelper
+from tests.base import PyangBindTestCase
+
+
+class PathCacheTests(PyangBindTestCase):
+    yang_files = ["path-cache.yang"]
+    pyang_flags = ["--use-xpathhelper"]
+
+    def setUp(self):
+        self.path_helper = YANGPathHelper()
+        self.instance = self.bindings.path_cache(path_helper=self.path_helper)
+        self.entry = self.instance.outer.entry.add("one")
+
+    def test_paths(self):
+        for node, path in [
+            (self.instance.outer, ["outer"]),
+            (self.instance.outer.entry, ["outer", "entry"]),
+            (self.entry, ["outer", "entry[name='one']"]),
+            (self.entry.inner, ["outer", "entry[name='one']", "inner"]),
+            (self.entry.inner.value, ["outer", "entry[name='one']", "inner", "value"]),
+        ]:
+            with self.subTest(path=path):
+                self.assertEqual(node._path(), path)
+                self.assertEqual(node._yang_path(), "/" + "/".join(path))
+
+    def test_schema_path_does_not_include_keys(self):
+        self.assertEqual(self.entry.inner._schema_path(), ["outer", "entry", "inner"])
+        self.assertEqual(self.entry.inner.value._schema_path(), ["outer", "entry", "inner", "value"])
+
+    def test_cached_path_cannot_be_modified(self):
+        self.entry.inner._path().append("modified")
+        self.assertEqual(self.entry.inner._path(), ["outer", "entry[name='one']", "inner"])
+
+    def test_yang_path_is_cached(self):
+        self.assertIs(self.entry.inner._yang_path(), self.entry.inner._yang_path())
+
+    def test_invalidate_with_new_key(self):
+        self.entry._invalidate_path(register_path=["outer", "entry[name='two']"])
+        self.assertEqual(self.entry.inner._path(), ["outer", "entry[name='two']", "inner"])
+        self.assertEqual(self.entry.inner.value._yang_path(), "/outer/entry[name='two']/inner/value")
+
+    def test_invalidate_when_moved(self):
+        other = self.bindings.path_cache().outer.entry.add("two")
+        inner = self.entry.inner
+        inner._parent = other
+        inner._invalidate_path()
+        self.assertEqual(inner._path(), ["outer", "entry[name='two']", "inner"])
+        self.assertEqual(inner.value._path(), ["outer", "entry[name='two']", "inner", "value"])
+
+    def test_paths_of_entries_added_from_records(self):
+        self.instance.outer.entry.add_many([{"name": "two"}])
+        entry = self.instance.outer.entry["two"]
+        entry.inner.value = "2"
+        self.assertIs(entry._parent, self.instance.outer)
+        self.assertEqual(entry._path(), ["outer", "entry[name='two']"])
+        self.assertEqual(entry.inner.value._path(), ["outer", "entry[name='two']", "inner", "value"])
+        self.assertEqual(entry.inner._schema_path(), ["outer", "entry", "inner"])
+
+    def test_paths_of_entry_set_with_new_key(self):
+        self.entry.inner.value = "1"
+        self.entry.inner._path()
+        self.instance.outer.entry["two"] = self.entry
+        entry = self.instance.outer.entry["two"]
+        self.assertEqual(entry.name, "two")
+        self.assertEqual(entry.inner._path(), ["outer", "entry[name='two']", "inner"])
+        self.assertEqual(entry.inner.value._yang_path(), "/outer/entry[name='two']/inner/value")
+        self.assertEqual(self.entry.inner._path(), ["outer", "entry[name='one']", "inner"])
+
+    def test_registered_paths(self):
+        self.assertEqual(len(self.path_helper.get("/outer/entry[name='one']/inner/value")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
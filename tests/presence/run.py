@@ -103,6 +103,14 @@ class PresenceTests(PyangBindTestCase):
         x = pbJ.loads_ietf(inputJ, self.bindings, "presence")
         self.assertIs(x.parent.child._present(), True)
 
+    def test_012_set_beneath_not_present(self):
+        self.instance.pp.inner.s = "first"
+        self.assertIs(self.instance.pp._present(), True)
+        self.instance.pp._set_present(present=False)
+        self.assertIs(self.instance.pp._present(), False)
+        self.instance.pp.inner.s = "second"
+        self.assertIs(self.instance.pp._present(), True)
+
 
 if __name__ == "__main__":
     unittest.main()
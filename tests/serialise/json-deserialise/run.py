@@ -52,6 +52,34 @@ class JSONDeserialiseTests(PyangBindTestCase):
         actual_json = self.deserialise_obj.get(filter=True)
         self.assertEqual(actual_json, expected_json, "Existing object load did not return the correct list.")
 
+    def test_load_leaflist_into_existing_object(self):
+        entry = self.deserialise_obj.c1.l1.add("1")
+        entry.union_list = [16, "chicken", "egg"]
+        pybindJSONDecoder.load_json(
+            {"c1": {"l1": {"1": {"k1": 1, "union-list": ["egg", 32, 16]}}}}, None, None, obj=self.deserialise_obj
+        )
+        self.assertEqual(entry.union_list, [16, "egg", 32])
+
+    def test_load_that_only_removes_leaflist_items(self):
+        entry = self.deserialise_obj.c1.l1.add("1")
+        entry.union_list = [16, "chicken", "egg"]
+        pybindJSONDecoder.load_json(
+            {"c1": {"l1": {"1": {"k1": 1, "union-list": ["egg"]}}}}, None, None, obj=self.deserialise_obj
+        )
+        self.assertTrue(entry.union_list._changed())
+        self.assertEqual(self.deserialise_obj.get(filter=True)["c1"]["l1"]["1"]["union-list"], ["egg"])
+
+    def test_load_keeps_leaflist_index_of_remaining_items(self):
+        entry = self.deserialise_obj.c1.l1.add("1")
+        entry.union_list = [16, "chicken", "egg"]
+        pybindJSONDecoder.load_json(
+            {"c1": {"l1": {"1": {"k1": 1, "union-list": ["egg", 16]}}}}, None, None, obj=self.deserialise_obj
+        )
+        self.assertNotIn("chicken", entry.union_list)
+        self.assertIn("egg", entry.union_list)
+        entry.union_list.append("chicken")
+        self.assertEqual(entry.union_list, [16, "egg", "chicken"])
+
     def test_all_the_types(self):
         expected_json = {
             "c1": {
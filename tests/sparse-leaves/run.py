@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+from __future__ import unicode_literals
+
+import json
+import unittest
+
+from bitarray import bitarray
+
+import pyangbind.lib.pybindJSON as pbJ
+from pyangbind.lib.xpathhelper import YANGPathHelper
+from tests.base import PyangBindTestCase
+
+
+class SparseLeafTests(PyangBindTestCase):
+    yang_files = ["sparse-leaves.yang"]
+    pyang_flags = ["--sparse-leaves", "--use-xpathhelper"]
+
+    def setUp(self):
+        self.path_helper = YANGPathHelper()
+        self.instance = self.bindings.sparse_leaves(path_helper=self.path_helper)
+
+    def test_unset_leaves_are_not_stored(self):
+        for leaf in ["string", "number", "flag", "either"]:
+            with self.subTest(leaf=leaf):
+                self.assertFalse(self.instance.container._pyangbind_built(leaf))
+
+    def test_unset_leaf_has_default_value(self):
+        for leaf, value in [("string", ""), ("number", 0), ("flag", False), ("either", 0)]:
+            with self.subTest(leaf=leaf):
+                self.assertEqual(getattr(self.instance.container, leaf), value)
+                self.assertFalse(getattr(self.instance.container, leaf)._changed())
+
+    def test_unset_leaf_is_shared_between_instances(self):
+        other = self.bindings.sparse_leaves()
+        self.assertIs(self.instance.container.string, other.container.string)
+        self.assertIsNone(self.instance.container.string._parent)
+
+    def test_set_leaf_is_stored(self):
+        self.instance.container.number = 10
+        self.assertTrue(self.instance.container._pyangbind_built("number"))
+        self.assertEqual(self.instance.container.number, 10)
+        self.assertTrue(self.instance.container.number._changed())
+        self.assertIs(self.instance.container.number._parent, self.instance.container)
+
+    def test_setting_a_leaf_does_not_change_the_shared_default(self):
+        other = self.bindings.sparse_leaves()
+        self.instance.container.string = "set"
+        self.assertEqual(other.container.string, "")
+        self.assertFalse(other.container.string._changed())
+
+    def test_changing_a_mutable_default_does_not_change_other_instances(self):
+        other = self.bindings.sparse_leaves()
+        self.instance.container.data.append(True)
+        self.assertEqual(self.instance.container.data, bitarray("1"))
+        self.assertEqual(other.container.data, bitarray())
+        self.assertEqual(self.bindings.sparse_leaves().container.data, bitarray())
+
+    def test_metadata_cannot_be_added_to_unset_leaf(self):
+        other = self.bindings.sparse_leaves()
+        with self.assertRaises(ValueError):
+            self.instance.container.string._add_metadata("key", "value")
+        self.assertEqual(other.container.string._metadata, {})
+        self.instance.container.string = "set"
+        self.instance.container.string._add_metadata("key", "value")
+        self.assertEqual(other.container.string._metadata, {})
+
+    def test_set_leaf_is_validated(self):
+        with self.assertRaises(ValueError):
+            self.instance.container.number = 1001
+        self.assertFalse(self.instance.container._pyangbind_built("number"))
+
+    def test_unset_returns_leaf_to_default(self):
+        self.instance.container.string = "set"
+        self.instance.container._unset_string()
+        self.assertFalse(self.instance.container._pyangbind_built("string"))
+        self.assertEqual(self.instance.container.string, "")
+
+    def test_leaf_lists_and_leafrefs_are_always_stored(self):
+        for leaf in ["members", "reference", "entry"]:
+            with self.subTest(leaf=leaf):
+                self.assertTrue(self.instance.container._pyangbind_built(leaf))
+        self.instance.container.members.append("one")
+        self.assertEqual(self.instance.container.members, ["one"])
+
+    def test_list_keys(self):
+        self.instance.container.entry.add("one")
+        self.instance.container.entry["one"].value = "value"
+        self.assertEqual(self.instance.container.entry["one"].name, "one")
+        self.assertFalse(self.bindings.sparse_leaves().container.entry.add("two").value._changed())
+
+    def test_only_set_leaves_are_registered(self):
+        self.instance.container.string = "registered"
+        self.assertEqual(len(self.path_helper.get("/container/string")), 1)
+        self.assertEqual(len(self.path_helper.get("/container/number")), 0)
+
+    def test_filtered_get(self):
+        self.instance.container.flag = True
+        self.assertEqual(self.instance.get(filter=True), {"container": {"flag": True}})
+
+    def test_unfiltered_get_includes_unset_leaves(self):
+        self.assertEqual(self.instance.get()["container"]["string"], "")
+
+    def test_ietf_serialisation(self):
+        self.instance.container.either = "text"
+        self.assertEqual(
+            json.loads(pbJ.dumps(self.instance, mode="ietf")), {"sparse-leaves:container": {"either": "text"}}
+        )
+
+    def test_load_json(self):
+        loaded = pbJ.loads({"container": {"number": 5}}, self.bindings, "sparse_leaves", path_helper=YANGPathHelper())
+        self.assertEqual(loaded.container.number, 5)
+        self.assertFalse(loaded.container._pyangbind_built("string"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -42,6 +42,23 @@ class SplitClassesTests(PyangBindTestCase):
         self.instance.choices.case_two_container.user.add("second")
         self.assertEqual(list(self.instance.choices.case_one_container.user.keys()), [])
 
+    def test_identityref_at_each_level_uses_shared_table(self):
+        self.instance.split_classes.family = "ipv4"
+        self.instance.remote.remote.remote.family = "remote:ipv6"
+        tables = [
+            self.instance.split_classes.family._restriction_dict["dict_key"],
+            self.instance.remote.remote.remote.family._restriction_dict["dict_key"],
+        ]
+        self.assertIs(tables[0], tables[1])
+        shared = [
+            getattr(self.bindings._pyangbind_identities, name) for name in self.bindings._pyangbind_identities.__all__
+        ]
+        self.assertTrue(any(table is tables[0] for table in shared))
+
+    def test_identityref_rejects_unknown_identity(self):
+        with self.assertRaises(ValueError):
+            self.instance.remote.remote.remote.family = "ipv5"
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -3,6 +3,7 @@ from __future__ import unicode_literals
 
 import unittest
 
+from pyangbind.lib.yangtypes import pattern_cache_info
 from tests.base import PyangBindTestCase
 
 
@@ -129,6 +130,27 @@ class StringTests(PyangBindTestCase):
                     allowed = False
                 self.assertEqual(allowed, valid)
 
+    def test_string_leaf_pattern_must_match_whole_value(self):
+        for (value, valid) in [("ab", True), ("cd", True), ("abx", False), ("xcd", False), ("cd\n", False)]:
+            with self.subTest(value=value, valid=valid):
+                allowed = True
+                try:
+                    self.instance.string_container.alternationPattern = value
+                except ValueError:
+                    allowed = False
+                self.assertEqual(allowed, valid)
+
+    def test_pattern_is_compiled_once_for_all_types(self):
+        self.instance.string_container.alternationPattern = "ab"
+        misses = pattern_cache_info().misses
+        self.instance.string_container.otherAlternationPattern = "cd"
+        self.instance.string_container.alternationPattern = "cd"
+        self.assertEqual(pattern_cache_info().misses, misses)
+
+    def test_pattern_cache_is_bounded(self):
+        info = pattern_cache_info()
+        self.assertLessEqual(info.currsize, info.maxsize)
+
 
 if __name__ == "__main__":
     unittest.main()
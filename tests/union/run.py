@@ -7,6 +7,7 @@ import unittest
 import six
 from bitarray import bitarray
 
+from pyangbind.lib.yangtypes import RestrictedClassType, YANGDynClass, _pattern_first_characters
 from tests.base import PyangBindTestCase
 
 
@@ -111,6 +112,51 @@ class UnionTests(PyangBindTestCase):
                     allowed = False
                 self.assertEqual(allowed, valid)
 
+    def test_union_member_is_first_that_value_matches(self):
+        for _ in range(2):
+            for (value, expected) in [
+                ("1.2", "1.2"),
+                ("ab:cd", "ab:cd"),
+                ("any", "any"),
+                (5, 5),
+                ("5", "5"),
+                ("7", "7"),
+            ]:
+                with self.subTest(value=value):
+                    self.instance.container.u13 = value
+                    self.assertEqual(self.instance.container.u13, expected)
+                    self.assertIsInstance(self.instance.container.u13, type(expected))
+
+    def test_union_rejects_value_matching_no_member(self):
+        for value in ["xyz", 11, "1.2.3"]:
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                self.instance.container.u13 = value
+
+    def test_union_enumeration_member_keeps_mapped_value(self):
+        self.instance.container.u13 = "any"
+        self.assertEqual(self.instance.container.u13.getValue(mapped=True), 0)
+
+    def test_pattern_first_characters(self):
+        for (pattern, expected) in [
+            ("^a.*$", "a"),
+            ("^(:|[0-9a-f]{0,4}):$", ":0123456789abcdef"),
+            ("^x?[\\-y]+$", "-xy"),
+            ("^(a|b)c|d$", "abd"),
+            ("^[^a]$", None),
+            ("^\\d+$", None),
+            ("^(?i)abc$", None),
+            ("^x*.$", None),
+        ]:
+            with self.subTest(pattern=pattern):
+                first = _pattern_first_characters(pattern)
+                self.assertEqual(first, frozenset(expected) if expected is not None else None)
+
+    def test_restricted_type_instance_is_used_as_value(self):
+        restricted = RestrictedClassType(base_type=six.text_type, restriction_dict={"pattern": "a.*"})
+        value = YANGDynClass(restricted("abc"), base=[restricted], is_leaf=True, yang_name="leaf")
+        self.assertEqual(value, "abc")
+        self.assertIsInstance(value, restricted)
+
 
 if __name__ == "__main__":
     unittest.main()
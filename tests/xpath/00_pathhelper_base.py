@@ -2,7 +2,17 @@
 
 from __future__ import print_function
 
-from pyangbind.lib.xpathhelper import XPathError, YANGPathHelper
+import gc
+import uuid
+
+from pyangbind.lib.xpathhelper import (
+    XPathError,
+    YANGPathHelper,
+    YANGTriePathHelper,
+    clear_query_cache,
+    query_cache_info,
+)
+from pyangbind.lib.yangtypes import uuid_key
 
 try:
     import unittest2 as unittest
@@ -20,9 +30,10 @@ class TestObject(object):
 
 
 class PathHelperBaseTests(unittest.TestCase):
+    path_helper_class = YANGPathHelper
 
     def setUp(self):
-        self.tree = YANGPathHelper()
+        self.tree = self.path_helper_class()
 
     def test_get_returns_same_number_of_objects_as_registered(self):
         obj = TestObject("testobj")
@@ -97,6 +108,308 @@ class PathHelperBaseTests(unittest.TestCase):
                 obj = self.tree.get("/container/foo[id={0}42{0}]".format(style))[0]
                 self.assertEqual(obj.name(), "bar42")
 
+    def test_register_many_registers_each_object(self):
+        self.tree.register(["container"], TestObject("container"))
+        self.tree.register_many(
+            [
+                (["container", "foo[id=0]"], TestObject("bar0")),
+                (["container", "foo[id=0]", "leaf"], TestObject("leaf0")),
+                (["container", "foo[id=1]"], TestObject("bar1")),
+            ]
+        )
+        self.assertEqual(self.tree.get("/container/foo[id=0]/leaf")[0].name(), "leaf0")
+        self.assertEqual(self.tree.get("/container/foo[id=1]")[0].name(), "bar1")
+
+    def test_register_many_updates_existing_object(self):
+        self.tree.register(["container"], TestObject("container"))
+        self.tree.register(["container", "foo"], TestObject("old"))
+        self.tree.register_many([(["container", "foo"], TestObject("new"))])
+        self.assertEqual([o.name() for o in self.tree.get("/container/foo")], ["new"])
+
+    def test_batch_defers_registration_until_read(self):
+        with self.tree.batch():
+            self.tree.register(["container"], TestObject("container"))
+            self.assertEqual(len(self.tree._pending), 1)
+            self.assertEqual(self.tree.get("/container")[0].name(), "container")
+            self.tree.register(["container", "foo"], TestObject("foo"))
+        self.assertEqual(self.tree.get("/container/foo")[0].name(), "foo")
+
+    def test_batch_discards_registrations_on_exception(self):
+        try:
+            with self.tree.batch():
+                self.tree.register(["container"], TestObject("container"))
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertEqual(self.tree.get("/container"), [])
+
+    def test_unregister_removes_children(self):
+        self.tree.register(["container"], TestObject("container"))
+        self.tree.register(["container", "foo[id='1']"], TestObject("foo"))
+        self.tree.register(["container", "foo[id='1']", "bar"], TestObject("bar"))
+        self.tree.unregister(["container", "foo[@id=1]"])
+        self.assertEqual(self.tree.get("/container/foo/bar"), [])
+        self.assertEqual(len(self.tree.get("/container")), 1)
+
+    def test_unregister_subtree_removes_children(self):
+        self.tree.register(["container"], TestObject("container"))
+        self.tree.register(["container", "foo"], TestObject("foo"))
+        self.tree.register(["container", "foo", "bar"], TestObject("bar"))
+        self.tree.unregister_subtree(["container", "foo"])
+        self.assertEqual(self.tree.get("/container/foo/bar"), [])
+        with self.assertRaises(XPathError):
+            self.tree.register(["container", "foo", "bar"], TestObject("bar"))
+
+    def test_register_subtree_within_batch_registers_pending_objects(self):
+        with self.tree.batch():
+            self.tree.register(["container"], TestObject("container"))
+            self.tree.register(["container", "foo"], TestObject("foo"))
+            self.tree.register_subtree(["container"], TestObject("replaced"))
+            self.assertEqual(self.tree._pending, [])
+        self.assertEqual(self.tree.get("/container")[0].name(), "replaced")
+        self.assertEqual(self.tree.get("/container/foo"), [])
+
+    def test_batch_registers_on_exception_when_not_discarding(self):
+        with self.assertRaises(ValueError):
+            with self.tree.batch(discard=False):
+                self.tree.register(["container"], TestObject("container"))
+                raise ValueError
+        self.assertEqual(self.tree.get("/container")[0].name(), "container")
+
+    def test_get_list_entry_by_keys_in_any_order(self):
+        self.tree.register(["container"], TestObject("container"))
+        self.tree.register(["container", "foo[a='1'][b='2']"], TestObject("foo"))
+        self.assertEqual([o.name() for o in self.tree.get("/container/foo[b='2'][a='1']")], ["foo"])
+        self.assertEqual([o.name() for o in self.tree.get("/container/foo[a='1' and b='2']")], ["foo"])
+        self.assertEqual(self.tree.get("/container/foo[a='1'][b='3']"), [])
+
+    def test_get_relative_path_from_caller(self):
+        self.tree.register(["container"], TestObject("container"))
+        for i in range(2):
+            self.tree.register(["container", "foo[id='%d']" % i], TestObject("foo%d" % i))
+            self.tree.register(["container", "foo[id='%d']" % i, "bar"], TestObject("bar%d" % i))
+        retr = self.tree.get("../bar", caller=["container", "foo[id='1']", "bar"])
+        self.assertEqual([o.name() for o in retr], ["bar1"])
+
+    def test_get_list_entries_by_partial_predicate(self):
+        self.tree.register(["container"], TestObject("container"))
+        for a, b in [(1, 1), (1, 2), (2, 1)]:
+            self.tree.register(["container", "foo[a='%d' b='%d']" % (a, b)], TestObject("%d %d" % (a, b)))
+        self.assertEqual([o.name() for o in self.tree.get("/container/foo[b=1]")], ["1 1", "2 1"])
+        self.assertEqual([o.name() for o in self.tree.get("/container/foo[b='2' a='1']")], ["1 2"])
+
+    def test_get_with_xpath_expression(self):
+        self.tree.register(["container"], TestObject("container"))
+        self.tree.register(["container", "foo[id='1']"], TestObject("foo"))
+        self.tree.register(["container", "foo[id='1']", "bar"], TestObject("bar"))
+        self.assertEqual([o.name() for o in self.tree.get("//bar")], ["bar"])
+        self.assertEqual([o.name() for o in self.tree.get("/container/*")], ["foo"])
+
+    def test_repeated_get_is_served_from_query_cache(self):
+        self.tree.register(["container"], TestObject("container"))
+        clear_query_cache()
+        for _ in range(3):
+            self.assertEqual(self.tree.get("/container")[0].name(), "container")
+        info = query_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 1, 1))
+
+    def test_repeated_get_is_resolved_once(self):
+        self.tree.register(["container"], TestObject("container"))
+        self.tree.register(["container", "foo[id='1']"], TestObject("foo"))
+        caller = ["container", "foo[id='1']"]
+        self.assertEqual(self.tree.get("../foo[id='1']", caller=caller)[0].name(), "foo")
+
+        def lookup(*args, **kwargs):
+            raise AssertionError("path was resolved again")
+
+        self.tree._lookup = lookup
+        self.assertEqual(self.tree.get("../foo[id='1']", caller=list(caller))[0].name(), "foo")
+
+    def test_resolved_paths_are_invalidated_when_tree_changes(self):
+        self.tree.register(["container"], TestObject("container"))
+        self.assertEqual(self.tree.get("/container/foo"), [])
+        self.tree.register(["container", "foo"], TestObject("foo"))
+        self.assertEqual(self.tree.get("/container/foo")[0].name(), "foo")
+        self.tree.register(["container", "foo"], TestObject("bar"))
+        self.assertEqual(self.tree.get("/container/foo")[0].name(), "bar")
+        self.tree.unregister(["container", "foo"])
+        self.assertEqual(self.tree.get("/container/foo"), [])
+
+    def test_get_by_value_follows_changes_to_tree(self):
+        self.tree.register(["container"], TestObject("container"))
+        for i in range(3):
+            self.tree.register(["container", "foo[id='%d']" % i], TestObject("foo%d" % i))
+            self.tree.register(["container", "foo[id='%d']" % i, "name"], "eth%d" % i)
+        self.assertEqual(self.tree.get_by_value("/container/foo/name", "eth1"), ["eth1"])
+        self.assertEqual(self.tree.count("/container/foo/name"), 3)
+        self.tree.register(["container", "foo[id='3']"], TestObject("foo3"))
+        self.tree.register(["container", "foo[id='3']", "name"], "eth3")
+        self.tree.register(["container", "foo[id='1']", "name"], "eth4")
+        self.tree.unregister(["container", "foo[id='2']"])
+        for (value, expected) in [("eth1", []), ("eth2", []), ("eth3", ["eth3"]), ("eth4", ["eth4"])]:
+            with self.subTest(value=value):
+                self.assertEqual(self.tree.get_by_value("/container/foo/name", value), expected)
+        self.assertEqual(self.tree.count("/container/foo/name"), 3)
+
+    def test_get_by_value_with_predicate_compares_each_object(self):
+        self.tree.register(["container"], TestObject("container"))
+        self.tree.register(["container", "foo[id='1']"], TestObject("foo"))
+        self.tree.register(["container", "foo[id='1']", "name"], "eth1")
+        self.assertEqual(self.tree.get_by_value("/container/foo[id='1']/name", "eth1"), ["eth1"])
+        self.assertEqual(self.tree._value_indices, {})
+
+    def test_registered_paths_are_not_cached(self):
+        clear_query_cache()
+        self.tree.register(["container"], TestObject("container"))
+        self.tree.register(["container", "foo[id='1']"], TestObject("foo"))
+        self.tree.unregister(["container", "foo[id='1']"])
+        self.assertEqual(query_cache_info().currsize, 0)
+
+    def test_query_cache_is_bounded(self):
+        self.tree.register(["container"], TestObject("container"))
+        info = query_cache_info()
+        for i in range(info.maxsize + 1):
+            self.tree.get("/container/foo[id='%d']" % i)
+        self.assertEqual(query_cache_info().currsize, info.maxsize)
+
+
+class TriePathHelperBaseTests(PathHelperBaseTests):
+    path_helper_class = YANGTriePathHelper
+
+    def test_get_with_namespace_prefix(self):
+        self.tree.register(["container"], TestObject("container"))
+        self.tree.register(["container", "foo[id='1']"], TestObject("foo"))
+        self.assertEqual([o.name() for o in self.tree.get("/pfx:container/pfx:foo[pfx:id='1']")], ["foo"])
+
+    def test_xpath_expression_sees_changes_to_tree(self):
+        self.tree.register(["container"], TestObject("container"))
+        self.assertEqual(len(self.tree.get("//container")), 1)
+        self.tree.register(["container", "foo"], TestObject("foo"))
+        self.assertEqual([o.name() for o in self.tree.get("//foo")], ["foo"])
+        self.tree.unregister(["container", "foo"])
+        self.assertEqual(self.tree.get("//foo"), [])
+
+    def test_path_looked_up_by_another_helper_is_walked(self):
+        other = YANGPathHelper()
+        for tree in [self.tree, other]:
+            tree.register(["container"], TestObject("container"))
+            tree.register(["container", "foo"], TestObject("foo"))
+        clear_query_cache()
+        self.assertEqual([o.name() for o in other.get("/container/foo")], ["foo"])
+        self.assertEqual([o.name() for o in self.tree.get("/container/foo")], ["foo"])
+        # the path is found by walking the tree, rather than as XPATH.
+        self.assertIsNone(self.tree._document)
+        self.assertEqual([o.name() for o in other.get("/container/foo")], ["foo"])
+
+    def test_tostring(self):
+        self.tree.register(["container"], TestObject("container"))
+        self.tree.register(["container", "foo[id='1']"], TestObject("foo"))
+        self.assertEqual(
+            self.tree.tostring(),
+            b'<root obj_ptr="0"><container obj_ptr="1"><foo obj_ptr="2" id="1"/></container></root>',
+        )
+
+
+class TestLeaf(int):
+    pass
+
+
+class WeakPathHelperTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = YANGPathHelper(weak_references=True)
+
+    def test_referenced_object_is_returned(self):
+        obj = TestObject("container")
+        self.tree.register(["container"], obj)
+        self.assertIs(self.tree.get("/container")[0], obj)
+        self.assertIs(self.tree.get("/")[0].container, obj)
+
+    def test_finalised_object_is_unregistered(self):
+        obj = TestObject("container")
+        self.tree.register(["container"], obj)
+        self.tree.register(["container", "foo"], TestObject("foo"))
+        del obj
+        gc.collect()
+        self.assertEqual(self.tree.get("/container"), [])
+        self.assertEqual(list(self.tree._library), ["root"])
+        self.assertEqual(self.tree._root.getchildren(), [])
+        self.assertEqual(self.tree.get("/")[0]._pyangbind_elements, {})
+
+    def test_object_that_cannot_be_weakly_referenced_is_retrieved_from_parent(self):
+        container = TestObject("container")
+        container.leaf = TestLeaf(42)
+        container.leaf._parent = container
+        container.leaf._yang_name = "leaf"
+        container._get_leaf = lambda: container.leaf
+        self.tree.register(["container"], container)
+        self.tree.register(["container", "leaf"], container.leaf)
+        self.assertIs(self.tree.get("/container/leaf")[0], container.leaf)
+        del container
+        gc.collect()
+        self.assertEqual(self.tree.get("/container/leaf"), [])
+
+
+class PathHelperIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = YANGPathHelper()
+        self.tree.register(["container"], TestObject("container"))
+        for i in range(3):
+            self.tree.register(["container", "foo[id='%d']" % i], TestObject("foo%d" % i))
+            self.tree.register(["container", "foo[id='%d']" % i, "bar"], TestObject("bar%d" % i))
+
+    def test_list_entry_selected_by_its_keys_is_found_using_index(self):
+
+        def evaluate(*args, **kwargs):
+            raise AssertionError("path was evaluated as XPATH")
+
+        self.tree._evaluate = evaluate
+        self.assertEqual(self.tree.get("/container/foo[id='1']/bar")[0].name(), "bar1")
+        self.assertEqual(self.tree.get("/container/foo[id='4']/bar"), [])
+
+    def test_list_entry_selected_by_other_names_is_evaluated_as_xpath(self):
+        self.tree.register(["container", "baz[a='1'][b='2']"], TestObject("baz"))
+        self.assertEqual(self.tree.get("/container/baz[a='1']")[0].name(), "baz")
+
+    def test_unregistered_entries_are_removed_from_index(self):
+        self.tree.unregister(["container", "foo[id='1']"])
+        self.assertEqual(list(self.tree._keyed[self.tree._root[0]]["foo"]), [(("id", "0"),), (("id", "2"),)])
+        self.tree.unregister(["container"])
+        self.assertEqual(self.tree._keyed, {})
+
+
+class PathHelperIdTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = YANGPathHelper()
+
+    def test_registered_objects_are_numbered(self):
+        self.tree.register(["container"], TestObject("container"))
+        self.tree.register(["container", "foo"], TestObject("foo"))
+        self.assertEqual([e.get("obj_ptr") for e in self.tree._root.iter()], ["root", "1", "2"])
+
+    def test_updated_object_is_given_new_id(self):
+        self.tree.register(["container"], TestObject("old"))
+        self.tree.register(["container"], TestObject("new"))
+        self.assertEqual(self.tree._root[0].get("obj_ptr"), "2")
+        self.assertEqual(self.tree.get("/container")[0].name(), "new")
+
+    def test_unregister_releases_objects_beneath_path(self):
+        self.tree.register(["container"], TestObject("container"))
+        self.tree.register(["container", "foo"], TestObject("foo"))
+        self.tree.register(["container", "foo", "bar"], TestObject("bar"))
+        self.tree.unregister(["container", "foo"])
+        self.assertEqual(sorted(self.tree._library), ["1", "root"])
+
+    def test_id_generator_is_used_for_registered_objects(self):
+        tree = YANGPathHelper(id_generator=uuid_key)
+        tree.register(["container"], TestObject("container"))
+        tree.register(["container", "foo"], TestObject("foo"))
+        for element in tree._root[0].iter():
+            uuid.UUID(element.get("obj_ptr"))
+        self.assertEqual(tree.get("/container/foo")[0].name(), "foo")
+
 
 if __name__ == "__main__":
     unittest.main()
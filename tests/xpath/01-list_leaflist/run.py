@@ -1,20 +1,25 @@
 #!/usr/bin/env python
 
+import functools
+import gc
+
 try:
     import unittest2 as unittest
 except ImportError:
     import unittest
 
-from pyangbind.lib.xpathhelper import YANGPathHelper
+from pyangbind.lib.serialise import pybindJSONDecoder
+from pyangbind.lib.xpathhelper import YANGPathHelper, YANGTriePathHelper
 from tests.base import PyangBindTestCase
 
 
 class XPathListLeaflistTests(PyangBindTestCase):
     yang_files = ["list-tc01.yang"]
     pyang_flags = ["--use-xpathhelper"]
+    path_helper_class = YANGPathHelper
 
     def setUp(self):
-        self.path_helper = YANGPathHelper()
+        self.path_helper = self.path_helper_class()
         self.instance = self.bindings.list_tc01(path_helper=self.path_helper)
 
     def test_leaflist_leafref_with_require_instance_true(self):
@@ -54,6 +59,15 @@ class XPathListLeaflistTests(PyangBindTestCase):
                     allowed = False
                 self.assertEqual(valid, allowed)
 
+    def test_list_leafref_rejects_deleted_entry(self):
+        for animal in ["kangaroo", "koala"]:
+            self.instance.container.t2.add(animal)
+        self.instance.reference.t2_ptr = "koala"
+        self.instance.container.t2.delete("koala")
+        with self.assertRaises(ValueError):
+            self.instance.reference.t2_ptr = "koala"
+        self.instance.reference.t2_ptr = "kangaroo"
+
     def test_get_leaflist_with_xpath_helper_returns_single_element(self):
         for beer in ["oatmeal-stout", "amber-ale", "pale-ale", "pils", "ipa", "session-ipa"]:
             self.instance.container.t3.append(beer)
@@ -198,6 +212,153 @@ class XPathListLeaflistTests(PyangBindTestCase):
     def test_get_list_returns_correct_type(self):
         self.assertEqual(self.path_helper.get_list("/standalone/l")._is_container, "list")
 
+    def test_add_many_registers_list_entries(self):
+        self.instance.container.t4.add("steam")
+        self.instance.container.t4.add_many({"keyval": beer} for beer in ["liberty", "porter"])
+        for beer in ["steam", "liberty", "porter"]:
+            with self.subTest(beer=beer):
+                retr = self.path_helper.get("/container/t4[keyval=%s]/keyval" % beer)
+                self.assertEqual(retr, [beer])
+
+    def test_list_leafref_resolves_entries_added_by_add_many(self):
+        self.instance.container.t2.add_many([{"keyval": "kangaroo"}, {"keyval": "wallaby"}])
+        self.instance.reference.t2_ptr = "wallaby"
+        with self.assertRaises(ValueError):
+            self.instance.reference.t2_ptr = "emu"
+
+    def test_add_many_does_not_register_entries_when_a_record_is_invalid(self):
+        with self.assertRaises(KeyError):
+            self.instance.container.t4.add_many([{"keyval": "liberty"}, {}])
+        self.assertEqual(self.path_helper.get("/container/t4[keyval=liberty]"), [])
+
+    def test_add_many_unregisters_entries_looked_up_before_an_invalid_record(self):
+
+        def records():
+            yield {"keyval": "liberty"}
+            # a lookup registers the entries that have been created so far.
+            self.path_helper.get("/container/t4")
+            yield {"keyval": "porter"}
+            yield {}
+
+        with self.assertRaises(KeyError):
+            self.instance.container.t4.add_many(records())
+        self.assertEqual(self.path_helper.get("/container/t4"), [])
+        self.assertEqual(list(self.instance.container.t4.keys()), [])
+
+    def test_from_records_unregisters_replaced_entries(self):
+        self.instance.container.t4.add("steam")
+        self.instance.container.t4.from_records([{"keyval": "porter"}])
+        self.assertEqual(self.path_helper.get("/container/t4[keyval=steam]"), [])
+        self.assertEqual(len(self.path_helper.get("/container/t4[keyval=porter]")), 1)
+
+    def test_register_subtree_registers_objects_beneath_path(self):
+        loaded = self.bindings.list_tc01()
+        loaded.container.t2.add("kangaroo")
+        loaded.container.t3.append("pils")
+        self.path_helper.register_subtree(["container"], loaded.container)
+        self.assertIs(self.path_helper.get("/container")[0], loaded.container)
+        self.assertEqual(self.path_helper.get("/container/t2[keyval=kangaroo]/keyval"), ["kangaroo"])
+        self.assertEqual(self.path_helper.get("/container/t3")[0], ["pils"])
+
+    def test_register_subtree_replaces_objects_beneath_path(self):
+        self.instance.container.t2.add("wombat")
+        loaded = self.bindings.list_tc01()
+        loaded.container.t2.add("kangaroo")
+        self.path_helper.register_subtree(["container"], loaded.container)
+        self.assertEqual(self.path_helper.get("/container/t2[keyval=wombat]"), [])
+        self.assertEqual(len(self.path_helper.get("/container/t2")), 1)
+
+    def test_delete_unregisters_objects_beneath_entry(self):
+        self.instance.container.t2.add("koala")
+        self.instance.container.t2.delete("koala")
+        self.assertEqual(self.path_helper.get("/container/t2[keyval=koala]/keyval"), [])
+
+    def test_load_json_overwrite_unregisters_replaced_objects(self):
+        self.instance.container.t2.add("koala")
+        pybindJSONDecoder.load_json(
+            {"container": {"t2": {"dingo": {"keyval": "dingo"}}}},
+            None,
+            None,
+            obj=self.instance,
+            path_helper=self.path_helper,
+            overwrite=True,
+        )
+        self.assertEqual(self.path_helper.get("/container/t2[keyval=koala]"), [])
+        self.assertEqual(self.path_helper.get("/container/t2[keyval=dingo]/keyval"), ["dingo"])
+        self.assertIs(self.path_helper.get("/container/t2")[0], self.instance.container.t2["dingo"])
+
+    def test_load_ietf_json_registers_objects_in_one_pass(self):
+        batches = []
+        register_many = self.path_helper.register_many
+
+        def record(registrations, caller=False):
+            registrations = list(registrations)
+            batches.append([path for path, _ in registrations])
+            return register_many(registrations, caller=caller)
+
+        self.path_helper.register_many = record
+        pybindJSONDecoder.load_ietf_json(
+            {"list-tc01:container": {"t2": [{"keyval": "koala"}, {"keyval": "dingo"}]}}, None, None, obj=self.instance
+        )
+        self.assertEqual(len(batches), 1)
+        self.assertIn(["container", "t2[keyval='dingo']", "keyval"], batches[0])
+        self.assertEqual(self.path_helper.get("/container/t2[keyval=dingo]/keyval"), ["dingo"])
+
+    def test_load_json_leafref_resolves_objects_loaded_before_it(self):
+        pybindJSONDecoder.load_json(
+            {"container": {"t2": {"koala": {"keyval": "koala"}}}, "reference": {"t2-ptr": "koala"}},
+            None,
+            None,
+            obj=self.instance,
+        )
+        self.assertEqual(str(self.instance.reference.t2_ptr), "koala")
+        with self.assertRaises(ValueError):
+            pybindJSONDecoder.load_json({"reference": {"t2-ptr": "wombat"}}, None, None, obj=self.instance)
+
+    def test_load_json_registers_objects_loaded_before_an_error(self):
+        with self.assertRaises(ValueError):
+            pybindJSONDecoder.load_json(
+                {"container": {"t2": {"koala": {"keyval": "koala"}}}, "reference": {"t2-ptr": "wombat"}},
+                None,
+                None,
+                obj=self.instance,
+            )
+        self.assertEqual(self.path_helper.get("/container/t2[keyval=koala]/keyval"), ["koala"])
+
+
+class XPathListLeaflistTrieTests(XPathListLeaflistTests):
+    path_helper_class = YANGTriePathHelper
+
+
+class XPathListLeaflistWeakTests(XPathListLeaflistTests):
+    path_helper_class = functools.partial(YANGPathHelper, weak_references=True)
+
+    def test_discarded_tree_is_unregistered(self):
+        self.instance.container.t2.add("kangaroo")
+        self.instance.container.t3.append("pils")
+        del self.instance
+        gc.collect()
+        self.assertEqual(self.path_helper.get("/container"), [])
+        self.assertEqual(self.path_helper.get("/container/t2/keyval"), [])
+        self.assertEqual(list(self.path_helper._library), ["root"])
+
+    def test_discarded_entry_is_unregistered(self):
+        self.instance.container.t2.add("kangaroo")
+        entry = self.instance.container.t2["kangaroo"]
+        del self.instance.container.t2._members["kangaroo"]
+        del entry
+        gc.collect()
+        self.assertEqual(self.path_helper.get("/container/t2[keyval=kangaroo]/keyval"), [])
+        self.assertEqual(len(self.path_helper.get("/container")), 1)
+
+    def test_new_tree_replaces_discarded_tree(self):
+        self.instance.container.t2.add("kangaroo")
+        self.instance = self.bindings.list_tc01(path_helper=self.path_helper)
+        self.instance.container.t2.add("wallaby")
+        gc.collect()
+        self.assertEqual(self.path_helper.get("/container/t2/keyval"), ["wallaby"])
+        self.assertIs(self.path_helper.get("/container")[0], self.instance.container)
+
 
 if __name__ == "__main__":
     unittest.main()
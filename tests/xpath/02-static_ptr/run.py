@@ -1,16 +1,17 @@
 #!/usr/bin/env python
 import unittest
 
-from pyangbind.lib.xpathhelper import YANGPathHelper
+from pyangbind.lib.xpathhelper import YANGPathHelper, YANGTriePathHelper
 from tests.base import PyangBindTestCase
 
 
 class XPathStaticPtrTests(PyangBindTestCase):
     yang_files = ["ptr-tc02.yang"]
     pyang_flags = ["--use-xpathhelper"]
+    path_helper_class = YANGPathHelper
 
     def setUp(self):
-        self.path_helper = YANGPathHelper()
+        self.path_helper = self.path_helper_class()
         self.yang_obj = self.bindings.ptr_tc02(path_helper=self.path_helper)
         for x in range(0, 100):
             self.yang_obj.container.t1a.add("x%s" % x)
@@ -35,6 +36,16 @@ class XPathStaticPtrTests(PyangBindTestCase):
                     % self.yang_obj.container.t1a["x%s" % x].t1b,
                 )
 
+    def test_list_key_pointer_follows_changes_to_target(self):
+        entry = self.yang_obj.container.t1a["x1"]
+        self.assertEqual(str(entry.t1b), "x1")
+        entry.t1c.t1d = "y1"
+        self.assertEqual(str(entry.t1b), "y1")
+
+
+class XPathStaticPtrTrieTests(XPathStaticPtrTests):
+    path_helper_class = YANGTriePathHelper
+
 
 if __name__ == "__main__":
     unittest.main()
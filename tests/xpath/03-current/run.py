@@ -1,16 +1,18 @@
 #!/usr/bin/env python
+import functools
 import unittest
 
-from pyangbind.lib.xpathhelper import YANGPathHelper
+from pyangbind.lib.xpathhelper import YANGPathHelper, YANGTriePathHelper, query_cache_info
 from tests.base import PyangBindTestCase
 
 
 class XPathCurrentTests(PyangBindTestCase):
     yang_files = ["current-tc03.yang"]
     pyang_flags = ["--use-xpathhelper"]
+    path_helper_class = YANGPathHelper
 
     def setUp(self):
-        self.path_helper = YANGPathHelper()
+        self.path_helper = self.path_helper_class()
         self.yang_obj = self.bindings.current_tc03(path_helper=self.path_helper)
         for i in [(1, 2), (3, 4), (5, 6)]:
             self.yang_obj.src_list.add("%s %s" % i)
@@ -30,6 +32,29 @@ class XPathCurrentTests(PyangBindTestCase):
     def test_src_list_value(self):
         self.assertEqual(self.yang_obj.src_list["1 2"].value, "2")
 
+    def test_current_is_resolved_for_each_caller(self):
+        self.yang_obj.referencing_list.add(2)
+        self.yang_obj.referencing_list[2].source_val = "3"
+        self.yang_obj.referencing_list[2].reference = "4"
+        with self.assertRaises(ValueError):
+            self.yang_obj.referencing_list[2].reference = "2"
+        self.yang_obj.referencing_list[1].reference = "2"
+
+    def test_referenced_path_is_compiled_once(self):
+        self.yang_obj.referencing_list[1].reference = "2"
+        misses = query_cache_info().misses
+        for _ in range(3):
+            self.yang_obj.referencing_list[1].reference = "2"
+        self.assertEqual(query_cache_info().misses, misses)
+
+
+class XPathCurrentTrieTests(XPathCurrentTests):
+    path_helper_class = YANGTriePathHelper
+
+
+class XPathCurrentWeakTests(XPathCurrentTests):
+    path_helper_class = functools.partial(YANGPathHelper, weak_references=True)
+
 
 if __name__ == "__main__":
     unittest.main()
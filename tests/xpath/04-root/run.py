@@ -1,12 +1,13 @@
 #!/usr/bin/env python
 
+import functools
 import json
 import os
 import unittest
 
 import pyangbind.lib.pybindJSON as pbJ
 from pyangbind.lib.serialise import pybindJSONDecoder
-from pyangbind.lib.xpathhelper import YANGPathHelper
+from pyangbind.lib.xpathhelper import YANGPathHelper, YANGTriePathHelper
 from pyangbind.lib.yangtypes import safe_name
 from tests.base import PyangBindTestCase
 
@@ -14,9 +15,10 @@ from tests.base import PyangBindTestCase
 class XPathRootTests(PyangBindTestCase):
     yang_files = ["root-tc04-a.yang", "root-tc04-b.yang"]
     pyang_flags = ["--use-extmethods", "--use-xpathhelper"]
+    path_helper_class = YANGPathHelper
 
     def setUp(self):
-        self.path_helper = YANGPathHelper()
+        self.path_helper = self.path_helper_class()
         self.instance_a = self.bindings.root_tc04_a(path_helper=self.path_helper)
         self.instance_b = self.bindings.root_tc04_b(path_helper=self.path_helper)
 
@@ -70,5 +72,13 @@ class XPathRootTests(PyangBindTestCase):
         self.assertEqual(v, x)
 
 
+class XPathRootTrieTests(XPathRootTests):
+    path_helper_class = YANGTriePathHelper
+
+
+class XPathRootWeakTests(XPathRootTests):
+    path_helper_class = functools.partial(YANGPathHelper, weak_references=True)
+
+
 if __name__ == "__main__":
     unittest.main()